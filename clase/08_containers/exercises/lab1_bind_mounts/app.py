@@ -1,34 +1,171 @@
 """
 Lab 1: Bind Mounts — archivo de ejemplo
 Este archivo vive en tu HOST. El contenedor lo ve vía volumen.
+
+    python /app/app.py          # el laboratorio: lista /app y escribe output.txt
+    python /app/app.py scale    # mide cuánto cuesta listar N archivos en el montaje
 """
-import sys
+import argparse
+import csv
 import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+COUNTS = [10, 100, 1_000, 10_000, 100_000]
+CSV_COLUMNS = ["mount", "method", "files", "rep", "ms", "us_per_file"]
+
+
+def lab():
+    print("=" * 40)
+    print("  Lab 1: Bind Mounts")
+    print("=" * 40)
+    print(f"Python version: {sys.version}")
+    print(f"Working dir:    {os.getcwd()}")
+    print(f"Timestamp:      {datetime.now().isoformat()}")
+    print()
+
+    # Listar archivos visibles en /app (el punto de montaje).
+    # scandir recorre el directorio una vez; ver `app.py scale` para el porqué.
+    print("Archivos en /app:")
+    for entry in sorted(os.scandir("/app"), key=lambda e: e.name):
+        size = entry.stat().st_size
+        print(f"  {entry.name:30s} {size:>6d} bytes")
+
+    print()
+
+    # Escribir un archivo de salida — aparecerá en tu host
+    output_path = "/app/output.txt"
+    with open(output_path, "w") as f:
+        f.write(f"Generado por Python {sys.version}\n")
+        f.write(f"Timestamp: {datetime.now().isoformat()}\n")
+        f.write(f"PID: {os.getpid()}\n")
+        f.write(f"User: {os.getenv('USER', 'unknown')} (uid={os.getuid()})\n")
+
+    print(f"Archivo creado: {output_path}")
+    print("Revisa tu host — el archivo debería estar ahí.")
+
+
+# --- Escalamiento: listar N archivos con su tamaño -------------------------
+#
+# Cada os.path.getsize es un stat por archivo. En disco local cuesta ~1 µs,
+# pero en un bind mount de Docker Desktop (macOS/Windows) o en /mnt/c de WSL
+# cada stat cruza la frontera VM <-> host y cuesta 100x más.
+
+def listdir_getsize(directory):
+    """El patrón original: listar nombres y luego un stat por ruta completa."""
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def scandir(directory):
+    """Un solo recorrido sin armar rutas; en Windows el tamaño llega con el listado."""
+    with os.scandir(directory) as entries:
+        return sum(entry.stat().st_size for entry in entries)
+
+
+def batched(directory, batch=256, workers=16):
+    """scandir + stats en lotes concurrentes: esconde la latencia de cada stat."""
+    with os.scandir(directory) as entries:
+        entries = list(entries)
+
+    def sizes(chunk):
+        return sum(entry.stat().st_size for entry in chunk)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(sizes, (entries[i:i + batch] for i in range(0, len(entries), batch))))
+
+
+METHODS = {
+    "listdir_getsize": listdir_getsize,
+    "scandir": scandir,
+    "batched": batched,
+}
+
+
+def detect_mount(directory):
+    """'bind' si el directorio mismo es un punto de montaje (como /app con -v), si no 'local'."""
+    directory = os.path.realpath(directory)
+    try:
+        with open("/proc/self/mountinfo") as f:
+            mount_points = {line.split()[4] for line in f}
+    except OSError:
+        return "bind" if os.path.ismount(directory) else "local"
+    # Solo el directorio, no sus ancestros: un /home separado no es un bind mount
+    return "bind" if directory in mount_points else "local"
+
+
+def make_files(directory, n):
+    """Crea n archivos chicos en un directorio vacío."""
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    payload = b"x" * 64
+    for i in range(n):
+        with open(os.path.join(directory, f"f{i:06d}.txt"), "wb") as f:
+            f.write(payload)
+
+
+def write_rows(path, rows, mount):
+    """Agrega rows al CSV, reemplazando las de una corrida previa con el mismo mount."""
+    kept = []
+    if os.path.exists(path):
+        with open(path, newline="") as f:
+            kept = [[r[c] for c in CSV_COLUMNS] for r in csv.DictReader(f) if r["mount"] != mount]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(kept + rows)
+
+
+def scale(args):
+    mount = args.mount or detect_mount(args.dir)
+    work = os.path.join(args.dir, "_scaling_files")
+    print(f"=== Lab 1: listar N archivos ({mount}: {args.dir}) ===")
+    rows = []
+    try:
+        for n in args.counts:
+            make_files(work, n)
+            for method, fn in METHODS.items():
+                fn(work)                      # calentar el caché de dentries
+                times = []
+                for rep in range(1, args.reps + 1):
+                    t0 = time.perf_counter_ns()
+                    fn(work)
+                    ms = (time.perf_counter_ns() - t0) / 1e6
+                    times.append(ms)
+                    rows.append([mount, method, n, rep, f"{ms:.3f}", f"{ms * 1000 / n:.3f}"])
+                ms = sorted(times)[len(times) // 2]
+                print(f"  {n:>7d} archivos  {method:16s} {ms:10.2f} ms  "
+                      f"({ms * 1000 / n:.2f} µs/archivo)")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    write_rows(args.out, rows, mount)
+    print(f"\nResultados en {args.out}")
+    print(f"Para graficarlos: cp {args.out} ../../scripts/results/ && "
+          "python3 ../../scripts/analyze.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lab 1: bind mounts")
+    parser.add_argument("command", nargs="?", choices=["scale"],
+                        help="scale: mide listar N archivos (default: el laboratorio)")
+    parser.add_argument("--dir", default=str(HERE),
+                        help="Directorio donde crear los archivos (default: el de app.py)")
+    parser.add_argument("--counts", nargs="+", type=int, default=COUNTS)
+    parser.add_argument("--reps", type=int, default=3)
+    parser.add_argument("--mount", help="Etiqueta del montaje (default: bind o local, autodetectado)")
+    parser.add_argument("--out", default=str(HERE / "lab1_scaling.csv"))
+    args = parser.parse_args()
+
+    if args.command == "scale":
+        scale(args)
+    else:
+        lab()
+
 
-print("=" * 40)
-print("  Lab 1: Bind Mounts")
-print("=" * 40)
-print(f"Python version: {sys.version}")
-print(f"Working dir:    {os.getcwd()}")
-print(f"Timestamp:      {datetime.now().isoformat()}")
-print()
-
-# Listar archivos visibles en /app (el punto de montaje)
-print("Archivos en /app:")
-for f in sorted(os.listdir("/app")):
-    size = os.path.getsize(f"/app/{f}")
-    print(f"  {f:30s} {size:>6d} bytes")
-
-print()
-
-# Escribir un archivo de salida — aparecerá en tu host
-output_path = "/app/output.txt"
-with open(output_path, "w") as f:
-    f.write(f"Generado por Python {sys.version}\n")
-    f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-    f.write(f"PID: {os.getpid()}\n")
-    f.write(f"User: {os.getenv('USER', 'unknown')} (uid={os.getuid()})\n")
-
-print(f"Archivo creado: {output_path}")
-print("Revisa tu host — el archivo debería estar ahí.")
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,67 @@
 """
 analyze.py — Lee los CSVs de benchmarks y genera gráficas PNG.
 
-Uso: python3 analyze.py
-Requiere: matplotlib (pip install matplotlib)
-Lee de: results/exp1_startup.csv, results/exp2_scale.csv, results/exp3_runtime.csv
-Escribe en: results/*.png e images/*.png
+Uso: python3 analyze.py [--stream] [--merge OTRO_RESULTS_DIR ...] [--force] [--jobs N]
+     python3 analyze.py --summary-only | --json [ARCHIVO]
+     python3 analyze.py --compare A B [--all]
+Requiere: numpy; matplotlib solo para las gráficas (pip install -r requirements.txt)
+Lee de: results/*.csv (cada CSV declarado en experiments.py)
+Escribe en: results/*.png, e images/*.png para las figuras de la lección
+
+Cada experimento del registro (experiments.py) declara su CSV, agrupación,
+métrica y tipo de gráfica; un solo motor carga, agrega y dibuja todos.
+Cada CSV se carga una sola vez como columnas NumPy (tables.py) y las
+gráficas y el resumen usan las mismas estadísticas agrupadas.
+
+Con --stream los CSVs se leen en bloques y cada grupo se resume con un
+t-digest (sketches.py): memoria acotada sin importar el tamaño del archivo.
+--merge agrega los CSVs del mismo nombre de otros directorios (otras
+máquinas) combinando sus digests; implica --stream.
+
+Cada figura se renderiza una sola vez a PNG en memoria (en paralelo, una por
+proceso), se escribe en results/ y se enlaza (hardlink) en images/. Si el
+hash de sus CSVs y PLOT_VERSION coinciden con el último render
+(results/.cache/figures.json) la figura se salta; --force la regenera.
+
+El resumen sale de summary.py (registros tipados, sin matplotlib);
+--summary-only y --json nunca importan matplotlib.
+
+--compare A B compara dos corridas guardadas en el historial
+(results_store.py: ids, "last", "prev" o un host) y reporta los cambios
+estadísticamente significativos (Mann-Whitney U).
 """
 
-import csv
-import statistics
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-try:
-    import matplotlib
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-    import matplotlib.ticker as ticker
-except ImportError:
-    print("Error: matplotlib no está instalado.")
-    print("Instálalo con: pip install matplotlib")
-    sys.exit(1)
-
-RESULTS_DIR = Path(__file__).parent / "results"
+import numpy as np
+
+from experiments import EXPERIMENTS, LABELS, Panel
+from summary import (RESULTS_DIR, key_text, load_stats, missing_csvs, overhead_pct,
+                     print_summary, read_table, summarize_all)
+from tables import file_hash
+
+# matplotlib se importa solo al generar gráficas (ver load_matplotlib)
+plt = None
+ticker = None
+
 IMAGES_DIR = Path(__file__).parent.parent / "images"
 
+# Subir al cambiar cualquier plot_* o el estilo: invalida el caché de figuras
+PLOT_VERSION = 2
+FIGURE_CACHE = RESULTS_DIR / ".cache" / "figures.json"
+
+# Modo de agregación (ver main): en memoria o en streaming con t-digest
+STREAM = False
+MERGE_DIRS = []
+
 # Colores consistentes
 COLORS = {
     "bare": "#6c757d",
@@ -33,37 +70,59 @@ COLORS = {
     "podman": "#892ca0",
     "dind": "#0a8ab5",
     "podman-nested": "#6b1f80",
-}
-
-LABELS = {
-    "bare": "Bare Metal",
-    "docker": "Docker",
-    "podman": "Podman",
-    "dind": "Docker-in-Docker",
-    "podman-nested": "Podman-in-Podman",
+    "listdir_getsize": "#e63946",
+    "scandir": "#2a9d8f",
+    "batched": "#e9c46a",
 }
 
 
-def read_csv(filename):
-    """Lee un CSV y retorna una lista de diccionarios."""
-    filepath = RESULTS_DIR / filename
-    if not filepath.exists():
-        print(f"  Archivo no encontrado: {filepath}")
-        return []
-    with open(filepath) as f:
-        return list(csv.DictReader(f))
+def load_matplotlib():
+    """Importa matplotlib (backend Agg) la primera vez que se necesita."""
+    global plt, ticker
+    if plt is not None:
+        return
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as pyplot
+        import matplotlib.ticker as mticker
+    except ImportError:
+        print("Error: matplotlib no está instalado.")
+        print("Instálalo con: pip install matplotlib")
+        print("(python3 analyze.py --summary-only no lo necesita)")
+        sys.exit(1)
+    plt, ticker = pyplot, mticker
+
+
+def render_png(fig):
+    """Renderiza una figura a bytes PNG (una sola vez) y la cierra."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight", facecolor="#1a1a2e")
+    plt.close(fig)
+    return buf.getvalue()
 
 
-def save_fig(fig, name):
-    """Guarda una figura como PNG en results/ y en images/."""
+def save_fig(png, name, publish=True):
+    """Escribe el PNG en results/ y, si publish, lo enlaza en images/ (copia si no se puede)."""
     path = RESULTS_DIR / name
-    fig.savefig(path, dpi=150, bbox_inches="tight", facecolor="#1a1a2e")
+    tmp = path.with_name(name + ".tmp")
+    tmp.write_bytes(png)
+    os.replace(tmp, path)
     print(f"  Guardado: {path}")
+    if not publish:
+        return
+
     IMAGES_DIR.mkdir(parents=True, exist_ok=True)
     img_path = IMAGES_DIR / name
-    fig.savefig(img_path, dpi=150, bbox_inches="tight", facecolor="#1a1a2e")
+    tmp = img_path.with_name(name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(path, tmp)
+    except OSError:
+        # Otro sistema de archivos o sin soporte de hardlinks
+        shutil.copyfile(path, tmp)
+    os.replace(tmp, img_path)
     print(f"  Guardado: {img_path}")
-    plt.close(fig)
 
 
 def style_ax(ax, title, ylabel):
@@ -76,107 +135,290 @@ def style_ax(ax, title, ylabel):
         spine.set_color("#333")
 
 
-def median_iqr(values):
-    """Retorna mediana, Q1, Q3."""
-    if not values:
-        return 0, 0, 0
-    med = statistics.median(values)
-    q1 = statistics.median(sorted(values)[:len(values) // 2]) if len(values) > 1 else med
-    q3 = statistics.median(sorted(values)[-(len(values) // 2):]) if len(values) > 1 else med
-    return med, q1, q3
+def aggregate(filename, by, value):
+    """Estadísticos agrupados con el modo de main (--stream/--merge)."""
+    return load_stats(filename, by, value, RESULTS_DIR, STREAM, MERGE_DIRS)
 
 
-def plot_exp1_startup():
-    """Exp 1: Grouped bar chart — 5 bars (bare, docker/ubuntu, docker/alpine,
-    podman/ubuntu, podman/alpine), median + IQR whiskers."""
-    rows = read_csv("exp1_startup.csv")
-    if not rows:
-        return
+def iqr_errors(stats, keys):
+    """Medianas y whiskers (med - Q1, Q3 - med) de los grupos; 0 si falta el grupo."""
+    empty = {"median": 0, "q1": 0, "q3": 0}
+    groups = [stats.get(k, empty) for k in keys]
+    medians = [g["median"] for g in groups]
+    yerr_low = [g["median"] - g["q1"] for g in groups]
+    yerr_high = [g["q3"] - g["median"] for g in groups]
+    return medians, yerr_low, yerr_high
 
-    # Group by (runtime, image)
+
+def scale_rows(table):
+    """Exp 2: filas con todas las métricas numéricas, agrupadas por runtime."""
+    cols = ["count", "launch_time_s", "per_container_kb", "daemon_rss_kb"]
+    if not table or any(c not in table for c in cols):
+        return {}
+    valid = np.logical_and.reduce([~np.isnan(table[c]) for c in cols])
+    table = table.filter(valid)
     data = {}
-    for row in rows:
-        key = (row["runtime"], row["image"])
-        try:
-            data.setdefault(key, []).append(float(row["startup_ms"]))
-        except (ValueError, KeyError):
-            continue
+    for rt in dict.fromkeys(table["runtime"].tolist()):
+        m = table["runtime"] == rt
+        data[rt] = {
+            "counts": table["count"][m].astype(int).tolist(),
+            "launch": table["launch_time_s"][m].tolist(),
+            "per_kb": table["per_container_kb"][m].tolist(),
+            "daemon_kb": table["daemon_rss_kb"][m].tolist(),
+        }
+    return data
+
+
+def experiment_stats(exp, metric=None):
+    """Estadísticos de la métrica de un experimento agrupados por su group_by."""
+    return aggregate(exp.csv, list(exp.group_by), metric or exp.metric)
+
+
+def group_label(key):
+    """Etiqueta de eje para una llave visible: "Docker\\nAlpine", "Bare Metal"."""
+    parts = [LABELS.get(p, key_text(p).replace("_", " ").title())
+             for i, p in enumerate(key) if i == 0 or p != "none"]
+    return "\n".join(parts)
+
+
+def panel_groups(exp, stats, panel):
+    """
+    Grupos de `stats` que pertenecen a un panel, en el orden del experimento.
+
+    Retorna [(llave visible, llave completa)]; la llave visible omite las
+    columnas fijadas por panel.where. Grupos fuera de exp.order van al final.
+    """
+    where = {exp.group_by.index(c): v for c, v in panel.where.items()}
+    shown = [i for i in range(len(exp.group_by)) if i not in where]
+    groups = {}
+    for key in stats.keys:
+        if all(key[i] == v for i, v in where.items()):
+            groups[tuple(key[i] for i in shown)] = key
+    order = [k for k in exp.order if k in groups]
+    order += [k for k in groups if k not in order]
+    return [(k, groups[k]) for k in order]
+
+
+def make_axes(n):
+    """Figura con n paneles (máximo 2 por fila)."""
+    cols = min(n, 2)
+    rows = (n + cols - 1) // cols
+    fig, axes = plt.subplots(rows, cols, figsize=(10 if n == 1 else 7 * cols, 5 * rows),
+                             facecolor="#1a1a2e", squeeze=False)
+    axes = axes.ravel()
+    for ax in axes[n:]:
+        ax.set_visible(False)
+    return fig, axes[:n]
+
+
+def finish_figure(fig, exp, panels):
+    """Título general y ajuste cuando hay más de un panel."""
+    if len(panels) > 1:
+        fig.suptitle(exp.title, color="white", fontsize=16, fontweight="bold", y=1.02)
+        fig.tight_layout()
+    return fig
+
+
+def chart_bars(exp):
+    """Una barra por grupo (mediana + IQR), un panel por Panel."""
+    stats = experiment_stats(exp)
+    if not len(stats):
+        return None
+
+    panels = exp.panels or (Panel(exp.title, exp.metric),)
+    fig, axes = make_axes(len(panels))
+    fontsize = 10 if len(panels) == 1 else 9
+    for ax, panel in zip(axes, panels):
+        pstats = experiment_stats(exp, panel.metric) if panel.metric else stats
+        groups = panel_groups(exp, pstats, panel)
+        keys = [full for _, full in groups]
+        medians, yerr_low, yerr_high = iqr_errors(pstats, keys)
+        bars = ax.bar(range(len(keys)), medians,
+                      color=[COLORS.get(k[0], "#aaa") for k in keys],
+                      edgecolor="#333", linewidth=0.5,
+                      yerr=[yerr_low, yerr_high], capsize=5,
+                      error_kw={"color": "white", "linewidth": 1.2})
+
+        top = max(medians, default=0)
+        for bar, key, med in zip(bars, keys, medians):
+            label = panel.fmt.format(med)
+            if panel.overhead and key[0] != exp.baseline:
+                pct = overhead_pct(pstats, key, exp)
+                if pct is not None:
+                    label += f"\n({pct:+.0f}%)"
+            ax.text(bar.get_x() + bar.get_width() / 2,
+                    bar.get_height() + top * 0.03,
+                    label, ha="center", va="bottom",
+                    color="white", fontsize=fontsize)
+
+        ax.margins(y=0.15)
+        ax.set_xticks(range(len(keys)))
+        ax.set_xticklabels([group_label(k) for k, _ in groups], fontsize=fontsize, color="white")
+        style_ax(ax, panel.title, panel.ylabel)
+
+    return finish_figure(fig, exp, panels)
+
+
+def chart_grouped(exp):
+    """Barras agrupadas por el segundo nivel de la llave + overhead % vs baseline."""
+    stats = experiment_stats(exp)
+    if not len(stats):
+        return None
+
+    panel = exp.panels[0] if exp.panels else Panel(exp.title, exp.metric)
+    overhead_panel = exp.panels[1] if len(exp.panels) > 1 else Panel(
+        f"Overhead vs {LABELS.get(exp.baseline, exp.baseline)} (%)", "Overhead (%)")
+    keys = [full for _, full in panel_groups(exp, stats, panel)]
+    runtimes = list(dict.fromkeys(k[0] for k in keys))
+    subgroups = list(dict.fromkeys(k[1:] for k in keys))
 
-    if not data:
-        return
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5), facecolor="#1a1a2e")
 
-    # Order: bare, docker/ubuntu, docker/alpine, podman/ubuntu, podman/alpine
-    order = [
-        ("bare", "none"),
-        ("docker", "ubuntu"), ("docker", "alpine"),
-        ("podman", "ubuntu"), ("podman", "alpine"),
-    ]
-    keys = [k for k in order if k in data]
-    labels = []
-    for rt, img in keys:
-        if rt == "bare":
-            labels.append("Bare Metal")
-        else:
-            labels.append(f"{rt.title()}\n{img.title()}")
-
-    medians = []
-    q1s = []
-    q3s = []
-    colors = []
-    for k in keys:
-        med, q1, q3 = median_iqr(data[k])
-        medians.append(med)
-        q1s.append(q1)
-        q3s.append(q3)
-        colors.append(COLORS.get(k[0], "#aaa"))
-
-    # Whisker errors: lower = med - q1, upper = q3 - med
-    yerr_low = [m - q for m, q in zip(medians, q1s)]
-    yerr_high = [q - m for m, q in zip(medians, q3s)]
-
-    fig, ax = plt.subplots(figsize=(10, 5), facecolor="#1a1a2e")
-    bars = ax.bar(range(len(keys)), medians, color=colors,
-                  edgecolor="#333", linewidth=0.5,
-                  yerr=[yerr_low, yerr_high], capsize=5,
-                  error_kw={"color": "white", "linewidth": 1.2})
-
-    for bar, med in zip(bars, medians):
-        ax.text(bar.get_x() + bar.get_width() / 2,
-                bar.get_height() + max(medians) * 0.04,
-                f"{med:.1f} ms", ha="center", va="bottom",
-                color="white", fontsize=10)
-
-    ax.set_xticks(range(len(keys)))
-    ax.set_xticklabels(labels, fontsize=10, color="white")
-    style_ax(ax, "Exp 1: Startup Latency (mediana + IQR)", "Tiempo (ms)")
-
-    save_fig(fig, "exp1_startup.png")
-
-
-def plot_exp2_scale():
-    """Exp 2: 2 panels — launch time vs N (lines), per-container KB + daemon RSS."""
-    rows = read_csv("exp2_scale.csv")
-    if not rows:
-        return
+    # Panel 1: mediana por subgrupo, una barra por runtime
+    for si, sub in enumerate(subgroups):
+        x_base = si * (len(runtimes) + 1)
+        for ri, rt in enumerate(runtimes):
+            group = stats.get((rt,) + sub)
+            if not group:
+                continue
+            med = group["median"]
+            ax1.bar(x_base + ri, med, width=0.7,
+                    color=COLORS.get(rt, "#aaa"),
+                    edgecolor="#333", linewidth=0.5)
+            ax1.text(x_base + ri, med + 0.03,
+                     panel.fmt.format(med), ha="center", va="bottom",
+                     color="white", fontsize=9)
 
-    data = {}
-    for row in rows:
-        rt = row["runtime"]
-        try:
-            count = int(row["count"])
-            launch = float(row["launch_time_s"])
-            per_kb = float(row["per_container_kb"])
-            daemon_kb = float(row["daemon_rss_kb"])
-        except (ValueError, KeyError):
-            continue
-        data.setdefault(rt, {"counts": [], "launch": [], "per_kb": [], "daemon_kb": []})
-        data[rt]["counts"].append(count)
-        data[rt]["launch"].append(launch)
-        data[rt]["per_kb"].append(per_kb)
-        data[rt]["daemon_kb"].append(daemon_kb)
+    ax1.set_xticks([si * (len(runtimes) + 1) + (len(runtimes) - 1) / 2
+                    for si in range(len(subgroups))])
+    ax1.set_xticklabels([group_label(("",) + sub).strip() for sub in subgroups],
+                        color="white", fontsize=11)
+    style_ax(ax1, panel.title, panel.ylabel)
+
+    from matplotlib.patches import Patch
+    legend_elements = [Patch(facecolor=COLORS.get(rt, "#aaa"), edgecolor="#333",
+                             label=LABELS.get(rt, rt)) for rt in runtimes]
+    ax1.legend(handles=legend_elements, facecolor="#16213e",
+               edgecolor="#333", labelcolor="white")
+
+    # Panel 2: overhead % por subgrupo
+    others = [rt for rt in runtimes if rt != exp.baseline]
+    width = 0.5
+    x = list(range(len(subgroups)))
+    for ri, rt in enumerate(others):
+        vals = [overhead_pct(stats, (rt,) + sub, exp) if (rt,) + sub in stats else None
+                for sub in subgroups]
+        vals = [v or 0 for v in vals]
+        offset = (ri - (len(others) - 1) / 2) * width
+        bars = ax2.bar([xi + offset for xi in x], vals,
+                       width=width, label=LABELS.get(rt, rt),
+                       color=COLORS.get(rt, "#aaa"), edgecolor="#333", linewidth=0.5)
+        for bar, val in zip(bars, vals):
+            y_pos = bar.get_height() if val >= 0 else bar.get_height() - 1.5
+            ax2.text(bar.get_x() + bar.get_width() / 2, y_pos + 0.5,
+                     f"{val:+.1f}%", ha="center", va="bottom",
+                     color="white", fontsize=10, fontweight="bold")
+
+    ax2.axhline(y=0, color="#666", linewidth=0.8, linestyle="--")
+    ax2.set_xticks(x)
+    ax2.set_xticklabels([group_label(("",) + sub).strip() for sub in subgroups],
+                        color="white", fontsize=11)
+    ax2.legend(facecolor="#16213e", edgecolor="#333", labelcolor="white")
+    style_ax(ax2, overhead_panel.title, overhead_panel.ylabel)
+
+    return fig
 
+
+def line_series(exp, stats, panel):
+    """{llave de serie: [(x, mediana)]} de los grupos del panel, ordenado por x."""
+    xi = exp.group_by.index(exp.x)
+    series = {}
+    for _, key in panel_groups(exp, stats, panel):
+        x = key[xi]
+        if exp.x_regex:
+            match = re.search(exp.x_regex, str(x))
+            if not match:
+                continue
+            x = match.group(1)
+        name = tuple(p for p, col in zip(key, exp.group_by)
+                     if col != exp.x and col not in panel.where)
+        series.setdefault(name, []).append((float(x), stats.get(key)["median"]))
+    return {name: sorted(points) for name, points in series.items()}
+
+
+def chart_lines(exp):
+    """Mediana de la métrica vs `exp.x`, una línea por runtime."""
+    stats = experiment_stats(exp)
+    if not len(stats):
+        return None
+
+    panels = exp.panels or (Panel(exp.title, exp.metric),)
+    fig, axes = make_axes(len(panels))
+    for ax, panel in zip(axes, panels):
+        pstats = experiment_stats(exp, panel.metric) if panel.metric else stats
+        series = line_series(exp, pstats, panel)
+        for name, points in series.items():
+            xs, ys = zip(*points)
+            ax.plot(xs, ys, "o-", color=COLORS.get(name[0], "#aaa"),
+                    label=group_label(name).replace("\n", " "),
+                    linewidth=2, markersize=8)
+            for x, y in points:
+                ax.annotate(panel.fmt.format(y), (x, y), xytext=(0, 6),
+                            textcoords="offset points", ha="center", va="bottom",
+                            color="white", fontsize=9)
+
+        style_ax(ax, panel.title, panel.ylabel)
+        ax.set_xlabel(exp.xlabel or exp.x, color="white", fontsize=11)
+        if exp.logy:
+            ax.set_yscale("log")
+        if exp.logx:
+            ax.set_xscale("log")
+        else:
+            ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
+        if series:
+            ax.legend(facecolor="#16213e", edgecolor="#333", labelcolor="white")
+
+    return finish_figure(fig, exp, panels)
+
+
+def chart_status(exp):
+    """Resultado categórico por fila (success/error) con el tiempo si existe."""
+    table = read_table(exp.csv)
+    if not table or exp.status not in table:
+        return None
+
+    panel = exp.panels[0] if exp.panels else Panel(exp.title, exp.metric)
+    rows = list(table.rows())
+    numeric = exp.schema.get(exp.metric) is float
+    heights = [float(r[exp.metric]) if numeric and not np.isnan(r[exp.metric]) else 0.0
+               for r in rows]
+    ok = [str(r[exp.status]).strip() == "success" for r in rows]
+
+    fig, ax = plt.subplots(figsize=(max(10, 1.6 * len(rows)), 5), facecolor="#1a1a2e")
+    bars = ax.bar(range(len(rows)), heights,
+                  color=["#2a9d8f" if good else "#e63946" for good in ok],
+                  edgecolor="#333", linewidth=0.5)
+    top = max(heights, default=0) or 1
+    for bar, row, height in zip(bars, rows, heights):
+        label = str(row[exp.status]).strip()
+        if height:
+            label = f"{panel.fmt.format(height)}\n{label}"
+        ax.text(bar.get_x() + bar.get_width() / 2, height + top * 0.03,
+                label, ha="center", va="bottom", color="white", fontsize=9)
+
+    ax.set_ylim(0, top * 1.25)
+    ax.set_xticks(range(len(rows)))
+    ax.set_xticklabels([group_label(tuple(r[c] for c in exp.group_by if c != exp.status))
+                        for r in rows], fontsize=9, color="white")
+    style_ax(ax, panel.title, panel.ylabel)
+    return fig
+
+
+def chart_scale(exp):
+    """Exp 2: 2 panels — launch time vs N (lines), per-container KB + daemon RSS."""
+    data = scale_rows(read_table(exp.csv))
     if not data:
-        return
+        return None
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5), facecolor="#1a1a2e")
 
@@ -244,331 +486,183 @@ def plot_exp2_scale():
     ax2.legend(h1 + h2, l1 + l2, facecolor="#16213e", edgecolor="#333",
                labelcolor="white", fontsize=8, loc="upper left")
 
-    save_fig(fig, "exp2_scale.png")
-
-
-def plot_exp3_runtime():
-    """Exp 3: 2 panels — grouped bars per workload + overhead % comparison."""
-    rows = read_csv("exp3_runtime.csv")
-    if not rows:
-        return
-
-    # Group by (runtime, workload)
-    data = {}
-    for row in rows:
-        key = (row["runtime"], row["workload"])
-        try:
-            data.setdefault(key, []).append(float(row["time_s"]))
-        except (ValueError, KeyError):
+    return fig
+
+
+def chart_timeseries(exp):
+    """Suma de la métrica entre cgroups por instante, una línea por grupo (runtime, count)."""
+    table = read_table(exp.csv)
+    if not table or exp.x not in table:
+        return None
+
+    panel = exp.panels[0] if exp.panels else Panel(exp.title, exp.metric)
+    fig, ax = plt.subplots(figsize=(12, 5), facecolor="#1a1a2e")
+    keys = list(dict.fromkeys(zip(*(table[c].tolist() for c in exp.group_by))))
+    for i, key in enumerate(keys):
+        mask = np.logical_and.reduce([table[c] == v for c, v in zip(exp.group_by, key)])
+        t = table[exp.x][mask]
+        values = table[exp.metric][mask]
+        # Cada muestra tiene una fila por cgroup con el mismo t: sumar por instante
+        ticks, inverse = np.unique(t, return_inverse=True)
+        total = np.bincount(inverse, weights=np.nan_to_num(values))
+        seen = np.bincount(inverse, weights=~np.isnan(values)) > 0
+        if not seen.any():
             continue
+        shade = 0.35 + 0.65 * (i + 1) / len(keys)
+        ax.plot(ticks[seen], total[seen] / 1024, "-", color=COLORS.get(key[0], "#aaa"),
+                alpha=shade, linewidth=1.5,
+                label=group_label(key).replace("\n", " ") + " cont")
+
+    style_ax(ax, panel.title, panel.ylabel)
+    ax.set_xlabel(exp.xlabel or exp.x, color="white", fontsize=11)
+    if ax.lines:
+        ax.legend(facecolor="#16213e", edgecolor="#333", labelcolor="white", fontsize=8)
+    return fig
+
+
+# Tipo de gráfica (Experiment.chart) -> función que la dibuja
+CHARTS = {
+    "bars": chart_bars,
+    "grouped": chart_grouped,
+    "lines": chart_lines,
+    "status": chart_status,
+    "scale": chart_scale,
+    "timeseries": chart_timeseries,
+}
 
-    if not data:
-        return
-
-    workloads = ["hash", "sort"]
-    runtimes = ["bare", "docker", "podman"]
-    workload_labels = {"hash": "Hash (SHA-256)", "sort": "Sort (1M ints)"}
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5), facecolor="#1a1a2e")
-
-    # Panel 1: Grouped bars — median time per workload
-    width = 0.25
-    for wi, wl in enumerate(workloads):
-        ax = ax1
-        x_base = wi * (len(runtimes) + 1)
-        for ri, rt in enumerate(runtimes):
-            key = (rt, wl)
-            vals = data.get(key, [])
-            if not vals:
-                continue
-            med = statistics.median(vals)
-            x_pos = x_base + ri
-            bar = ax.bar(x_pos, med, width=0.7,
-                         color=COLORS.get(rt, "#aaa"),
-                         edgecolor="#333", linewidth=0.5)
-            ax.text(x_pos, med + 0.03,
-                    f"{med:.3f}s", ha="center", va="bottom",
-                    color="white", fontsize=9)
-
-    # X-axis labels
-    tick_positions = []
-    tick_labels = []
-    for wi, wl in enumerate(workloads):
-        x_base = wi * (len(runtimes) + 1)
-        tick_positions.append(x_base + 1)  # center of 3 bars
-        tick_labels.append(workload_labels[wl])
-
-    ax1.set_xticks(tick_positions)
-    ax1.set_xticklabels(tick_labels, color="white", fontsize=11)
-    style_ax(ax1, "Tiempo de Ejecución (mediana)", "Tiempo (s)")
-
-    # Legend
-    from matplotlib.patches import Patch
-    legend_elements = [Patch(facecolor=COLORS[rt], edgecolor="#333",
-                             label=LABELS[rt]) for rt in runtimes]
-    ax1.legend(handles=legend_elements, facecolor="#16213e",
-               edgecolor="#333", labelcolor="white")
-
-    # Panel 2: Overhead % per workload
-    overhead_data = {}
-    for wl in workloads:
-        bare_vals = data.get(("bare", wl), [])
-        if not bare_vals:
+# Figura -> experimento del registro
+FIGURES = {exp.figure: exp for exp in EXPERIMENTS}
+
+
+def figure_key(name):
+    """Hash de los CSVs de entrada (de results/ y --merge), modo y PLOT_VERSION."""
+    h = hashlib.sha256(f"{PLOT_VERSION}:{STREAM}".encode())
+    for results_dir in [RESULTS_DIR] + MERGE_DIRS:
+        path = results_dir / FIGURES[name].csv
+        h.update(f"{path}:{file_hash(path) if path.exists() else '-'}".encode())
+    return h.hexdigest()
+
+
+def _render_figure(name, stream, merge_dirs):
+    """Dibuja y renderiza una figura (corre en un proceso del pool)."""
+    global STREAM, MERGE_DIRS
+    STREAM, MERGE_DIRS = stream, merge_dirs
+    load_matplotlib()
+    exp = FIGURES[name]
+    fig = CHARTS[exp.chart](exp)
+    return render_png(fig) if fig is not None else None
+
+
+def generate_figures(force=False, jobs=None):
+    """
+    Genera las figuras cuyos CSVs cambiaron desde el último render.
+
+    Las figuras pendientes se renderizan en paralelo; el proceso principal
+    escribe los archivos y actualiza el caché.
+    """
+    load_matplotlib()
+    try:
+        with open(FIGURE_CACHE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    pending = {}
+    for name in FIGURES:
+        key = figure_key(name)
+        fresh = (RESULTS_DIR / name).exists() and (
+            not FIGURES[name].publish or (IMAGES_DIR / name).exists())
+        if not force and fresh and cache.get(name) == key:
+            print(f"  Sin cambios: {name}")
+        else:
+            pending[name] = key
+
+    if len(pending) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pngs = pool.map(_render_figure, pending,
+                            [STREAM] * len(pending), [MERGE_DIRS] * len(pending))
+            rendered = dict(zip(pending, pngs))
+    else:
+        rendered = {name: _render_figure(name, STREAM, MERGE_DIRS) for name in pending}
+
+    for name, png in rendered.items():
+        if png is None:
             continue
-        bare_med = statistics.median(bare_vals)
-        for rt in ["docker", "podman"]:
-            vals = data.get((rt, wl), [])
-            if not vals:
-                continue
-            med = statistics.median(vals)
-            pct = ((med - bare_med) / bare_med) * 100
-            overhead_data.setdefault(rt, {})[wl] = pct
-
-    x = list(range(len(workloads)))
-    for ri, rt in enumerate(["docker", "podman"]):
-        if rt not in overhead_data:
-            continue
-        vals = [overhead_data[rt].get(wl, 0) for wl in workloads]
-        offset = (ri - 0.5) * width * 2
-        bars = ax2.bar([xi + offset for xi in x], vals,
-                       width=width * 2, label=LABELS[rt],
-                       color=COLORS.get(rt), edgecolor="#333", linewidth=0.5)
-        for bar, val in zip(bars, vals):
-            y_pos = bar.get_height() if val >= 0 else bar.get_height() - 1.5
-            ax2.text(bar.get_x() + bar.get_width() / 2, y_pos + 0.5,
-                     f"{val:+.1f}%", ha="center", va="bottom",
-                     color="white", fontsize=10, fontweight="bold")
-
-    ax2.axhline(y=0, color="#666", linewidth=0.8, linestyle="--")
-    ax2.set_xticks(x)
-    ax2.set_xticklabels([workload_labels[wl] for wl in workloads],
-                        color="white", fontsize=11)
-    ax2.legend(facecolor="#16213e", edgecolor="#333", labelcolor="white")
-    style_ax(ax2, "Overhead vs Bare Metal (%)", "Overhead (%)")
-
-    save_fig(fig, "exp3_runtime.png")
+        save_fig(png, name, FIGURES[name].publish)
+        cache[name] = pending[name]
 
+    FIGURE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    with open(FIGURE_CACHE, "w") as f:
+        json.dump(cache, f, indent=2)
 
-def plot_exp4_nested():
-    """Exp 4: 2 panels — startup latency (bars) + CPU overhead (bars) at nesting levels."""
-    rows = read_csv("exp4_nested.csv")
-    if not rows:
-        return
 
-    # Group by (method, metric)
-    data = {}
-    for row in rows:
-        key = (row["method"], row["metric"])
+def main():
+    global STREAM, MERGE_DIRS
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gráficas y resumen de benchmarks")
+    parser.add_argument("--stream", action="store_true",
+                        help="Lee los CSVs en bloques con t-digests (memoria acotada)")
+    parser.add_argument("--merge", nargs="+", type=Path, default=[], metavar="DIR",
+                        help="Combina los CSVs de otros directorios de resultados")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenera todas las figuras aunque sus CSVs no hayan cambiado")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Procesos para renderizar (default: número de CPUs)")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="Solo el resumen en texto (no importa matplotlib)")
+    parser.add_argument("--json", nargs="?", const="-", metavar="ARCHIVO",
+                        help="Resumen en JSON a stdout o a ARCHIVO (no importa matplotlib)")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"),
+                        help="Compara dos corridas del historial (id, last, prev o host)")
+    parser.add_argument("--all", action="store_true",
+                        help="Con --compare, muestra también los cambios no significativos")
+    parser.add_argument("--db", type=Path, default=None,
+                        help="Base de historial (default: results/history.sqlite)")
+    args = parser.parse_args()
+    STREAM = args.stream or bool(args.merge)
+    MERGE_DIRS = args.merge
+
+    if args.compare:
+        import results_store
+        db = args.db or results_store.DB_PATH
         try:
-            data.setdefault(key, []).append(float(row["value"]))
-        except (ValueError, KeyError):
-            continue
-
-    if not data:
+            run_a, run_b = (results_store.resolve_run(ref, db) for ref in args.compare)
+        except ValueError as e:
+            parser.error(str(e))
+        changes = results_store.compare(run_a, run_b, db)
+        results_store.print_comparison(run_a, run_b, changes, args.all, db=db)
         return
 
-    methods = ["bare", "docker", "dind", "podman", "podman-nested"]
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5), facecolor="#1a1a2e")
-
-    # Panel 1: Startup latency
-    startup_meds = []
-    startup_colors = []
-    startup_labels = []
-    startup_yerr_lo = []
-    startup_yerr_hi = []
-    for m in methods:
-        vals = data.get((m, "startup_ms"), [])
-        if vals:
-            med, q1, q3 = median_iqr(vals)
-            startup_meds.append(med)
-            startup_yerr_lo.append(med - q1)
-            startup_yerr_hi.append(q3 - med)
-        else:
-            startup_meds.append(0)
-            startup_yerr_lo.append(0)
-            startup_yerr_hi.append(0)
-        startup_colors.append(COLORS.get(m, "#aaa"))
-        label = LABELS.get(m, m)
-        # Line break for long labels
-        if "-" in m or " " in label:
-            parts = label.split("-") if "-" in label else label.split(" ", 1)
-            label = "\n".join(parts) if len(parts) == 2 else label
-        startup_labels.append(label)
-
-    bars1 = ax1.bar(range(len(methods)), startup_meds, color=startup_colors,
-                    edgecolor="#333", linewidth=0.5,
-                    yerr=[startup_yerr_lo, startup_yerr_hi], capsize=5,
-                    error_kw={"color": "white", "linewidth": 1.2})
-    for bar, med in zip(bars1, startup_meds):
-        ax1.text(bar.get_x() + bar.get_width() / 2,
-                 bar.get_height() + max(startup_meds) * 0.03,
-                 f"{med:.0f} ms", ha="center", va="bottom",
-                 color="white", fontsize=9)
-
-    ax1.set_xticks(range(len(methods)))
-    ax1.set_xticklabels(startup_labels, fontsize=9, color="white")
-    style_ax(ax1, "Startup Latency por Nivel de Nesting", "Tiempo (ms)")
-
-    # Panel 2: CPU overhead
-    cpu_meds = []
-    cpu_colors = []
-    cpu_labels = []
-    cpu_yerr_lo = []
-    cpu_yerr_hi = []
-    for m in methods:
-        vals = data.get((m, "cpu_s"), [])
-        if vals:
-            med, q1, q3 = median_iqr(vals)
-            cpu_meds.append(med)
-            cpu_yerr_lo.append(med - q1)
-            cpu_yerr_hi.append(q3 - med)
+    # Aviso único por corrida (las figuras y el resumen cargan el mismo CSV varias veces)
+    for path in missing_csvs(RESULTS_DIR):
+        print(f"  Archivo no encontrado: {path}", file=sys.stderr)
+
+    if args.json or args.summary_only:
+        summaries = summarize_all(RESULTS_DIR, STREAM, MERGE_DIRS)
+        if args.json:
+            data = json.dumps([s.to_dict() for s in summaries], indent=2, ensure_ascii=False)
+            if args.json == "-":
+                print(data)
+            else:
+                Path(args.json).write_text(data + "\n", encoding="utf-8")
+                print(f"Resumen guardado en {args.json}")
         else:
-            cpu_meds.append(0)
-            cpu_yerr_lo.append(0)
-            cpu_yerr_hi.append(0)
-        cpu_colors.append(COLORS.get(m, "#aaa"))
-        label = LABELS.get(m, m)
-        if "-" in m or " " in label:
-            parts = label.split("-") if "-" in label else label.split(" ", 1)
-            label = "\n".join(parts) if len(parts) == 2 else label
-        cpu_labels.append(label)
-
-    bars2 = ax2.bar(range(len(methods)), cpu_meds, color=cpu_colors,
-                    edgecolor="#333", linewidth=0.5,
-                    yerr=[cpu_yerr_lo, cpu_yerr_hi], capsize=5,
-                    error_kw={"color": "white", "linewidth": 1.2})
-
-    bare_med = cpu_meds[0] if cpu_meds[0] > 0 else 1
-    for bar, med in zip(bars2, cpu_meds):
-        pct = ((med - bare_med) / bare_med) * 100
-        label = f"{med:.3f}s" if med == bare_med else f"{med:.3f}s\n({pct:+.0f}%)"
-        ax2.text(bar.get_x() + bar.get_width() / 2,
-                 bar.get_height() + max(cpu_meds) * 0.03,
-                 label, ha="center", va="bottom",
-                 color="white", fontsize=9)
-
-    ax2.set_xticks(range(len(methods)))
-    ax2.set_xticklabels(cpu_labels, fontsize=9, color="white")
-    style_ax(ax2, "CPU Overhead (sha256sum 50MB, exec)", "Tiempo (s)")
-
-    fig.suptitle("Exp 4: Nested Container Performance", color="white",
-                 fontsize=16, fontweight="bold", y=1.02)
-    fig.tight_layout()
-    save_fig(fig, "exp4_nested.png")
-
-
-def print_summary():
-    """Imprime una tabla resumen en texto."""
-    print("\n" + "=" * 60)
-    print("  RESUMEN DE BENCHMARKS")
-    print("=" * 60)
-
-    # Exp 1
-    rows = read_csv("exp1_startup.csv")
-    if rows:
-        data = {}
-        for row in rows:
-            key = f"{row['runtime']}/{row['image']}"
-            try:
-                data.setdefault(key, []).append(float(row["startup_ms"]))
-            except (ValueError, KeyError):
-                pass
-        print("\nExp 1 — Startup Latency (mediana):")
-        for key in ["bare/none", "docker/ubuntu", "docker/alpine",
-                     "podman/ubuntu", "podman/alpine"]:
-            if key in data:
-                med = statistics.median(data[key])
-                print(f"  {key:20s} {med:8.1f} ms")
-
-    # Exp 2
-    rows = read_csv("exp2_scale.csv")
-    if rows:
-        print("\nExp 2 — Scale (launch time + memory):")
-        for row in rows:
-            try:
-                rt = row["runtime"]
-                count = row["count"]
-                launch = float(row["launch_time_s"])
-                per_kb = float(row["per_container_kb"])
-                daemon_kb = float(row["daemon_rss_kb"])
-                print(f"  {LABELS.get(rt, rt):10s} {count:>2s} cont: "
-                      f"{launch:6.2f}s, {per_kb:.0f} KB/cont, "
-                      f"daemon={daemon_kb:.0f} KB")
-            except (ValueError, KeyError):
-                pass
-
-    # Exp 3
-    rows = read_csv("exp3_runtime.csv")
-    if rows:
-        data = {}
-        for row in rows:
-            key = (row["runtime"], row["workload"])
-            try:
-                data.setdefault(key, []).append(float(row["time_s"]))
-            except (ValueError, KeyError):
-                pass
-        print("\nExp 3 — Runtime Overhead (mediana):")
-        for wl in ["hash", "sort"]:
-            print(f"  {wl}:")
-            bare_med = statistics.median(data.get(("bare", wl), [1]))
-            for rt in ["bare", "docker", "podman"]:
-                vals = data.get((rt, wl), [])
-                if vals:
-                    med = statistics.median(vals)
-                    if rt == "bare":
-                        print(f"    {LABELS.get(rt, rt):15s} {med:.4f}s")
-                    else:
-                        pct = ((med - bare_med) / bare_med) * 100
-                        print(f"    {LABELS.get(rt, rt):15s} {med:.4f}s ({pct:+.1f}%)")
-
-    # Exp 4
-    rows = read_csv("exp4_nested.csv")
-    if rows:
-        data = {}
-        for row in rows:
-            key = (row["method"], row["metric"])
-            try:
-                data.setdefault(key, []).append(float(row["value"]))
-            except (ValueError, KeyError):
-                pass
-        methods = ["bare", "docker", "dind", "podman", "podman-nested"]
-        print("\nExp 4 — Nested Containers:")
-        print("  Startup (mediana):")
-        for m in methods:
-            vals = data.get((m, "startup_ms"), [])
-            if vals:
-                med = statistics.median(vals)
-                print(f"    {LABELS.get(m, m):22s} {med:8.1f} ms")
-        print("  CPU sha256sum 50MB (mediana):")
-        bare_cpu = statistics.median(data.get(("bare", "cpu_s"), [1]))
-        for m in methods:
-            vals = data.get((m, "cpu_s"), [])
-            if vals:
-                med = statistics.median(vals)
-                if m == "bare":
-                    print(f"    {LABELS.get(m, m):22s} {med:.3f}s")
-                else:
-                    pct = ((med - bare_cpu) / bare_cpu) * 100
-                    print(f"    {LABELS.get(m, m):22s} {med:.3f}s ({pct:+.1f}%)")
-
-    print("\n" + "=" * 60)
-
+            print_summary(summaries)
+        return
 
-def main():
     print("Generando gráficas de benchmarks...")
     print(f"Directorio de resultados: {RESULTS_DIR}")
     print()
 
-    plot_exp1_startup()
-    plot_exp2_scale()
-    plot_exp3_runtime()
-    plot_exp4_nested()
+    generate_figures(args.force, args.jobs)
 
-    print_summary()
+    print_summary(summarize_all(RESULTS_DIR, STREAM, MERGE_DIRS))
 
     print("\nGráficas generadas:")
-    for png in sorted(RESULTS_DIR.glob("exp*.png")):
-        print(f"  {png}")
+    for name in FIGURES:
+        if (RESULTS_DIR / name).exists():
+            print(f"  {RESULTS_DIR / name}")
 
 
 if __name__ == "__main__":
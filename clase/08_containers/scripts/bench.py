@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+bench.py — Harness de benchmarks en Python (Exp 1, 2 y 3).
+
+Reemplaza el cronometraje de bench_startup.sh, bench_scale.sh y
+bench_runtime.sh: en lugar de `date +%s%N` y un `bc` por muestra (varios ms
+de overhead, del orden de lo que se mide en bare metal), cada muestra se
+mide dentro del proceso con time.perf_counter_ns() justo alrededor del
+comando. Escribe los mismos CSVs que lee analyze.py.
+
+Los runtimes son plugins (clase Runtime): bare, docker, podman y fake. El
+runtime fake no lanza procesos —simula latencias con sleep— para probar el
+harness sin un motor de contenedores.
+
+En Exp 2 la memoria de cada contenedor se muestrea directo de su cgroup v2
+(cgroup_sampler.py, cada --sample-ms) desde que arranca; la serie completa
+va a results/exp2_scale_timeseries.csv. Sin cgroups v2 se usa `stats`.
+
+Uso:
+    python3 bench.py startup [--reps 10] [--warmup 1] [--images ubuntu alpine]
+    python3 bench.py scale   [--counts 1 5 10 20] [--sample-ms 10]
+    python3 bench.py runtime [--reps 5]
+    python3 bench.py all --runtimes bare docker --cpus 2,3
+    python3 bench.py startup --runtimes fake --out /tmp/exp1.csv
+"""
+
+import csv
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from cgroup_sampler import CgroupSampler, container_cgroup, own_cgroup
+from experiments import REGISTRY
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Workloads de Exp 3 (mismos comandos que bench_runtime.sh)
+WORKLOADS = {
+    # hash: CPU puro (~0.9s)
+    "hash": "dd if=/dev/urandom bs=1M count=100 2>/dev/null | sha256sum > /dev/null",
+    # sort: CPU + memoria + pipes (~1.3s)
+    "sort": "seq 1 1000000 | shuf | sort -n > /dev/null",
+}
+
+STARTUP_ARGV = ["echo", "ok"]
+
+
+def run_quiet(argv, check=False):
+    """Ejecuta un comando sin salida; retorna el código de salida."""
+    result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if check and result.returncode != 0:
+        raise RuntimeError(f"falló: {' '.join(argv)} (código {result.returncode})")
+    return result.returncode
+
+
+def parse_mem_to_kb(mem):
+    """'1.5MiB / 7.5GiB' (docker) o '1.5MB / 7.5GB' (podman) -> KB del uso."""
+    match = re.match(r"\s*([\d.]+)\s*([A-Za-z]+)", mem.split("/")[0])
+    if not match:
+        return 0.0
+    num, unit = float(match.group(1)), match.group(2)
+    factor = {"B": 1 / 1024, "kB": 1, "KB": 1, "KiB": 1.024, "MB": 1000, "MiB": 1024,
+              "GB": 1_000_000, "GiB": 1_048_576}.get(unit, 0)
+    return num * factor
+
+
+def process_rss_kb(names):
+    """Suma del VmRSS (KB) de los procesos cuyo nombre está en `names` (vía /proc)."""
+    total = 0
+    for status in Path("/proc").glob("[0-9]*/status"):
+        try:
+            text = status.read_text()
+        except OSError:
+            continue
+        name = text.split("\n", 1)[0].partition(":")[2].strip()
+        if name in names:
+            match = re.search(r"^VmRSS:\s+(\d+)", text, re.MULTILINE)
+            total += int(match.group(1)) if match else 0
+    return total
+
+
+class Runtime:
+    """
+    Plugin de runtime. Cada método hace una operación y bloquea hasta que
+    termina; el harness cronometra la llamada.
+    """
+    name = "base"
+    images = ("none",)
+    settle_s = 2.0          # espera para que los cgroups se estabilicen (Exp 2)
+
+    def __init__(self, cpuset=None):
+        self.cpuset = cpuset
+
+    def available(self):
+        return True
+
+    def prepare(self, image):
+        """Trabajo previo no cronometrado (p. ej. pull de la imagen)."""
+
+    def run(self, image, argv):
+        """Arranca, ejecuta argv y termina (Exp 1). RuntimeError si falla."""
+        raise NotImplementedError
+
+    def start(self, name, image):
+        """Deja corriendo un contenedor en segundo plano."""
+        raise NotImplementedError
+
+    def exec(self, name, command):
+        """
+        Ejecuta un comando de shell dentro de un contenedor ya iniciado
+        (Exp 3). RuntimeError si falla.
+        """
+        raise NotImplementedError
+
+    def remove(self, names):
+        """Elimina contenedores (no cronometrado)."""
+
+    def memory_kb(self, prefix):
+        """{contenedor: KB} de los contenedores cuyo nombre empieza con prefix."""
+        return {}
+
+    def cgroup(self, name):
+        """Ruta del cgroup v2 de un contenedor (None si no aplica o no existe)."""
+        return None
+
+    def daemon_rss_kb(self):
+        return 0
+
+
+class BareRuntime(Runtime):
+    """Baseline: el mismo comando como proceso del host."""
+    name = "bare"
+
+    def run(self, image, argv):
+        run_quiet(argv, check=True)
+
+    def start(self, name, image):
+        pass
+
+    def exec(self, name, command):
+        run_quiet(["bash", "-c", command], check=True)
+
+
+class EngineRuntime(Runtime):
+    """Docker o Podman a través de su CLI."""
+    images = ("ubuntu", "alpine")
+    daemon_processes = ()
+
+    def available(self):
+        return shutil.which(self.name) is not None
+
+    def _cpuset(self):
+        return [f"--cpuset-cpus={self.cpuset}"] if self.cpuset else []
+
+    def prepare(self, image):
+        if run_quiet([self.name, "pull", "-q", image]) != 0:
+            run_quiet([self.name, "pull", "-q", f"docker.io/library/{image}"])
+
+    def run(self, image, argv):
+        run_quiet([self.name, "run", "--rm", *self._cpuset(), image, *argv], check=True)
+
+    def start(self, name, image):
+        run_quiet([self.name, "run", "-d", "--name", name, *self._cpuset(),
+                   image, "sleep", "3600"], check=True)
+
+    def exec(self, name, command):
+        run_quiet([self.name, "exec", name, "bash", "-c", command], check=True)
+
+    def remove(self, names):
+        if names:
+            run_quiet([self.name, "rm", "-f", *names])
+
+    def memory_kb(self, prefix):
+        out = subprocess.run([self.name, "stats", "--no-stream", "--format",
+                              "{{.Name}},{{.MemUsage}}"],
+                             capture_output=True, text=True).stdout
+        usage = {}
+        for line in out.splitlines():
+            name, _, mem = line.partition(",")
+            if name.startswith(prefix):
+                usage[name] = parse_mem_to_kb(mem)
+        return usage
+
+    def daemon_rss_kb(self):
+        return process_rss_kb(self.daemon_processes)
+
+    def cgroup(self, name):
+        return container_cgroup(self.name, name)
+
+
+class DockerRuntime(EngineRuntime):
+    name = "docker"
+    daemon_processes = ("dockerd",)
+
+
+class PodmanRuntime(EngineRuntime):
+    name = "podman"
+    daemon_processes = ("conmon",)
+
+
+class FakeRuntime(Runtime):
+    """
+    Runtime simulado para probar el harness sin Docker/Podman: cada
+    operación duerme una latencia fija y la memoria es sintética.
+    """
+    name = "fake"
+    images = ("alpine",)
+    settle_s = 0.0
+
+    def __init__(self, cpuset=None, startup_ms=5.0, exec_ms=2.0, container_kb=400.0):
+        super().__init__(cpuset)
+        self.startup_ms = startup_ms
+        self.exec_ms = exec_ms
+        self.container_kb = container_kb
+        self.containers = set()
+
+    def run(self, image, argv):
+        time.sleep(self.startup_ms / 1000)
+
+    def start(self, name, image):
+        time.sleep(self.startup_ms / 1000)
+        self.containers.add(name)
+
+    def exec(self, name, command):
+        time.sleep(self.exec_ms / 1000)
+
+    def remove(self, names):
+        self.containers.difference_update(names)
+
+    def memory_kb(self, prefix):
+        return {n: self.container_kb for n in self.containers if n.startswith(prefix)}
+
+    def daemon_rss_kb(self):
+        return 1024 * len(self.containers)
+
+    def cgroup(self, name):
+        # Sin contenedores reales: el cgroup del propio harness ejercita el sampler
+        return own_cgroup()
+
+
+RUNTIMES = {cls.name: cls for cls in (BareRuntime, DockerRuntime, PodmanRuntime, FakeRuntime)}
+
+
+def timed_ns(fn, *args):
+    """Duración de fn(*args) en ns (perf_counter_ns, sin procesos extra)."""
+    start = time.perf_counter_ns()
+    fn(*args)
+    return time.perf_counter_ns() - start
+
+
+def measure(fn, *args, reps=10, warmup=1):
+    """warmup corridas descartadas y luego reps muestras en ns."""
+    for _ in range(warmup):
+        fn(*args)
+    return [timed_ns(fn, *args) for _ in range(reps)]
+
+
+def pin_cpus(cpus):
+    """Fija el harness (y sus procesos hijos) a un conjunto de CPUs, p. ej. "2,3" o "0-3"."""
+    ids = set()
+    for part in cpus.split(","):
+        lo, _, hi = part.partition("-")
+        ids.update(range(int(lo), int(hi or lo) + 1))
+    os.sched_setaffinity(0, ids)
+    return ids
+
+
+class CsvSink:
+    """Escribe filas con el schema del experimento en experiments.py, una a una."""
+
+    def __init__(self, path, experiment):
+        self.path = Path(path)
+        self.columns = list(REGISTRY[experiment].schema)
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+        return self
+
+    def write(self, *row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def __exit__(self, *exc):
+        self.file.close()
+
+
+def bench_startup(runtimes, out, reps=10, warmup=1, images=None):
+    """Exp 1: arrancar, ejecutar `echo ok` y terminar."""
+    print(f"=== Exp 1: Startup Latency ({reps} reps + {warmup} warm-up) ===")
+    with CsvSink(out, "exp1_startup") as sink:
+        for rt in runtimes:
+            for image in (images or rt.images) if isinstance(rt, EngineRuntime) else rt.images:
+                rt.prepare(image)
+                samples = measure(rt.run, image, STARTUP_ARGV, reps=reps, warmup=warmup)
+                for i, ns in enumerate(samples, 1):
+                    sink.write(rt.name, image, i, f"{ns / 1e6:.2f}")
+                print(f"  {rt.name}/{image}: mediana {sorted(samples)[len(samples) // 2] / 1e6:.2f} ms")
+    print(f"Resultados guardados en {out}")
+
+
+def bench_scale(runtimes, out, counts=(1, 5, 10, 20), sample_ms=10.0, series_out=None):
+    """
+    Exp 2: tiempo para lanzar N contenedores, su memoria y el RSS del daemon.
+
+    Con sample_ms, cada contenedor se muestrea desde su cgroup v2 desde que
+    arranca hasta que se elimina; per_container_kb es el promedio de los picos
+    (memory.peak, o el máximo muestreado) y la serie va a series_out. Los
+    contenedores sin cgroup encontrado toman la memoria de `stats` del runtime.
+    """
+    print("=== Exp 2: Resource Footprint at Scale ===")
+    series_out = Path(series_out or Path(out).with_name("exp2_scale_timeseries.csv"))
+    if sample_ms:
+        series_out.unlink(missing_ok=True)
+    with CsvSink(out, "exp2_scale") as sink:
+        for rt in runtimes:
+            if rt.name == "bare":
+                continue
+            rt.prepare("ubuntu")
+            for count in counts:
+                prefix = f"exp2_{rt.name}_{count}_"
+                names = [f"{prefix}{i}" for i in range(1, count + 1)]
+                rt.remove(names)
+                sampler = CgroupSampler(dict.fromkeys(names), sample_ms).start() if sample_ms else None
+                try:
+                    # Solo se cronometra el arranque, no la búsqueda del cgroup
+                    launch_ns = 0
+                    for name in names:
+                        launch_ns += timed_ns(rt.start, name, "ubuntu")
+                        path = rt.cgroup(name) if sampler else None
+                        if path is not None:
+                            sampler.attach(name, path)
+                    launch_s = launch_ns / 1e9
+
+                    time.sleep(rt.settle_s)  # dejar que los cgroups se estabilicen
+                    usage = {}
+                    if sampler:
+                        sampler.sample()
+                        peaks = {n: sampler.peak_kb(n) for n in names}
+                        usage = {n: kb for n, kb in peaks.items() if not math.isnan(kb)}
+                    missing = [n for n in names if n not in usage]
+                    if missing:
+                        stats = rt.memory_kb(prefix)
+                        usage.update((n, stats[n]) for n in missing if n in stats)
+                        unknown = [n for n in missing if n not in stats]
+                        if unknown:
+                            print(f"  ⚠ sin memoria para {len(unknown)} contenedores: "
+                                  f"{', '.join(unknown)}")
+                    total_kb = sum(usage.values())
+                    per_kb = total_kb / len(usage) if usage else 0.0
+                    daemon_kb = rt.daemon_rss_kb()
+                finally:
+                    if sampler:
+                        sampler.stop()
+                        sampler.close()
+                    rt.remove(names)
+                if sampler:
+                    sampler.export_csv(series_out, {"runtime": rt.name, "count": count},
+                                       append=True)
+                sink.write(rt.name, count, f"{launch_s:.3f}", f"{per_kb:.1f}",
+                           f"{total_kb:.1f}", daemon_kb)
+                print(f"  {rt.name} {count} cont: {launch_s:.3f}s, {per_kb:.1f} KB/cont, "
+                      f"daemon={daemon_kb} KB")
+    print(f"Resultados guardados en {out}")
+    if sample_ms and series_out.exists():
+        print(f"Serie de cgroups guardada en {series_out}")
+
+
+def bench_runtime(runtimes, out, reps=5, warmup=1, workloads=WORKLOADS):
+    """Exp 3: workloads vía exec en contenedores ya iniciados (sin costo de arranque)."""
+    print(f"=== Exp 3: Runtime Overhead ({reps} reps + {warmup} warm-up) ===")
+    names = {rt.name: f"exp3_{rt.name}" for rt in runtimes}
+    try:
+        for rt in runtimes:
+            rt.prepare("ubuntu")
+            rt.remove([names[rt.name]])
+            rt.start(names[rt.name], "ubuntu")
+        with CsvSink(out, "exp3_runtime") as sink:
+            for workload, command in workloads.items():
+                print(f"--- Workload: {workload} ---")
+                for rt in runtimes:
+                    samples = measure(rt.exec, names[rt.name], command, reps=reps, warmup=warmup)
+                    for i, ns in enumerate(samples, 1):
+                        sink.write(rt.name, workload, i, f"{ns / 1e9:.4f}")
+                    print(f"  {rt.name}: mediana {sorted(samples)[len(samples) // 2] / 1e9:.4f}s")
+    finally:
+        for rt in runtimes:
+            rt.remove([names[rt.name]])
+    print(f"Resultados guardados en {out}")
+
+
+def load_runtimes(names, cpuset=None):
+    """Instancia los runtimes pedidos; los que no están instalados se saltan."""
+    runtimes = []
+    for name in names:
+        rt = RUNTIMES[name](cpuset)
+        if rt.available():
+            runtimes.append(rt)
+        else:
+            print(f"  {name}: no disponible, saltando")
+    return runtimes
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Harness de benchmarks (Exp 1-3)")
+    parser.add_argument("experiment", choices=["startup", "scale", "runtime", "all"])
+    parser.add_argument("--runtimes", nargs="+", choices=sorted(RUNTIMES),
+                        default=["bare", "docker", "podman"])
+    parser.add_argument("--reps", type=int, help="Repeticiones (default: 10 startup, 5 runtime)")
+    parser.add_argument("--warmup", type=int, default=1, help="Corridas descartadas")
+    parser.add_argument("--images", nargs="+", default=["ubuntu", "alpine"],
+                        help="Imágenes para startup")
+    parser.add_argument("--counts", nargs="+", type=int, default=[1, 5, 10, 20],
+                        help="Número de contenedores para scale")
+    parser.add_argument("--sample-ms", type=float, default=10.0,
+                        help="Intervalo de muestreo de cgroups en scale (0 = usar stats)")
+    parser.add_argument("--cpus", help="Fija el harness y los contenedores a estas CPUs (p. ej. 2,3)")
+    parser.add_argument("--out", type=Path, help="CSV de salida (solo con un experimento)")
+    args = parser.parse_args()
+
+    if args.out and args.experiment == "all":
+        parser.error("--out requiere un solo experimento")
+    if args.cpus:
+        print(f"CPUs fijadas: {sorted(pin_cpus(args.cpus))}")
+
+    runtimes = load_runtimes(args.runtimes, args.cpus)
+    if not runtimes:
+        print("Ningún runtime disponible.")
+        return 1
+
+    todo = ["startup", "scale", "runtime"] if args.experiment == "all" else [args.experiment]
+    try:
+        if "startup" in todo:
+            bench_startup(runtimes, args.out or RESULTS_DIR / "exp1_startup.csv",
+                          args.reps or 10, args.warmup, args.images)
+        if "scale" in todo:
+            bench_scale(runtimes, args.out or RESULTS_DIR / "exp2_scale.csv", args.counts,
+                        args.sample_ms)
+        if "runtime" in todo:
+            bench_runtime(runtimes, args.out or RESULTS_DIR / "exp3_runtime.csv",
+                          args.reps or 5, args.warmup)
+    except RuntimeError as e:
+        # Una corrida fallida no es una muestra: el CSV queda incompleto
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
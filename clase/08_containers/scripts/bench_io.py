@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+bench_io.py — Benchmark de I/O de almacenamiento: directo, overlay y volúmenes.
+
+Mide varias cargas sobre un directorio cualquiera y reporta throughput y
+percentiles de latencia por operación:
+
+    seq_write   escritura secuencial en bloques grandes + fsync final
+    seq_read    lectura secuencial (page cache descartado antes)
+    rand_write  pwrite de bloques chicos en offsets aleatorios + fsync final
+    rand_read   pread de bloques chicos en offsets aleatorios
+    create      crear muchos archivos chicos (write + close)
+    stat        os.stat de esos archivos
+    fsync       bloques chicos con fsync después de cada uno (estilo base de datos)
+    read        lectura completa con read() a un buffer
+    mmap        la misma lectura a través de mmap
+
+Solo usa la biblioteca estándar: corre igual en el host (bare, modo direct)
+que dentro de un contenedor con Python, donde el directorio puede estar en
+el overlay del contenedor (modo overlay) o en un bind mount (modo volume).
+
+Escribe results/io_workloads.csv (todas las cargas) y agrega las filas de
+seq_write a results/io.csv. Las filas previas del mismo runtime y modo se
+reemplazan; las demás se conservan.
+
+Uso:
+    python3 bench_io.py                          # bare, en scripts/.io_bench
+    python3 bench_io.py --dir /mnt/ssd/prueba --size-mb 256
+    python3 bench_io.py --runtimes bare docker podman   # + overlay y volume en contenedor
+    python3 bench_io.py --workloads seq_write fsync --reps 5
+"""
+
+import csv
+import mmap
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+RESULTS_DIR = SCRIPTS_DIR / "results"
+DEFAULT_DIR = SCRIPTS_DIR / ".io_bench"     # en disco (no tmpfs como /tmp en algunos sistemas)
+
+IMAGE = "python:3-slim"
+CONTAINER_MODES = {
+    # modo -> directorio de prueba dentro del contenedor
+    "overlay": "/var/tmp/io_bench",           # capa de escritura del contenedor
+    "volume": "/data",                        # bind mount de un directorio del host
+}
+CONTAINER_OUT = "/bench-out"                  # --out del host, montado en el contenedor
+
+IO_COLUMNS = ["runtime", "mode", "rep", "mb_per_sec"]
+WORKLOAD_COLUMNS = ["runtime", "mode", "workload", "rep", "mb_per_sec", "ops_per_sec",
+                    "p50_us", "p99_us", "p999_us"]
+
+DATA_FILE = "data.bin"
+
+
+@dataclass(frozen=True)
+class IoConfig:
+    size_mb: int = 64          # archivo de las cargas secuenciales, aleatorias, read y mmap
+    block_kb: int = 1024       # bloque secuencial
+    small_kb: int = 4          # bloque de rand_*, fsync y tamaño de los archivos chicos
+    ops: int = 4096            # operaciones de rand_* y fsync
+    files: int = 2000          # archivos de create y stat
+
+    @property
+    def size(self):
+        return self.size_mb * 1024 * 1024
+
+    @property
+    def block(self):
+        return self.block_kb * 1024
+
+    @property
+    def small(self):
+        return self.small_kb * 1024
+
+
+def drop_cache(path):
+    """Saca un archivo del page cache (best effort, sin root: posix_fadvise)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def ensure_data(target, cfg):
+    """Archivo de datos de cfg.size bytes para las cargas de lectura (sin medir)."""
+    path = target / DATA_FILE
+    if not path.exists() or path.stat().st_size != cfg.size:
+        chunk = os.urandom(cfg.block)
+        with open(path, "wb") as f:
+            for _ in range(cfg.size // cfg.block):
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    drop_cache(path)
+    return path
+
+
+# Cada carga retorna (bytes movidos, latencias por operación en ns, tiempo total en ns)
+
+def seq_write(target, cfg):
+    path = target / DATA_FILE
+    chunk = os.urandom(cfg.block)
+    lat = array("q")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        start = time.perf_counter_ns()
+        for _ in range(cfg.size // cfg.block):
+            t0 = time.perf_counter_ns()
+            os.write(fd, chunk)
+            lat.append(time.perf_counter_ns() - t0)
+        os.fsync(fd)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        os.close(fd)
+    return cfg.size // cfg.block * cfg.block, lat, elapsed
+
+
+def seq_read(target, cfg):
+    path = ensure_data(target, cfg)
+    lat = array("q")
+    total = 0
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        start = time.perf_counter_ns()
+        while True:
+            t0 = time.perf_counter_ns()
+            data = os.read(fd, cfg.block)
+            if not data:
+                break
+            lat.append(time.perf_counter_ns() - t0)
+            total += len(data)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        os.close(fd)
+    return total, lat, elapsed
+
+
+def _offsets(cfg, seed):
+    blocks = cfg.size // cfg.small
+    rng = random.Random(seed)
+    return [rng.randrange(blocks) * cfg.small for _ in range(cfg.ops)]
+
+
+def rand_write(target, cfg):
+    path = ensure_data(target, cfg)
+    chunk = os.urandom(cfg.small)
+    lat = array("q")
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        offsets = _offsets(cfg, 1)
+        start = time.perf_counter_ns()
+        for offset in offsets:
+            t0 = time.perf_counter_ns()
+            os.pwrite(fd, chunk, offset)
+            lat.append(time.perf_counter_ns() - t0)
+        os.fsync(fd)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        os.close(fd)
+    return cfg.ops * cfg.small, lat, elapsed
+
+
+def rand_read(target, cfg):
+    path = ensure_data(target, cfg)
+    lat = array("q")
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        offsets = _offsets(cfg, 2)
+        start = time.perf_counter_ns()
+        for offset in offsets:
+            t0 = time.perf_counter_ns()
+            os.pread(fd, cfg.small, offset)
+            lat.append(time.perf_counter_ns() - t0)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        os.close(fd)
+    return cfg.ops * cfg.small, lat, elapsed
+
+
+def _small_dir(target):
+    return target / "small"
+
+
+def create(target, cfg):
+    directory = _small_dir(target)
+    shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir()
+    payload = os.urandom(cfg.small)
+    lat = array("q")
+    start = time.perf_counter_ns()
+    for i in range(cfg.files):
+        t0 = time.perf_counter_ns()
+        fd = os.open(directory / f"f{i:06d}", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.write(fd, payload)
+        os.close(fd)
+        lat.append(time.perf_counter_ns() - t0)
+    elapsed = time.perf_counter_ns() - start
+    return cfg.files * cfg.small, lat, elapsed
+
+
+def stat(target, cfg):
+    directory = _small_dir(target)
+    if not directory.exists():
+        create(target, cfg)
+    paths = [str(directory / f"f{i:06d}") for i in range(cfg.files)]
+    lat = array("q")
+    start = time.perf_counter_ns()
+    for path in paths:
+        t0 = time.perf_counter_ns()
+        os.stat(path)
+        lat.append(time.perf_counter_ns() - t0)
+    elapsed = time.perf_counter_ns() - start
+    return 0, lat, elapsed
+
+
+def fsync(target, cfg):
+    path = target / "fsync.bin"
+    chunk = os.urandom(cfg.small)
+    lat = array("q")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        start = time.perf_counter_ns()
+        for _ in range(cfg.ops):
+            t0 = time.perf_counter_ns()
+            os.write(fd, chunk)
+            os.fsync(fd)
+            lat.append(time.perf_counter_ns() - t0)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        os.close(fd)
+        os.unlink(path)
+    return cfg.ops * cfg.small, lat, elapsed
+
+
+def read(target, cfg):
+    path = ensure_data(target, cfg)
+    buf = bytearray(cfg.block)
+    view = memoryview(buf)
+    lat = array("q")
+    total = 0
+    with open(path, "rb", buffering=0) as f:
+        start = time.perf_counter_ns()
+        while True:
+            t0 = time.perf_counter_ns()
+            n = f.readinto(view)
+            if not n:
+                break
+            lat.append(time.perf_counter_ns() - t0)
+            total += n
+        elapsed = time.perf_counter_ns() - start
+    return total, lat, elapsed
+
+
+def mmap_read(target, cfg):
+    path = ensure_data(target, cfg)
+    buf = bytearray(cfg.block)
+    lat = array("q")
+    with open(path, "rb") as f:
+        start = time.perf_counter_ns()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            # Una copia por bloque, directo del mapeo al buffer (como readinto en read())
+            total = len(mm)
+            for offset in range(0, total, cfg.block):
+                t0 = time.perf_counter_ns()
+                n = min(cfg.block, total - offset)
+                buf[:n] = view[offset:offset + n]
+                lat.append(time.perf_counter_ns() - t0)
+        elapsed = time.perf_counter_ns() - start
+    return total, lat, elapsed
+
+
+WORKLOADS = {
+    "seq_write": seq_write,
+    "seq_read": seq_read,
+    "rand_write": rand_write,
+    "rand_read": rand_read,
+    "create": create,
+    "stat": stat,
+    "fsync": fsync,
+    "read": read,
+    "mmap": mmap_read,
+}
+
+
+def percentile_us(sorted_ns, p):
+    """Percentil p (rango más cercano) de latencias ya ordenadas, en µs."""
+    if not sorted_ns:
+        return 0.0
+    index = min(len(sorted_ns) - 1, max(0, int(round(p / 100 * len(sorted_ns))) - 1))
+    return sorted_ns[index] / 1000
+
+
+def run_workloads(target, cfg, workloads, reps):
+    """Corre cada carga `reps` veces en target; retorna {(carga, rep): métricas}."""
+    target.mkdir(parents=True, exist_ok=True)
+    results = {}
+    try:
+        for rep in range(1, reps + 1):
+            for name in workloads:
+                nbytes, lat, elapsed = WORKLOADS[name](target, cfg)
+                lat = sorted(lat)
+                seconds = elapsed / 1e9
+                results[(name, rep)] = {
+                    "mb_per_sec": nbytes / (1024 * 1024) / seconds if nbytes else 0.0,
+                    "ops_per_sec": len(lat) / seconds,
+                    "p50_us": percentile_us(lat, 50),
+                    "p99_us": percentile_us(lat, 99),
+                    "p999_us": percentile_us(lat, 99.9),
+                }
+    finally:
+        for leftover in (target / DATA_FILE, _small_dir(target)):
+            if leftover.is_dir():
+                shutil.rmtree(leftover, ignore_errors=True)
+            elif leftover.exists():
+                leftover.unlink()
+        try:
+            target.rmdir()         # solo si quedó vacío (no borra un --dir con contenido)
+        except OSError:
+            pass
+    return results
+
+
+def merge_csv(path, columns, rows, replace):
+    """
+    Escribe rows en el CSV conservando las filas existentes, salvo las cuyo
+    (runtime, mode) está en `replace`. Escritura atómica (tmp + os.replace).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    kept = []
+    if path.exists():
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                if (row.get("runtime"), row.get("mode")) not in replace:
+                    kept.append([row.get(c, "") for c in columns])
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(kept + rows)
+    os.replace(tmp, path)
+
+
+def write_results(results, runtime, mode, out_dir):
+    """Agrega/reemplaza las filas de (runtime, mode) en io_workloads.csv e io.csv."""
+    workload_rows = []
+    io_rows = []
+    for (name, rep), m in results.items():
+        workload_rows.append([runtime, mode, name, rep, f"{m['mb_per_sec']:.1f}",
+                              f"{m['ops_per_sec']:.0f}", f"{m['p50_us']:.1f}",
+                              f"{m['p99_us']:.1f}", f"{m['p999_us']:.1f}"])
+        if name == "seq_write":
+            io_rows.append([runtime, mode, rep, f"{m['mb_per_sec']:.0f}"])
+    merge_csv(Path(out_dir) / "io_workloads.csv", WORKLOAD_COLUMNS, workload_rows,
+              {(runtime, mode)})
+    if io_rows:
+        merge_csv(Path(out_dir) / "io.csv", IO_COLUMNS, io_rows, {(runtime, mode)})
+
+
+def print_results(results, runtime, mode):
+    print(f"  {runtime}/{mode}:")
+    for name in dict.fromkeys(n for n, _ in results):
+        reps = [m for (n, _), m in results.items() if n == name]
+        mid = sorted(reps, key=lambda m: m["ops_per_sec"])[len(reps) // 2]
+        rate = f"{mid['mb_per_sec']:8.1f} MB/s" if mid["mb_per_sec"] else " " * 13
+        print(f"    {name:10s} {rate} {mid['ops_per_sec']:10.0f} ops/s  "
+              f"p50={mid['p50_us']:.1f}µs p99={mid['p99_us']:.1f}µs p99.9={mid['p999_us']:.1f}µs")
+
+
+def container_argv(runtime, mode, host_dir, args):
+    """Comando para correr este script dentro de un contenedor en el modo dado."""
+    inner = ["python3", "/bench/bench_io.py", "--dir", CONTAINER_MODES[mode],
+             "--runtime", runtime, "--mode", mode, "--out", CONTAINER_OUT,
+             "--reps", str(args.reps), "--size-mb", str(args.size_mb),
+             "--ops", str(args.ops), "--files", str(args.files),
+             "--workloads", *args.workloads]
+    mounts = ["-v", f"{SCRIPTS_DIR.resolve()}:/bench",
+              "-v", f"{Path(args.out).resolve()}:{CONTAINER_OUT}"]
+    if mode == "volume":
+        mounts += ["-v", f"{host_dir}:{CONTAINER_MODES[mode]}"]
+    return [runtime, "run", "--rm", *mounts, IMAGE, *inner]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark de I/O: directo, overlay y volúmenes")
+    parser.add_argument("--dir", type=Path, default=DEFAULT_DIR,
+                        help="Directorio donde correr las cargas (se crea; se limpia al terminar)")
+    parser.add_argument("--runtimes", nargs="+", default=None,
+                        help="bare, docker, podman: docker/podman corren overlay y volume")
+    parser.add_argument("--runtime", default="bare", help="Etiqueta de runtime de esta corrida")
+    parser.add_argument("--mode", default="direct", help="Etiqueta de modo de esta corrida")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS),
+                        choices=list(WORKLOADS))
+    parser.add_argument("--reps", type=int, default=3)
+    parser.add_argument("--size-mb", type=int, default=IoConfig.size_mb)
+    parser.add_argument("--ops", type=int, default=IoConfig.ops)
+    parser.add_argument("--files", type=int, default=IoConfig.files)
+    parser.add_argument("--out", type=Path, default=RESULTS_DIR,
+                        help="Directorio de los CSVs (default: results/)")
+    args = parser.parse_args()
+    cfg = IoConfig(size_mb=args.size_mb, ops=args.ops, files=args.files)
+
+    print("=== I/O: " + ", ".join(args.workloads) + f" ({args.reps} reps, {args.size_mb} MB) ===")
+    if not args.runtimes:
+        results = run_workloads(args.dir, cfg, args.workloads, args.reps)
+        print_results(results, args.runtime, args.mode)
+        write_results(results, args.runtime, args.mode, args.out)
+        print(f"Resultados guardados en {args.out / 'io_workloads.csv'} e io.csv")
+        return 0
+
+    for runtime in args.runtimes:
+        if runtime == "bare":
+            results = run_workloads(args.dir, cfg, args.workloads, args.reps)
+            print_results(results, "bare", "direct")
+            write_results(results, "bare", "direct", args.out)
+            continue
+        if shutil.which(runtime) is None:
+            print(f"  {runtime}: no encontrado, saltando")
+            continue
+        subprocess.run([runtime, "pull", "-q", IMAGE], stdout=subprocess.DEVNULL)
+        args.out.mkdir(parents=True, exist_ok=True)
+        for mode in CONTAINER_MODES:
+            host_dir = Path(tempfile.mkdtemp(prefix="io_bench_", dir=args.dir.parent))
+            try:
+                code = subprocess.run(container_argv(runtime, mode, host_dir, args)).returncode
+            finally:
+                shutil.rmtree(host_dir, ignore_errors=True)
+            if code != 0:
+                print(f"  ⚠ {runtime}/{mode} terminó con código {code}")
+    print(f"Resultados guardados en {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
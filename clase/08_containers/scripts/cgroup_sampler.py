@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+cgroup_sampler.py — Muestreo de alta frecuencia de cgroups v2.
+
+Lee directamente memory.current, memory.peak, cpu.stat e io.stat de un
+conjunto de cgroups (sin `docker stats`, sin procesos extra) a una tasa
+configurable de hasta 1 ms. Cada muestra va a un ring buffer preasignado
+(módulo array), así que muestrear no reserva memoria ni toca el disco; al
+terminar la serie se exporta a CSV.
+
+Archivos que no existen (p. ej. memory.* en un host con cgroups híbridos)
+se registran como vacío; memory.peak requiere Linux >= 5.19.
+
+Uso:
+    python3 cgroup_sampler.py --self --interval-ms 1 --duration 2
+    python3 cgroup_sampler.py /sys/fs/cgroup/system.slice/docker-<id>.scope --out mem.csv
+
+    with CgroupSampler({"c1": path}, interval_ms=1) as sampler:
+        ...                                   # carga de trabajo
+    sampler.export_csv("results/serie.csv")
+"""
+
+import csv
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+
+FIELDS = ("memory_current_kb", "memory_peak_kb", "cpu_usage_usec", "io_rbytes", "io_wbytes")
+NAN = float("nan")
+
+
+def unified_root():
+    """Punto de montaje de cgroup v2 (puro o la jerarquía 'unified' de un host híbrido)."""
+    root = Path("/sys/fs/cgroup")
+    if (root / "cgroup.controllers").exists():
+        return root
+    if (root / "unified" / "cgroup.controllers").exists():
+        return root / "unified"
+    return None
+
+
+def own_cgroup(pid="self"):
+    """Ruta del cgroup v2 de un proceso (línea '0::/...' de /proc/<pid>/cgroup)."""
+    root = unified_root()
+    if root is None:
+        return None
+    for line in Path(f"/proc/{pid}/cgroup").read_text().splitlines():
+        if line.startswith("0::"):
+            return root / line[3:].lstrip("/")
+    return None
+
+
+def container_cgroup(runtime, name):
+    """
+    Cgroup v2 de un contenedor de docker/podman, o None si no se encuentra.
+
+    Prueba las rutas conocidas (systemd: system.slice/docker-<id>.scope,
+    machine.slice/libpod-<id>.scope o el user.slice de podman rootless;
+    cgroupfs: docker/<id>) y si no, el cgroup del proceso principal
+    (/proc/<pid>/cgroup). No recorre /sys/fs/cgroup.
+    """
+    result = subprocess.run([runtime, "inspect", "-f", "{{.Id}} {{.State.Pid}}", name],
+                            capture_output=True, text=True)
+    cid, _, pid = result.stdout.strip().partition(" ")
+    root = unified_root()
+    if not cid or root is None:
+        return None
+    uid = os.getuid()
+    for rel in (f"system.slice/docker-{cid}.scope",
+                f"machine.slice/libpod-{cid}.scope",
+                f"user.slice/user-{uid}.slice/user@{uid}.service/user.slice/libpod-{cid}.scope",
+                f"docker/{cid}"):
+        if (root / rel).is_dir():
+            return root / rel
+    if pid.isdigit() and int(pid) > 0:
+        try:
+            path = own_cgroup(pid)
+        except OSError:
+            return None
+        if path is not None and path.is_dir():
+            return path
+    return None
+
+
+class _Reader:
+    """Descriptores abiertos de los archivos de un cgroup; relee con lseek + read."""
+
+    def __init__(self, path):
+        self.fds = {}
+        if path is None:
+            return
+        for filename in ("memory.current", "memory.peak", "cpu.stat", "io.stat"):
+            try:
+                self.fds[filename] = os.open(Path(path) / filename, os.O_RDONLY)
+            except OSError:
+                pass
+
+    def _read(self, filename):
+        fd = self.fds.get(filename)
+        if fd is None:
+            return None
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            return os.read(fd, 65536)
+        except OSError:
+            return None       # el cgroup desapareció (contenedor eliminado)
+
+    def read(self, out, offset):
+        """Escribe los FIELDS de este cgroup en out[offset:offset + len(FIELDS)]."""
+        raw = self._read("memory.current")
+        out[offset] = int(raw) / 1024 if raw else NAN
+        raw = self._read("memory.peak")
+        out[offset + 1] = int(raw) / 1024 if raw else NAN
+        raw = self._read("cpu.stat")
+        usage = NAN
+        if raw:
+            for line in raw.split(b"\n"):
+                if line.startswith(b"usage_usec "):
+                    usage = float(line[11:])
+                    break
+        out[offset + 2] = usage
+        raw = self._read("io.stat")
+        rbytes = wbytes = NAN
+        if raw is not None:
+            rbytes = wbytes = 0.0
+            for token in raw.split():
+                if token.startswith(b"rbytes="):
+                    rbytes += int(token[7:])
+                elif token.startswith(b"wbytes="):
+                    wbytes += int(token[7:])
+        out[offset + 3] = rbytes
+        out[offset + 4] = wbytes
+
+    def close(self):
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds = {}
+
+
+class CgroupSampler:
+    """
+    Muestrea un conjunto de cgroups en un hilo a intervalos fijos.
+
+    cgroups: {nombre: ruta del cgroup}; una ruta None reserva el lugar para
+    un cgroup que aún no existe (se conecta con attach() al crearse el
+    contenedor). capacity: muestras que caben en el ring buffer; al llenarse
+    se sobrescriben las más antiguas (default: 60 s al intervalo dado).
+    """
+
+    def __init__(self, cgroups, interval_ms=10.0, capacity=None):
+        self.names = list(cgroups)
+        self.paths = [Path(p) if p else None for p in cgroups.values()]
+        self.interval_ns = int(interval_ms * 1e6)
+        self.capacity = capacity or max(1, int(60_000 / interval_ms))
+        self.width = len(FIELDS) * len(self.names)
+        self.times = array("q", bytes(8 * self.capacity))
+        self.values = array("d", [NAN]) * (self.capacity * self.width)
+        self.count = 0
+        self._row = array("d", [NAN]) * self.width
+        self._readers = [_Reader(p) for p in self.paths]
+        self._start_ns = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def attach(self, name, path):
+        """Conecta el cgroup de un lugar reservado (se lee desde la siguiente muestra)."""
+        i = self.names.index(name)
+        self.paths[i] = Path(path)
+        old, self._readers[i] = self._readers[i], _Reader(path)
+        old.close()
+
+    def sample(self):
+        """Toma una muestra de todos los cgroups (la llama el hilo; también sirve a mano)."""
+        now = time.perf_counter_ns()
+        if self._start_ns is None:
+            self._start_ns = now
+        row = self._row
+        for i, reader in enumerate(self._readers):
+            reader.read(row, i * len(FIELDS))
+        slot = self.count % self.capacity
+        self.times[slot] = now - self._start_ns
+        self.values[slot * self.width:(slot + 1) * self.width] = row
+        self.count += 1
+
+    def _loop(self):
+        next_ns = time.perf_counter_ns()
+        while not self._stop.is_set():
+            self.sample()
+            next_ns += self.interval_ns
+            delay = next_ns - time.perf_counter_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+            else:
+                next_ns = time.perf_counter_ns()   # atrasado: no acumular deuda
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="cgroup-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.sample()      # última muestra al cierre
+
+    def close(self):
+        for reader in self._readers:
+            reader.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        self.close()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def rows(self):
+        """(nombre, t_ms, *FIELDS) en orden cronológico, lo que quede en el buffer."""
+        n = len(self)
+        first = self.count - n
+        for k in range(first, self.count):
+            slot = k % self.capacity
+            t_ms = self.times[slot] / 1e6
+            base = slot * self.width
+            for i, name in enumerate(self.names):
+                offset = base + i * len(FIELDS)
+                yield (name, t_ms, *self.values[offset:offset + len(FIELDS)])
+
+    def peak_kb(self, name):
+        """Pico de memoria de un cgroup: memory.peak si existe, si no el máximo muestreado."""
+        i = self.names.index(name) * len(FIELDS)
+        peak = current = NAN
+        for k in range(len(self)):
+            slot = (self.count - len(self) + k) % self.capacity
+            mem, mem_peak = self.values[slot * self.width + i:slot * self.width + i + 2]
+            if not math.isnan(mem_peak):
+                peak = mem_peak if math.isnan(peak) else max(peak, mem_peak)
+            if not math.isnan(mem):
+                current = mem if math.isnan(current) else max(current, mem)
+        return peak if not math.isnan(peak) else current
+
+    def last(self, name, field="memory_current_kb"):
+        """Último valor muestreado de un campo para un cgroup."""
+        if not self.count:
+            return NAN
+        slot = (self.count - 1) % self.capacity
+        return self.values[slot * self.width + self.names.index(name) * len(FIELDS)
+                           + FIELDS.index(field)]
+
+    def export_csv(self, path, prefix=None, append=False):
+        """
+        Escribe la serie en CSV: columnas de `prefix` (p. ej. runtime, count),
+        luego cgroup, t_ms y FIELDS. Con append agrega al archivo existente.
+        """
+        prefix = prefix or {}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        new = not append or not path.exists() or path.stat().st_size == 0
+        with open(path, "a" if append else "w", newline="") as f:
+            writer = csv.writer(f)
+            if new:
+                writer.writerow([*prefix, "cgroup", "t_ms", *FIELDS])
+            for name, t_ms, *values in self.rows():
+                writer.writerow([*prefix.values(), name, f"{t_ms:.3f}",
+                                 *("" if math.isnan(v) else f"{v:.0f}" for v in values)])
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Muestreo de cgroups v2 (memoria, CPU, I/O)")
+    parser.add_argument("cgroups", nargs="*", type=Path, help="Rutas de cgroups a muestrear")
+    parser.add_argument("--self", action="store_true", help="Muestrea el cgroup de este proceso")
+    parser.add_argument("--interval-ms", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=1.0, help="Segundos de muestreo")
+    parser.add_argument("--out", type=Path, help="CSV de salida (default: resumen en pantalla)")
+    args = parser.parse_args()
+
+    cgroups = {p.name: p for p in args.cgroups}
+    if args.self:
+        path = own_cgroup()
+        if path is None:
+            print("Este sistema no tiene cgroups v2.")
+            return 1
+        cgroups["self"] = path
+    if not cgroups:
+        parser.error("indica rutas de cgroups o --self")
+
+    with CgroupSampler(cgroups, args.interval_ms) as sampler:
+        time.sleep(args.duration)
+
+    print(f"{sampler.count} muestras en {args.duration}s "
+          f"(intervalo pedido {args.interval_ms} ms)")
+    for name, path in cgroups.items():
+        peak = sampler.peak_kb(name)
+        cpu = sampler.last(name, "cpu_usage_usec")
+        print(f"  {name}: {path}")
+        print(f"    pico de memoria: {'n/d' if math.isnan(peak) else f'{peak:.0f} KB'}, "
+              f"cpu: {'n/d' if math.isnan(cpu) else f'{cpu:.0f} usec'}")
+    if args.out:
+        sampler.export_csv(args.out)
+        print(f"Serie guardada en {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
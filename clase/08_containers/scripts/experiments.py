@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+experiments.py — Registro declarativo de experimentos de benchmark.
+
+Cada CSV de results/ se declara una vez: su schema, las columnas por las
+que se agrupa, la métrica, el runtime de referencia y el tipo de gráfica.
+analyze.py recorre EXPERIMENTS y carga, agrega y dibuja cada uno con el
+mismo motor; un benchmark nuevo solo necesita una entrada aquí.
+
+Tipos de gráfica (chart):
+    bars     una barra por grupo (mediana + IQR); un panel por Panel.where
+    grouped  barras agrupadas por el segundo nivel + panel de overhead %
+    lines    métrica vs `x` (numérico), una línea por runtime
+    status   resultado categórico por fila (success/error) + tiempo
+    scale    Exp 2 de la lección (launch time + memoria con eje doble)
+    timeseries  suma de la métrica entre cgroups vs `x` (tiempo), una
+             línea por grupo; para series de cgroup_sampler.py
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Panel:
+    """Un panel de la figura: los grupos cuyo valor en cada columna de `where` coincide."""
+    title: str
+    ylabel: str
+    where: Dict[str, str] = field(default_factory=dict)
+    metric: Optional[str] = None      # otra métrica del mismo CSV (default: Experiment.metric)
+    fmt: str = "{:.2f}"               # etiqueta sobre cada barra/punto
+    overhead: bool = False            # agrega (+x%) vs baseline a la etiqueta
+
+
+@dataclass(frozen=True)
+class Experiment:
+    name: str                         # figura: results/<name>.png
+    csv: str
+    schema: Dict[str, type]
+    group_by: Tuple[str, ...]
+    metric: str
+    chart: str
+    title: str
+    panels: Tuple[Panel, ...] = ()
+    baseline: str = "bare"            # valor de group_by[0] contra el que se mide overhead
+    baseline_free: Tuple[str, ...] = ()   # columnas de group_by que el baseline no replica
+                                          # (bare solo corre en modo direct)
+    order: Tuple[Tuple[str, ...], ...] = ()   # orden de grupos (default: primera aparición)
+    x: Optional[str] = None           # lines: columna de group_by usada como eje X
+    x_regex: Optional[str] = None     # lines: extrae el número de X de un texto
+    xlabel: Optional[str] = None      # lines: etiqueta del eje X (default: x)
+    logx: bool = False                # lines: eje X logarítmico
+    logy: bool = False                # lines: eje Y logarítmico
+    status: Optional[str] = None      # status: columna con el resultado
+    publish: bool = False             # también se enlaza en images/ (figuras de la lección)
+
+    @property
+    def figure(self):
+        return f"{self.name}.png"
+
+
+# Nombres para ejes, leyendas y el resumen
+LABELS = {
+    "bare": "Bare Metal",
+    "docker": "Docker",
+    "podman": "Podman",
+    "dind": "Docker-in-Docker",
+    "podman-nested": "Podman-in-Podman",
+    "hash": "Hash (SHA-256)",
+    "sort": "Sort (1M ints)",
+    "listdir_getsize": "listdir + getsize",
+    "scandir": "scandir",
+    "batched": "scandir + stats en lotes",
+}
+
+RUNTIMES = ("bare", "docker", "podman")
+NESTED_METHODS = ("bare", "docker", "dind", "podman", "podman-nested")
+
+
+EXPERIMENTS = [
+    # --- Figuras de la lección (04_benchmarks.md) ---
+    Experiment(
+        name="exp1_startup", csv="exp1_startup.csv",
+        schema={"runtime": str, "image": str, "rep": float, "startup_ms": float},
+        group_by=("runtime", "image"), metric="startup_ms", chart="bars",
+        title="Exp 1: Startup Latency (mediana + IQR)",
+        panels=(Panel("Exp 1: Startup Latency (mediana + IQR)", "Tiempo (ms)", fmt="{:.1f} ms"),),
+        order=(("bare", "none"), ("docker", "ubuntu"), ("docker", "alpine"),
+               ("podman", "ubuntu"), ("podman", "alpine")),
+        publish=True,
+    ),
+    Experiment(
+        name="exp2_scale", csv="exp2_scale.csv",
+        schema={"runtime": str, "count": float, "launch_time_s": float,
+                "per_container_kb": float, "total_container_kb": float,
+                "daemon_rss_kb": float},
+        group_by=("runtime", "count"), metric="launch_time_s", chart="scale",
+        title="Exp 2: Resource Footprint at Scale", x="count",
+        # chart_scale dibuja su propio layout; los paneles declaran las métricas del resumen
+        panels=(Panel("Launch Time vs Contenedores", "Tiempo (s)"),
+                Panel("KB por contenedor", "KB", metric="per_container_kb"),
+                Panel("Daemon/Conmon RSS", "KB", metric="daemon_rss_kb")),
+        publish=True,
+    ),
+    Experiment(
+        name="exp2_scale_timeseries", csv="exp2_scale_timeseries.csv",
+        schema={"runtime": str, "count": float, "cgroup": str, "t_ms": float,
+                "memory_current_kb": float, "memory_peak_kb": float,
+                "cpu_usage_usec": float, "io_rbytes": float, "io_wbytes": float},
+        group_by=("runtime", "count"), metric="memory_current_kb", chart="timeseries",
+        title="Exp 2: memoria de los contenedores en el tiempo (cgroup v2)",
+        panels=(Panel("memory.current sumado entre contenedores", "MB"),),
+        x="t_ms", xlabel="Tiempo desde el primer arranque (ms)",
+    ),
+    Experiment(
+        name="exp3_runtime", csv="exp3_runtime.csv",
+        schema={"runtime": str, "workload": str, "rep": float, "time_s": float},
+        group_by=("runtime", "workload"), metric="time_s", chart="grouped",
+        title="Exp 3: Runtime Overhead",
+        panels=(Panel("Tiempo de Ejecución (mediana)", "Tiempo (s)", fmt="{:.3f}s"),
+                Panel("Overhead vs Bare Metal (%)", "Overhead (%)")),
+        order=tuple((rt, wl) for wl in ("hash", "sort") for rt in RUNTIMES),
+        publish=True,
+    ),
+    Experiment(
+        name="exp4_nested", csv="exp4_nested.csv",
+        schema={"method": str, "metric": str, "rep": float, "value": float},
+        group_by=("method", "metric"), metric="value", chart="bars",
+        title="Exp 4: Nested Container Performance",
+        panels=(Panel("Startup Latency por Nivel de Nesting", "Tiempo (ms)",
+                      where={"metric": "startup_ms"}, fmt="{:.0f} ms"),
+                Panel("CPU Overhead (sha256sum 50MB, exec)", "Tiempo (s)",
+                      where={"metric": "cpu_s"}, fmt="{:.3f}s", overhead=True)),
+        order=tuple((m,) for m in NESTED_METHODS),
+        publish=True,
+    ),
+
+    # --- Resultados de las primeras versiones de los scripts ---
+    Experiment(
+        name="cpu", csv="cpu.csv",
+        schema={"runtime": str, "metric": str, "value": float},
+        group_by=("runtime",), metric="value", chart="bars",
+        title="CPU (sha256sum, proceso nuevo por corrida)",
+        panels=(Panel("CPU (mediana + IQR)", "Tiempo (s)", fmt="{:.1f}s", overhead=True),),
+        order=tuple((rt,) for rt in RUNTIMES),
+    ),
+    Experiment(
+        name="cpu_exec", csv="cpu_exec.csv",
+        schema={"runtime": str, "metric": str, "value": float},
+        group_by=("runtime",), metric="value", chart="bars",
+        title="CPU con exec en contenedor ya iniciado",
+        panels=(Panel("CPU exec (mediana + IQR)", "Tiempo (s)", fmt="{:.2f}s", overhead=True),),
+        order=tuple((rt,) for rt in RUNTIMES),
+    ),
+    Experiment(
+        name="startup", csv="startup.csv",
+        schema={"runtime": str, "metric": str, "value": float},
+        group_by=("runtime",), metric="value", chart="bars",
+        title="Startup Latency",
+        panels=(Panel("Startup (mediana + IQR)", "Tiempo (ms)", fmt="{:.1f} ms"),),
+        order=tuple((rt,) for rt in RUNTIMES),
+    ),
+    Experiment(
+        name="io", csv="io.csv",
+        schema={"runtime": str, "mode": str, "rep": float, "mb_per_sec": float},
+        group_by=("runtime", "mode"), metric="mb_per_sec", chart="bars",
+        title="I/O secuencial: overlay vs volume",
+        baseline_free=("mode",),
+        panels=(Panel("Throughput de escritura (mediana + IQR)", "MB/s",
+                      fmt="{:.0f}", overhead=True),),
+    ),
+    Experiment(
+        name="io_workloads", csv="io_workloads.csv",
+        schema={"runtime": str, "mode": str, "workload": str, "rep": float,
+                "mb_per_sec": float, "ops_per_sec": float, "p50_us": float,
+                "p99_us": float, "p999_us": float},
+        group_by=("runtime", "mode", "workload"), metric="mb_per_sec", chart="bars",
+        title="I/O por carga (bench_io.py): direct vs overlay vs volume",
+        baseline_free=("mode",),
+        panels=(Panel("Escritura secuencial + fsync", "MB/s",
+                      where={"workload": "seq_write"}, fmt="{:.0f}", overhead=True),
+                Panel("Lectura aleatoria 4 KB (p99)", "µs", where={"workload": "rand_read"},
+                      metric="p99_us", fmt="{:.0f}", overhead=True),
+                Panel("Crear archivos de 4 KB", "archivos/s", where={"workload": "create"},
+                      metric="ops_per_sec", fmt="{:.0f}", overhead=True),
+                Panel("write + fsync 4 KB (p99)", "µs", where={"workload": "fsync"},
+                      metric="p99_us", fmt="{:.0f}", overhead=True),
+                Panel("Lectura completa con read()", "MB/s", where={"workload": "read"},
+                      fmt="{:.0f}", overhead=True),
+                Panel("Lectura completa con mmap", "MB/s", where={"workload": "mmap"},
+                      fmt="{:.0f}", overhead=True)),
+    ),
+    Experiment(
+        name="lab1_scaling", csv="lab1_scaling.csv",
+        schema={"mount": str, "method": str, "files": float, "rep": float,
+                "ms": float, "us_per_file": float},
+        group_by=("method", "mount", "files"), metric="us_per_file", chart="lines",
+        title="Lab 1: listar N archivos (exercises/lab1_bind_mounts/app.py scale)",
+        panels=(Panel("Disco local", "µs por archivo", where={"mount": "local"}, fmt="{:.1f}"),
+                Panel("Bind mount", "µs por archivo", where={"mount": "bind"}, fmt="{:.1f}")),
+        baseline="listdir_getsize",
+        x="files", xlabel="Archivos", logx=True, logy=True,
+    ),
+    Experiment(
+        name="memory", csv="memory.csv",
+        schema={"runtime": str, "metric": str, "value": float},
+        group_by=("runtime", "metric"), metric="value", chart="lines",
+        title="Memoria del host vs contenedores",
+        panels=(Panel("Memoria extra usada (free -m)", "MB", fmt="{:.0f}"),),
+        x="metric", x_regex=r"containers_(\d+)_", xlabel="Contenedores",
+    ),
+    Experiment(
+        name="memory_cgroup", csv="memory_cgroup.csv",
+        schema={"runtime": str, "metric": str, "count": float, "value": float},
+        group_by=("runtime", "metric", "count"), metric="value", chart="lines",
+        title="Memoria por cgroup",
+        panels=(Panel("Por contenedor", "KB", where={"metric": "per_container_kb"}, fmt="{:.0f}"),
+                Panel("Total contenedores", "KB", where={"metric": "total_containers_kb"},
+                      fmt="{:.0f}"),
+                Panel("Daemon (dockerd)", "KB", where={"metric": "daemon_rss_kb"}, fmt="{:.0f}"),
+                Panel("Conmon (podman)", "KB", where={"metric": "conmon_rss_kb"}, fmt="{:.0f}")),
+        x="count", xlabel="Contenedores",
+    ),
+    Experiment(
+        name="scale", csv="scale.csv",
+        schema={"runtime": str, "count": float, "time_seconds": float, "memory_mb": float},
+        group_by=("runtime", "count"), metric="time_seconds", chart="lines",
+        title="Escalamiento (primera versión)",
+        panels=(Panel("Launch time", "Tiempo (s)", fmt="{:.1f}s"),
+                Panel("Memoria", "MB", metric="memory_mb", fmt="{:.0f}")),
+        x="count", xlabel="Contenedores",
+    ),
+    Experiment(
+        name="nested", csv="nested.csv",
+        schema={"runtime": str, "metric": str, "value": str},
+        group_by=("runtime", "metric"), metric="value", chart="status",
+        title="Nested (primera versión)",
+        panels=(Panel("Contenedor dentro de contenedor", "Tiempo (s)"),),
+        status="value",
+    ),
+    Experiment(
+        name="nested_v2", csv="nested_v2.csv",
+        schema={"runtime": str, "approach": str, "result": str,
+                "time_seconds": float, "error_msg": str},
+        group_by=("runtime", "approach"), metric="time_seconds", chart="status",
+        title="Nested: enfoques probados",
+        panels=(Panel("Resultado por enfoque", "Tiempo (s)", fmt="{:.1f}s"),),
+        status="result",
+    ),
+]
+
+REGISTRY = {e.name: e for e in EXPERIMENTS}
+
+# Tipos de columna por CSV; valores no numéricos en columnas float quedan NaN
+SCHEMAS = {e.csv: e.schema for e in EXPERIMENTS}
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+results_store.py — Historial de corridas de benchmarks (SQLite, solo agrega).
+
+Cada corrida de run_all.sh sobrescribe results/*.csv; este módulo guarda
+cada corrida en results/history.sqlite junto con su contexto (host, modelo
+de CPU, kernel, versiones de docker/podman, commit de git y fecha), para
+tener una tendencia y no solo la última foto.
+
+Por corrida se guardan:
+  - runs:    una fila de metadatos
+  - samples: cada valor numérico de los CSVs del registro (experiments.py)
+             como (experimento, grupo, métrica, valor)
+  - files:   el CSV original (contenido + sha256), para re-analizarlo luego
+
+Uso:
+    python3 results_store.py ingest [--label "kernel nuevo"]
+    python3 results_store.py runs
+    python3 analyze.py --compare prev last      # o ids, o nombres de host
+
+La comparación usa Mann-Whitney U (sin asumir normalidad) por grupo y
+métrica, como benchstat: distribución exacta con muestras chicas sin
+empates, aproximación normal en otro caso.
+"""
+
+import hashlib
+import math
+import platform
+import socket
+import sqlite3
+import subprocess
+import sys
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from experiments import EXPERIMENTS
+from summary import RESULTS_DIR, key_text, read_table
+
+DB_PATH = RESULTS_DIR / "history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id             INTEGER PRIMARY KEY,
+    created_at     TEXT NOT NULL,
+    label          TEXT,
+    host           TEXT,
+    cpu_model      TEXT,
+    kernel         TEXT,
+    docker_version TEXT,
+    podman_version TEXT,
+    git_commit     TEXT,
+    python         TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id     INTEGER NOT NULL REFERENCES runs(id),
+    experiment TEXT NOT NULL,
+    group_key  TEXT NOT NULL,
+    metric     TEXT NOT NULL,
+    value      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_run ON samples(run_id, experiment, group_key, metric);
+CREATE TABLE IF NOT EXISTS files (
+    run_id  INTEGER NOT NULL REFERENCES runs(id),
+    name    TEXT NOT NULL,
+    sha256  TEXT NOT NULL,
+    content BLOB NOT NULL
+);
+"""
+
+RUN_FIELDS = ("id", "created_at", "label", "host", "cpu_model", "kernel",
+              "docker_version", "podman_version", "git_commit", "python")
+
+
+def connect(db=DB_PATH):
+    """Abre (y crea si hace falta) la base de historial para escribir (solo ingest)."""
+    db = Path(db)
+    db.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def connect_ro(db=DB_PATH):
+    """Abre la base de historial solo para lectura; None si no existe (no la crea)."""
+    db = Path(db)
+    if not db.exists():
+        return None
+    return sqlite3.connect(f"{db.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def _command_output(cmd):
+    """Primera línea de la salida de un comando, o None si no existe o falla."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    line = result.stdout.strip().splitlines()[:1]
+    return line[0] if result.returncode == 0 and line else None
+
+
+def cpu_model():
+    try:
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or None
+
+
+def run_metadata(label=None):
+    """Contexto de la corrida: host, CPU, kernel, versiones de runtimes y commit."""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "host": socket.gethostname(),
+        "cpu_model": cpu_model(),
+        "kernel": platform.release(),
+        # Versión del daemon si responde; si no, la del cliente
+        "docker_version": (_command_output(["docker", "version", "-f", "{{.Server.Version}}"])
+                           or _command_output(["docker", "--version"])),
+        "podman_version": _command_output(["podman", "version", "-f", "{{.Version}}"]),
+        "git_commit": _command_output(["git", "-C", str(Path(__file__).parent),
+                                       "rev-parse", "HEAD"]),
+        "python": platform.python_version(),
+    }
+
+
+def experiment_samples(exp, results_dir=RESULTS_DIR):
+    """(grupo, métrica, valor) de cada valor numérico del CSV de un experimento."""
+    table = read_table(exp.csv, results_dir)
+    if not table or exp.chart == "status":
+        return
+    metrics = dict.fromkeys([exp.metric] + [p.metric for p in exp.panels if p.metric])
+    keys = ["/".join(key_text(p) for p in key)
+            for key in zip(*(table[c].tolist() for c in exp.group_by))]
+    for metric in metrics:
+        if metric not in table:
+            continue
+        for key, value in zip(keys, table[metric].tolist()):
+            if not math.isnan(value):
+                yield key, metric, value
+
+
+def ingest(results_dir=RESULTS_DIR, db=DB_PATH, label=None):
+    """Guarda los CSVs actuales de results_dir como una corrida nueva; retorna su id."""
+    results_dir = Path(results_dir)
+    meta = run_metadata(label)
+    with connect(db) as conn:
+        cur = conn.execute(
+            f"INSERT INTO runs ({', '.join(meta)}) VALUES ({', '.join('?' * len(meta))})",
+            list(meta.values()))
+        run_id = cur.lastrowid
+        for exp in EXPERIMENTS:
+            path = results_dir / exp.csv
+            if not path.exists():
+                continue
+            content = path.read_bytes()
+            conn.execute("INSERT INTO files VALUES (?, ?, ?, ?)",
+                         (run_id, exp.csv, hashlib.sha256(content).hexdigest(), content))
+            conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?)",
+                             ((run_id, exp.name, key, metric, value)
+                              for key, metric, value in experiment_samples(exp, results_dir)))
+    return run_id
+
+
+def list_runs(db=DB_PATH):
+    """Metadatos de todas las corridas, de la más vieja a la más nueva."""
+    conn = connect_ro(db)
+    if conn is None:
+        return []
+    with closing(conn):
+        rows = conn.execute(f"SELECT {', '.join(RUN_FIELDS)} FROM runs ORDER BY id").fetchall()
+    return [dict(zip(RUN_FIELDS, row)) for row in rows]
+
+
+def resolve_run(ref, db=DB_PATH):
+    """
+    Id de corrida a partir de una referencia: un id, "last", "prev" (la
+    anterior a last) o un nombre de host (su corrida más reciente).
+    """
+    runs = list_runs(db)
+    if not runs:
+        raise ValueError(f"No hay corridas en {db}; corre primero: python3 results_store.py ingest")
+    ref = str(ref)
+    if ref == "last":
+        return runs[-1]["id"]
+    if ref == "prev":
+        if len(runs) < 2:
+            raise ValueError("Solo hay una corrida guardada")
+        return runs[-2]["id"]
+    if ref.isdigit() and any(r["id"] == int(ref) for r in runs):
+        return int(ref)
+    on_host = [r["id"] for r in runs if r["host"] == ref]
+    if on_host:
+        return on_host[-1]
+    raise ValueError(f"Corrida desconocida: {ref} (usa un id, last, prev o un host)")
+
+
+def run_samples(run_id, db=DB_PATH):
+    """{(experimento, grupo, métrica): np.array de valores} de una corrida."""
+    conn = connect_ro(db)
+    if conn is None:
+        return {}
+    with closing(conn):
+        rows = conn.execute("SELECT experiment, group_key, metric, value FROM samples "
+                            "WHERE run_id = ?", (run_id,)).fetchall()
+    groups = {}
+    for experiment, key, metric, value in rows:
+        groups.setdefault((experiment, key, metric), []).append(value)
+    return {k: np.asarray(v) for k, v in groups.items()}
+
+
+EXACT_MAX = 50      # n1 + n2 hasta el cual se usa la distribución exacta de U
+
+
+def _exact_u_cdf(u, n1, n2):
+    """P(U <= u) bajo H0, contando los arreglos de rangos (sin empates)."""
+    # counts[j][k]: arreglos de j elementos del primer grupo con U = k
+    counts = [np.zeros(n1 * n2 + 1) for _ in range(n1 + 1)]
+    counts[0][0] = 1
+    for m in range(1, n1 + n2 + 1):
+        # Agregar el elemento de rango m: va al grupo 1 (suma los del grupo 2 ya vistos) o al 2
+        for j in range(min(m, n1), 0, -1):
+            shift = m - j
+            if shift <= n2:
+                counts[j][shift:] += counts[j - 1][:len(counts[j]) - shift]
+    dist = counts[n1]
+    return dist[:int(u) + 1].sum() / dist.sum()
+
+
+def mann_whitney(a, b):
+    """
+    Prueba U de Mann-Whitney de dos colas. Retorna (U, p).
+
+    Exacta si no hay empates y n1 + n2 <= EXACT_MAX; si no, aproximación
+    normal con corrección por empates y de continuidad.
+    """
+    n1, n2 = len(a), len(b)
+    values = np.concatenate([a, b])
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(len(values))
+    # Rango promedio para empates
+    _, starts, counts = np.unique(values[order], return_index=True, return_counts=True)
+    for start, count in zip(starts, counts):
+        ranks[order[start:start + count]] = start + (count + 1) / 2
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+
+    if (counts == 1).all() and n <= EXACT_MAX:
+        u = min(u1, n1 * n2 - u1)
+        return u1, min(1.0, 2 * _exact_u_cdf(u, n1, n2))
+
+    tie_term = ((counts ** 3 - counts).sum()) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u1, 1.0
+    z = (abs(u1 - n1 * n2 / 2) - 0.5) / sigma
+    return u1, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+
+@dataclass(frozen=True)
+class Change:
+    """Diferencia de un grupo/métrica entre dos corridas."""
+    experiment: str
+    key: str
+    metric: str
+    n_a: int
+    n_b: int
+    median_a: float
+    median_b: float
+    delta_pct: Optional[float]
+    p_value: Optional[float]            # None si alguna corrida tiene menos de MIN_N muestras
+    significant: bool = False
+
+
+MIN_N = 3
+
+
+def compare(run_a, run_b, db=DB_PATH, alpha=0.05) -> List[Change]:
+    """
+    Compara dos corridas grupo por grupo (solo los presentes en ambas).
+
+    Un cambio es significativo si p < alpha (por comparación, sin corregir
+    por el número de grupos: con ~5 repeticiones una corrección las haría
+    imposibles). Grupos con menos de MIN_N muestras se reportan sin prueba.
+    """
+    a, b = run_samples(run_a, db), run_samples(run_b, db)
+    changes = []
+    for group in a:
+        if group not in b:
+            continue
+        xa, xb = a[group], b[group]
+        med_a, med_b = float(np.median(xa)), float(np.median(xb))
+        delta = (med_b - med_a) / med_a * 100 if med_a else None
+        p = mann_whitney(xa, xb)[1] if min(len(xa), len(xb)) >= MIN_N else None
+        changes.append(Change(*group, len(xa), len(xb), med_a, med_b, delta, p,
+                              p is not None and p < alpha))
+    return changes
+
+
+def describe_run(run):
+    label = f" \"{run['label']}\"" if run["label"] else ""
+    commit = (run["git_commit"] or "-")[:10]
+    return (f"#{run['id']}{label} {run['created_at']} {run['host']} "
+            f"kernel={run['kernel']} docker={run['docker_version'] or '-'} "
+            f"podman={run['podman_version'] or '-'} commit={commit}")
+
+
+def print_comparison(run_a, run_b, changes, show_all=False, alpha=0.05, db=DB_PATH):
+    """Imprime las diferencias entre dos corridas (por default solo las significativas)."""
+    runs = {r["id"]: r for r in list_runs(db)}
+    print("\n" + "=" * 60)
+    print("  COMPARACIÓN DE CORRIDAS")
+    print("=" * 60)
+    print(f"  A: {describe_run(runs[run_a])}")
+    print(f"  B: {describe_run(runs[run_b])}")
+    for field in ("host", "cpu_model", "kernel", "docker_version", "podman_version"):
+        if runs[run_a][field] != runs[run_b][field]:
+            print(f"  ≠ {field}: {runs[run_a][field]} -> {runs[run_b][field]}")
+
+    tested = [c for c in changes if c.p_value is not None]
+    shown = changes if show_all else [c for c in tested if c.significant]
+    print(f"\n{len(changes)} grupos en común, {len(tested)} con n >= {MIN_N}, "
+          f"{sum(c.significant for c in tested)} cambios significativos (p < {alpha}):")
+    for c in sorted(shown, key=lambda c: (c.experiment, c.key, c.metric)):
+        delta = "   n/d" if c.delta_pct is None else f"{c.delta_pct:+6.1f}%"
+        test = "sin prueba" if c.p_value is None else f"p={c.p_value:.3g}"
+        mark = "*" if c.significant else " "
+        print(f" {mark} {c.experiment:14s} {c.key:24s} {c.metric:18s} "
+              f"{c.median_a:10.3f} -> {c.median_b:10.3f} {delta}  {test}")
+    print("\n" + "=" * 60)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Historial de corridas de benchmarks")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("ingest", help="Guarda los CSVs actuales de results/ como una corrida")
+    p.add_argument("--results", type=Path, default=RESULTS_DIR)
+    p.add_argument("--label", help="Nota libre para la corrida")
+    sub.add_parser("runs", help="Lista las corridas guardadas")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        run_id = ingest(args.results, args.db, args.label)
+        run = next(r for r in list_runs(args.db) if r["id"] == run_id)
+        print(f"Corrida guardada en {args.db}:")
+        print(f"  {describe_run(run)}")
+    else:
+        runs = list_runs(args.db)
+        if not runs:
+            print(f"No hay corridas en {args.db}")
+        for run in runs:
+            print(describe_run(run))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
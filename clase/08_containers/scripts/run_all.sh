@@ -1,7 +1,7 @@
 #!/bin/bash
 # run_all.sh — Ejecuta los 3 experimentos de benchmark y genera gráficas
 # Uso: bash run_all.sh
-# Requiere: docker y/o podman instalados, Python 3 con matplotlib para gráficas
+# Requiere: docker y/o podman instalados, Python 3 con matplotlib y numpy para gráficas
 set -e
 
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
@@ -29,27 +29,32 @@ else
 fi
 echo ""
 
-# Ejecutar cada benchmark
+# Ejecutar cada benchmark. Exp 1-3 usan el harness en Python (bench.py,
+# cronometraje con perf_counter_ns); los bench_*.sh quedan como referencia.
+# Exp 4 sigue en bash.
 BENCHMARKS=(
-    "bench_startup.sh:Exp 1 — Startup Latency (LAUNCH cost)"
-    "bench_scale.sh:Exp 2 — Resource Footprint at Scale (LAUNCH + CAPACITY)"
-    "bench_runtime.sh:Exp 3 — Runtime Overhead (RUNNING cost)"
+    "bench.py startup:Exp 1 — Startup Latency (LAUNCH cost)"
+    "bench.py scale:Exp 2 — Resource Footprint at Scale (LAUNCH + CAPACITY)"
+    "bench.py runtime:Exp 3 — Runtime Overhead (RUNNING cost)"
     "exp4_nested.sh:Exp 4 — Nested Container Performance"
 )
 
 for entry in "${BENCHMARKS[@]}"; do
-    script="${entry%%:*}"
+    cmd="${entry%%:*}"
     name="${entry##*:}"
+    script="${cmd%% *}"
 
     echo "--------------------------------------------"
     echo "  $name"
-    echo "  ($script)"
+    echo "  ($cmd)"
     echo "--------------------------------------------"
 
-    if [ -f "$script" ]; then
-        bash "$script" || echo "⚠ $script terminó con errores (continuando...)"
-    else
+    if [ ! -f "$script" ]; then
         echo "⚠ $script no encontrado, saltando"
+    elif [[ "$script" == *.py ]]; then
+        python3 $cmd || echo "⚠ $cmd terminó con errores (continuando...)"
+    else
+        bash "$script" || echo "⚠ $script terminó con errores (continuando...)"
     fi
     echo ""
 done
@@ -59,15 +64,22 @@ echo "  Todos los benchmarks completados"
 echo "============================================"
 echo ""
 
+# Guardar la corrida en el historial (results/history.sqlite) con su contexto
+if command -v python3 &>/dev/null && python3 -c "import numpy" 2>/dev/null; then
+    python3 results_store.py ingest || echo "⚠ No se pudo guardar la corrida en el historial"
+    echo "  Comparar con la corrida anterior: python3 analyze.py --compare prev last"
+    echo ""
+fi
+
 # Generar gráficas si Python y matplotlib están disponibles
 if command -v python3 &>/dev/null; then
-    if python3 -c "import matplotlib" 2>/dev/null; then
+    if python3 -c "import matplotlib, numpy" 2>/dev/null; then
         echo "Generando gráficas con analyze.py..."
         python3 analyze.py
         echo ""
         echo "Gráficas generadas en results/ e images/"
     else
-        echo "matplotlib no encontrado. Para generar gráficas:"
+        echo "matplotlib o numpy no encontrado. Para generar gráficas:"
         echo "  pip install -r requirements.txt"
         echo "  python3 analyze.py"
     fi
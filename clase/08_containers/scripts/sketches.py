@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+sketches.py — Cuantiles en streaming con memoria acotada (t-digest).
+
+Para CSVs de millones de filas (muestreo por ms de cgroups, latencia por
+exec): el archivo se lee en bloques y cada grupo (p. ej. runtime+workload)
+mantiene un t-digest, un resumen de ~100 centroides que da mediana, IQR y
+p99 con error pequeño (menor en las colas). La memoria depende del número de
+grupos, no del número de filas.
+
+Los digests se pueden combinar: merge() une resultados de varios archivos o
+de varias máquinas, y to_dict()/from_dict() los serializan a JSON.
+
+Uso:
+    python3 sketches.py results/exp3_runtime.csv --by runtime workload --value time_s
+    python3 sketches.py results/exp3_runtime.csv --by runtime workload --value time_s --save host1.json
+    python3 sketches.py --merge host1.json host2.json
+"""
+
+import csv
+import json
+import sys
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 100
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class TDigest:
+    """
+    t-digest con compresión vectorizada (variante "merging").
+
+    Los valores nuevos se acumulan en un buffer; al llenarse, buffer y
+    centroides se ordenan y se agrupan por la función de escala
+    k(q) = δ/π·asin(2q−1), que da centroides pequeños en las colas
+    (p1, p99 precisos) y grandes cerca de la mediana.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, buffer_size=None):
+        self.compression = compression
+        self.buffer_size = buffer_size or 10 * compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    def update(self, values):
+        """Agrega un array (o lista) de valores; NaN se ignora."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self._buffer.append(values)
+        self._buffered += len(values)
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+    def _compress(self, extra_means=None, extra_weights=None):
+        parts_m = [self.means] + self._buffer
+        parts_w = [self.weights] + [np.ones(len(b)) for b in self._buffer]
+        if extra_means is not None:
+            parts_m.append(extra_means)
+            parts_w.append(extra_weights)
+        means = np.concatenate(parts_m)
+        weights = np.concatenate(parts_w)
+        self._buffer = []
+        self._buffered = 0
+        if not len(means):
+            return
+
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / np.pi * np.arcsin(2 * q_mid - 1)
+        bucket = np.floor(k).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+        new_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / new_weights
+        self.weights = new_weights
+
+    def merge(self, other):
+        """Incorpora otro digest (otro archivo, otra máquina)."""
+        if other.count == 0:
+            return self
+        other._compress()
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(other.means, other.weights)
+        return self
+
+    def quantile(self, q):
+        """Cuantil(es) q en [0, 1]; interpolación lineal entre centroides."""
+        self._compress()
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        centers = np.cumsum(self.weights) - self.weights / 2
+        x = np.r_[0.0, centers, self.count]
+        y = np.r_[self.min, self.means, self.max]
+        result = np.interp(np.asarray(q, dtype=np.float64) * self.count, x, y)
+        return result if np.ndim(q) else float(result)
+
+    def to_dict(self):
+        self._compress()
+        return {"compression": self.compression, "count": self.count,
+                "min": self.min, "max": self.max,
+                "means": self.means.tolist(), "weights": self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data.get("compression", DEFAULT_COMPRESSION))
+        digest.count = data["count"]
+        digest.min = data["min"]
+        digest.max = data["max"]
+        digest.means = np.array(data["means"], dtype=np.float64)
+        digest.weights = np.array(data["weights"], dtype=np.float64)
+        return digest
+
+
+def iter_chunks(path, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Lee un CSV en bloques de chunk_rows filas.
+
+    Produce dicts {columna: tupla de str} con las columnas pedidas.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise KeyError(f"{path}: faltan columnas {missing}")
+        idx = [header.index(c) for c in columns]
+        width = len(header)
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                return
+            cols = list(zip(*(r for r in rows if len(r) == width)))
+            if cols:
+                yield {c: cols[i] for c, i in zip(columns, idx)}
+
+
+def _floats(values):
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        out = np.full(len(values), np.nan)
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except ValueError:
+                pass
+        return out
+
+
+def stream_groups(path, by, value, sketches=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                  compression=DEFAULT_COMPRESSION):
+    """
+    Agrega `value` por las columnas `by` leyendo el CSV en bloques.
+
+    sketches: dict {key: TDigest} existente para acumular varios archivos.
+    Retorna el dict de digests (grupos en orden de primera aparición).
+    """
+    sketches = {} if sketches is None else sketches
+    for chunk in iter_chunks(path, list(by) + [value], chunk_rows):
+        values = _floats(chunk[value])
+        key_cols = [np.array(chunk[c], dtype=str) for c in by]
+        codes = np.zeros(len(values), dtype=np.int64)
+        for col in key_cols:
+            uniq, inverse = np.unique(col, return_inverse=True)
+            codes = codes * len(uniq) + inverse
+        groups, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(groups) + 1))
+        # Grupos en orden de primera aparición dentro del bloque
+        for g in np.argsort(first):
+            key = tuple(str(col[first[g]]) for col in key_cols)
+            digest = sketches.get(key)
+            if digest is None:
+                digest = sketches[key] = TDigest(compression)
+            digest.update(values[order[bounds[g]:bounds[g + 1]]])
+    return sketches
+
+
+class SketchStats:
+    """
+    Misma interfaz que tables.GroupStats (keys, get, overhead) pero sobre
+    digests. Q1/Q3 son los cuantiles 0.25/0.75 interpolados.
+    """
+
+    def __init__(self, sketches):
+        self.sketches = {k: d for k, d in sketches.items() if d.count}
+        self.keys = list(self.sketches)
+
+    def __contains__(self, key):
+        return key in self.sketches
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, key, default=None):
+        digest = self.sketches.get(key)
+        if digest is None:
+            return default
+        median, q1, q3, p99 = digest.quantile([0.5, 0.25, 0.75, 0.99])
+        return {"n": int(digest.count), "median": float(median), "q1": float(q1),
+                "q3": float(q3), "p99": float(p99)}
+
+    def percentile(self, p):
+        return np.array([self.sketches[k].quantile(p / 100.0) for k in self.keys])
+
+    def overhead(self, baseline="bare", level=0):
+        out = {}
+        medians = {k: d.quantile(0.5) for k, d in self.sketches.items()}
+        for key, med in medians.items():
+            base_key = key[:level] + (baseline,) + key[level + 1:]
+            base = medians.get(base_key)
+            if base is None or key == base_key or base == 0:
+                continue
+            out[key] = (med - base) / base * 100
+        return out
+
+
+def save_sketches(sketches, path):
+    """Guarda {key: TDigest} como JSON (las llaves tuple se guardan como listas)."""
+    with open(path, "w") as f:
+        json.dump([{"key": list(k), "digest": d.to_dict()} for k, d in sketches.items()], f)
+
+
+def load_sketches(path, into=None):
+    """Carga digests de JSON, combinándolos con `into` si se da."""
+    into = {} if into is None else into
+    with open(path) as f:
+        for entry in json.load(f):
+            key = tuple(entry["key"])
+            digest = TDigest.from_dict(entry["digest"])
+            if key in into:
+                into[key].merge(digest)
+            else:
+                into[key] = digest
+    return into
+
+
+def print_sketches(sketches):
+    stats = SketchStats(sketches)
+    print(f"  {'grupo':30s} {'n':>10s} {'mediana':>12s} {'Q1':>12s} {'Q3':>12s} {'p99':>12s}")
+    for key in stats.keys:
+        s = stats.get(key)
+        print(f"  {'/'.join(key):30s} {s['n']:>10d} {s['median']:>12.4f} "
+              f"{s['q1']:>12.4f} {s['q3']:>12.4f} {s['p99']:>12.4f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cuantiles en streaming por grupo (t-digest)")
+    parser.add_argument("csv", nargs="*", type=Path, help="CSVs a agregar (se combinan)")
+    parser.add_argument("--by", nargs="+", default=["runtime"], help="Columnas de agrupación")
+    parser.add_argument("--value", help="Columna numérica a resumir")
+    parser.add_argument("--merge", nargs="+", type=Path, default=[],
+                        help="Digests JSON (de otros archivos o máquinas) a combinar")
+    parser.add_argument("--save", type=Path, help="Guarda los digests combinados en JSON")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.csv and not args.value:
+        parser.error("--value es requerido para leer CSVs")
+
+    sketches = {}
+    for path in args.merge:
+        load_sketches(path, sketches)
+    for path in args.csv:
+        stream_groups(path, args.by, args.value, sketches, args.chunk_rows)
+
+    if not sketches:
+        print("Sin datos.")
+        return 1
+    print_sketches(sketches)
+    if args.save:
+        save_sketches(sketches, args.save)
+        print(f"  Guardado: {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+summary.py — Resumen de benchmarks como registros tipados (sin matplotlib).
+
+API de biblioteca para CI y para el harness de benchmarks: carga y agrega
+los experimentos de experiments.py y retorna un ExperimentSummary por
+experimento (mediana, IQR, p99 y overhead vs baseline de cada grupo). Solo
+depende de numpy; las gráficas viven en analyze.py.
+
+Uso:
+    from summary import summarize_all
+    for s in summarize_all():
+        g = s.get(("docker", "hash"))
+        print(s.name, g.median, g.overhead_pct)
+
+    python3 analyze.py --summary-only     # texto, sin importar matplotlib
+    python3 analyze.py --json             # JSON a stdout
+"""
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from experiments import EXPERIMENTS, LABELS, NESTED_METHODS, REGISTRY, SCHEMAS, Experiment
+from sketches import SketchStats, stream_groups
+from tables import load_table, group_stats
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass(frozen=True)
+class GroupSummary:
+    """Estadísticos de una métrica para un grupo (llave = valores de group_by)."""
+    key: Tuple[str, ...]
+    metric: str
+    n: int
+    median: float
+    q1: float
+    q3: float
+    p99: float
+    overhead_pct: Optional[float] = None      # mediana vs el grupo baseline equivalente
+
+
+@dataclass(frozen=True)
+class StatusRow:
+    """Resultado categórico de una fila (experimentos chart="status")."""
+    key: Tuple[str, ...]
+    status: str
+    value: Optional[float] = None
+
+
+@dataclass
+class ExperimentSummary:
+    name: str
+    csv: str
+    title: str
+    group_by: Tuple[str, ...]
+    baseline: str
+    groups: List[GroupSummary] = field(default_factory=list)
+    statuses: List[StatusRow] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.groups or self.statuses)
+
+    def get(self, key, metric=None) -> Optional[GroupSummary]:
+        """Grupo por llave (y métrica, si el experimento resume varias)."""
+        for group in self.groups:
+            if group.key == tuple(key) and (metric is None or group.metric == metric):
+                return group
+        return None
+
+    def metrics(self) -> List[str]:
+        return list(dict.fromkeys(g.metric for g in self.groups))
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def key_text(part) -> str:
+    """Parte de una llave como texto (10.0 -> "10")."""
+    if isinstance(part, float) and part.is_integer():
+        return str(int(part))
+    return str(part)
+
+
+def read_table(filename, results_dir=RESULTS_DIR):
+    """Carga un CSV de results/ como columnas (parseado una vez, cacheado por hash)."""
+    return load_table(Path(results_dir) / filename, SCHEMAS.get(filename))
+
+
+def missing_csvs(results_dir=RESULTS_DIR) -> List[Path]:
+    """CSVs del registro que faltan en results_dir (cada uno una sola vez)."""
+    csvs = dict.fromkeys(exp.csv for exp in EXPERIMENTS)
+    return [Path(results_dir) / name for name in csvs
+            if not (Path(results_dir) / name).exists()]
+
+
+def load_stats(filename, by, value, results_dir=RESULTS_DIR, stream=False, merge_dirs=()):
+    """
+    Estadísticos de `value` agrupados por `by` (mediana, Q1, Q3, p99).
+
+    En memoria usa tables.group_stats; con stream, t-digests por grupo
+    combinados entre results_dir y merge_dirs.
+    """
+    if not stream:
+        return group_stats(read_table(filename, results_dir), by, value)
+    sketches = {}
+    for directory in [Path(results_dir)] + [Path(d) for d in merge_dirs]:
+        path = directory / filename
+        if path.exists():
+            stream_groups(path, by, value, sketches)
+    return SketchStats(sketches)
+
+
+def overhead_pct(stats, key, exp: Experiment):
+    """
+    Overhead % de la mediana de `key` contra el grupo baseline equivalente.
+
+    Si no existe (baseline,) + key[1:] (p. ej. bare solo corre en modo
+    direct), solo se acepta un grupo baseline que difiera únicamente en las
+    columnas exp.baseline_free, y solo si hay exactamente uno; si no, None.
+    """
+    base = stats.get((exp.baseline,) + tuple(key[1:]))
+    if base is None and exp.baseline_free:
+        fixed = [i for i, col in enumerate(exp.group_by) if i and col not in exp.baseline_free]
+        candidates = [k for k in stats.keys
+                      if k[0] == exp.baseline and all(k[i] == key[i] for i in fixed)]
+        if len(candidates) == 1:
+            base = stats.get(candidates[0])
+    if base is None or base["median"] == 0:
+        return None
+    return (stats.get(key)["median"] - base["median"]) / base["median"] * 100
+
+
+def summarize(exp: Experiment, results_dir=RESULTS_DIR, stream=False,
+              merge_dirs=()) -> ExperimentSummary:
+    """Resume un experimento del registro: todas sus métricas (la principal y las de sus paneles)."""
+    summary = ExperimentSummary(exp.name, exp.csv, exp.title, exp.group_by, exp.baseline)
+
+    if exp.chart == "status":
+        table = read_table(exp.csv, results_dir)
+        if table and exp.status in table:
+            numeric = exp.schema.get(exp.metric) is float
+            for row in table.rows():
+                value = float(row[exp.metric]) if numeric else None
+                summary.statuses.append(StatusRow(
+                    tuple(key_text(row[c]) for c in exp.group_by),
+                    str(row[exp.status]).strip(),
+                    None if value is None or np.isnan(value) else value))
+        return summary
+
+    metrics = [exp.metric] + [p.metric for p in exp.panels if p.metric]
+    for metric in dict.fromkeys(metrics):
+        stats = load_stats(exp.csv, list(exp.group_by), metric, results_dir, stream, merge_dirs)
+        for key in stats.keys:
+            g = stats.get(key)
+            pct = overhead_pct(stats, key, exp) if key[0] != exp.baseline else None
+            summary.groups.append(GroupSummary(
+                tuple(key_text(p) for p in key), metric, g["n"], g["median"],
+                g["q1"], g["q3"], g["p99"], pct))
+    return summary
+
+
+def summarize_all(results_dir=RESULTS_DIR, stream=False, merge_dirs=(),
+                  names: Optional[Sequence[str]] = None) -> List[ExperimentSummary]:
+    """Resume los experimentos del registro (o solo `names`) que tienen datos."""
+    experiments = [REGISTRY[n] for n in names] if names else EXPERIMENTS
+    summaries = [summarize(exp, results_dir, stream, merge_dirs) for exp in experiments]
+    return [s for s in summaries if s]
+
+
+def print_summary(summaries: List[ExperimentSummary]):
+    """Imprime una tabla resumen en texto."""
+    by_name = {s.name: s for s in summaries}
+    print("\n" + "=" * 60)
+    print("  RESUMEN DE BENCHMARKS")
+    print("=" * 60)
+
+    # Exp 1
+    s = by_name.get("exp1_startup")
+    if s:
+        print("\nExp 1 — Startup Latency (mediana):")
+        for key in REGISTRY["exp1_startup"].order:
+            group = s.get(key)
+            if group:
+                print(f"  {'/'.join(key):20s} {group.median:8.1f} ms")
+
+    # Exp 2
+    s = by_name.get("exp2_scale")
+    if s:
+        print("\nExp 2 — Scale (launch time + memory):")
+        for launch in s.groups:
+            if launch.metric != "launch_time_s":
+                continue
+            per_kb = s.get(launch.key, "per_container_kb")
+            daemon = s.get(launch.key, "daemon_rss_kb")
+            if not (per_kb and daemon):
+                continue
+            rt, count = launch.key
+            print(f"  {LABELS.get(rt, rt):10s} {int(count):>2d} cont: "
+                  f"{launch.median:6.2f}s, {per_kb.median:.0f} KB/cont, "
+                  f"daemon={daemon.median:.0f} KB")
+
+    # Exp 3
+    s = by_name.get("exp3_runtime")
+    if s:
+        print("\nExp 3 — Runtime Overhead (mediana):")
+        order = REGISTRY["exp3_runtime"].order
+        for wl in dict.fromkeys(k[1] for k in order):
+            print(f"  {wl}:")
+            for rt in dict.fromkeys(k[0] for k in order):
+                group = s.get((rt, wl))
+                if not group:
+                    continue
+                if group.overhead_pct is None:
+                    print(f"    {LABELS.get(rt, rt):15s} {group.median:.4f}s")
+                else:
+                    print(f"    {LABELS.get(rt, rt):15s} {group.median:.4f}s "
+                          f"({group.overhead_pct:+.1f}%)")
+
+    # Exp 4
+    s = by_name.get("exp4_nested")
+    if s:
+        print("\nExp 4 — Nested Containers:")
+        print("  Startup (mediana):")
+        for m in NESTED_METHODS:
+            group = s.get((m, "startup_ms"))
+            if group:
+                print(f"    {LABELS.get(m, m):22s} {group.median:8.1f} ms")
+        print("  CPU sha256sum 50MB (mediana):")
+        for m in NESTED_METHODS:
+            group = s.get((m, "cpu_s"))
+            if not group:
+                continue
+            if group.overhead_pct is None:
+                print(f"    {LABELS.get(m, m):22s} {group.median:.3f}s")
+            else:
+                print(f"    {LABELS.get(m, m):22s} {group.median:.3f}s "
+                      f"({group.overhead_pct:+.1f}%)")
+
+    # Resto del registro: mediana por grupo
+    for s in summaries:
+        if REGISTRY[s.name].publish:
+            continue
+        if s.statuses:
+            print(f"\n{s.title} ({s.csv}):")
+            for row in s.statuses:
+                print(f"  {'/'.join(row.key):40s} {row.status}")
+            continue
+        metric = REGISTRY[s.name].metric
+        print(f"\n{s.title} ({s.csv}, {metric}, mediana):")
+        for group in s.groups:
+            if group.metric == metric:
+                print(f"  {'/'.join(group.key):40s} {group.median:10.2f}  (n={group.n})")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+tables.py — Carga columnar de CSVs de resultados y estadísticas agrupadas.
+
+Cada CSV se parsea una sola vez a columnas NumPy tipadas (float o str). El
+resultado se cachea en memoria por ruta y en disco (results/.cache/*.npz) por
+hash del archivo, así que plot_* y print_summary comparten el mismo parseo y
+una segunda corrida de analyze.py no vuelve a leer el texto.
+
+Las estadísticas por grupo (mediana, IQR, percentiles, overhead vs bare) se
+calculan para todos los grupos a la vez: se ordena una vez por (grupo, valor)
+y cada estadístico es una indexación vectorizada sobre ese orden.
+
+Uso:
+    from tables import load_table, group_stats
+    t = load_table(RESULTS_DIR / "exp3_runtime.csv", {"time_s": float})
+    stats = group_stats(t, ["runtime", "workload"], "time_s")
+    stats.get(("docker", "hash"))["median"]
+"""
+
+import csv
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIRNAME = ".cache"
+CACHE_VERSION = 1
+
+_memo = {}
+
+
+class Table:
+    """Columnas de un CSV como arrays NumPy (float64 con NaN, o str)."""
+
+    def __init__(self, columns, path=None):
+        self.columns = columns
+        self.path = path
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def filter(self, mask):
+        """Nueva tabla con las filas donde mask es True."""
+        return Table({k: v[mask] for k, v in self.columns.items()}, self.path)
+
+    def rows(self):
+        """Itera filas como dicts (en el orden del archivo)."""
+        names = list(self.columns)
+        for values in zip(*(self.columns[n] for n in names)):
+            yield dict(zip(names, values))
+
+
+def _to_float(values):
+    """Convierte a float64; valores no numéricos quedan como NaN."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        out = np.empty(len(values), dtype=np.float64)
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except ValueError:
+                out[i] = np.nan
+        return out
+
+
+def _is_numeric(values):
+    try:
+        np.array([v for v in values if v != ""], dtype=np.float64)
+        return True
+    except ValueError:
+        return False
+
+
+def file_hash(path):
+    """SHA-256 del contenido del archivo."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def parse_csv(path, schema=None):
+    """
+    Parsea un CSV a columnas tipadas.
+
+    schema: {columna: float | str}. Columnas fuera del schema se infieren:
+    float si todos los valores no vacíos son numéricos, str si no.
+    """
+    schema = schema or {}
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return Table({}, path)
+        raw = list(zip(*(row for row in reader if len(row) == len(header))))
+
+    columns = {}
+    for i, name in enumerate(header):
+        values = raw[i] if raw else ()
+        kind = schema.get(name) or (float if _is_numeric(values) else str)
+        if kind is str:
+            columns[name] = np.array(values, dtype=str)
+        else:
+            columns[name] = _to_float(values)
+    return Table(columns, path)
+
+
+def load_table(path, schema=None, use_disk_cache=True):
+    """
+    Carga un CSV como Table, parseándolo solo si cambió.
+
+    Retorna una tabla vacía si el archivo no existe (el aviso lo da quien
+    llama, una vez por corrida: ver summary.missing_csvs).
+    """
+    path = Path(path)
+    if not path.exists():
+        return Table({}, path)
+
+    stat = path.stat()
+    schema_key = tuple(sorted((k, v.__name__) for k, v in (schema or {}).items()))
+    memo_key = (str(path), schema_key)
+    cached = _memo.get(memo_key)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+
+    table = None
+    cache_file = None
+    if use_disk_cache:
+        digest = hashlib.sha256(
+            f"{CACHE_VERSION}:{file_hash(path)}:{schema_key}".encode()).hexdigest()[:16]
+        cache_file = path.parent / CACHE_DIRNAME / f"{path.stem}-{digest}.npz"
+        if cache_file.exists():
+            try:
+                with np.load(cache_file, allow_pickle=False) as data:
+                    order = list(data["__order__"])
+                    table = Table({name: data[f"c_{name}"] for name in order}, path)
+            except (OSError, ValueError, KeyError):
+                table = None
+
+    if table is None:
+        table = parse_csv(path, schema)
+        if cache_file is not None:
+            cache_file.parent.mkdir(exist_ok=True)
+            for stale in cache_file.parent.glob(f"{path.stem}-*.npz"):
+                stale.unlink()
+            np.savez(cache_file, __order__=np.array(list(table.columns), dtype=str),
+                     **{f"c_{k}": v for k, v in table.columns.items()})
+
+    _memo[memo_key] = ((stat.st_mtime_ns, stat.st_size), table)
+    return table
+
+
+class GroupStats:
+    """
+    Estadísticos por grupo, calculados en pasadas vectorizadas.
+
+    keys: lista de tuplas (una por grupo, en orden de primera aparición).
+    n, median, q1, q3, p99: arrays alineados con keys. q1/q3 son la mediana de la
+    mitad inferior/superior de los valores ordenados (mismo criterio que el
+    median_iqr original de analyze.py).
+    """
+
+    def __init__(self, keys, sorted_values, starts, counts):
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+        self._values = sorted_values
+        self._starts = starts
+        self.n = counts
+        self.median = self._segment_median(starts, counts)
+        half = counts // 2
+        self.q1 = np.where(counts > 1, self._segment_median(starts, half), self.median)
+        self.q3 = np.where(counts > 1, self._segment_median(starts + counts - half, half),
+                           self.median)
+        self.p99 = self.percentile(99) if len(counts) else np.zeros(0)
+
+    def _segment_median(self, starts, counts):
+        v = self._values
+        if len(v) == 0:
+            return np.zeros(len(starts))
+        safe = np.maximum(counts, 1)
+        lo = np.minimum(starts + (safe - 1) // 2, len(v) - 1)
+        hi = np.minimum(starts + safe // 2, len(v) - 1)
+        return np.where(counts > 0, (v[lo] + v[hi]) / 2, 0.0)
+
+    def percentile(self, p):
+        """Percentil p (0-100) de cada grupo, interpolación lineal."""
+        pos = (p / 100.0) * (self.n - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        v = self._values
+        a = v[self._starts + lo]
+        b = v[self._starts + hi]
+        return a + (b - a) * (pos - lo)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, key, default=None):
+        """Estadísticos de un grupo como dict (o default si no existe)."""
+        i = self.index.get(key)
+        if i is None:
+            return default
+        return {"n": int(self.n[i]), "median": float(self.median[i]),
+                "q1": float(self.q1[i]), "q3": float(self.q3[i]), "p99": float(self.p99[i])}
+
+    def values(self, key):
+        """Valores ordenados de un grupo."""
+        i = self.index[key]
+        return self._values[self._starts[i]:self._starts[i] + self.n[i]]
+
+    def overhead(self, baseline="bare", level=0):
+        """
+        Overhead % de la mediana de cada grupo contra el grupo que tiene
+        `baseline` en la posición `level` de la llave y el resto igual.
+        Retorna {key: pct}; grupos sin baseline se omiten.
+        """
+        out = {}
+        for key, i in self.index.items():
+            base_key = key[:level] + (baseline,) + key[level + 1:]
+            j = self.index.get(base_key)
+            if j is None or key == base_key or self.median[j] == 0:
+                continue
+            out[key] = float((self.median[i] - self.median[j]) / self.median[j] * 100)
+        return out
+
+
+def group_stats(table, by, value):
+    """
+    Agrupa `value` por las columnas `by` y calcula estadísticos de todos los
+    grupos. Filas con valor NaN se descartan (como las filas inválidas que
+    antes se saltaban con try/except).
+    """
+    if not table or value not in table:
+        return GroupStats([], np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    values = table[value]
+    mask = ~np.isnan(values)
+    values = values[mask]
+    key_cols = [table[c][mask] for c in by]
+
+    # Código entero por grupo, en orden de primera aparición
+    codes = np.zeros(len(values), dtype=np.int64)
+    for col in key_cols:
+        uniq, first, inverse = np.unique(col, return_index=True, return_inverse=True)
+        rank = np.empty(len(uniq), dtype=np.int64)
+        rank[np.argsort(first)] = np.arange(len(uniq))
+        codes = codes * len(uniq) + rank[inverse]
+    group_ids, first_idx, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    appearance = np.argsort(first_idx)
+    remap = np.empty(len(group_ids), dtype=np.int64)
+    remap[appearance] = np.arange(len(group_ids))
+    gid = remap[inverse]
+
+    order = np.lexsort((values, gid))
+    sorted_values = values[order]
+    counts = np.bincount(gid, minlength=len(group_ids))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+    first_rows = first_idx[appearance]
+    keys = [tuple(_plain(col[r]) for col in key_cols) for r in first_rows]
+    return GroupStats(keys, sorted_values, starts, counts)
+
+
+def _plain(value):
+    """np.str_/np.float64 -> str/float para usar como llave de dict."""
+    return value.item() if hasattr(value, "item") else value
@@ -9,6 +9,7 @@ const markdownItAttrs = require("markdown-it-attrs");
 const markdownItAnchor = require("markdown-it-anchor");
 const fs = require("fs");
 const path = require("path");
+const { execFileSync } = require("child_process");
 
 module.exports = function(eleventyConfig) {
 
@@ -23,11 +24,21 @@ module.exports = function(eleventyConfig) {
     typographer: true
   };
 
+  // Accent-folded heading anchors ("Configuración" -> "configuracion").
+  // Must match slugify() in scripts/extract_metadata.py, which precomputes
+  // each page's heading tree (TOC) with these same anchors.
+  const slugify = s => s
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, '-')
+    .replace(/^-+|-+$/g, '');
+
   const md = markdownIt(mdOptions)
     .use(markdownItAttrs)
     .use(markdownItAnchor, {
       permalink: markdownItAnchor.permalink.headerLink(),
-      slugify: s => s.toLowerCase().replace(/[^\w]+/g, '-')
+      slugify
     });
 
   // Custom container for :::homework, :::exercise, etc.
@@ -57,6 +68,58 @@ module.exports = function(eleventyConfig) {
     });
   });
 
+  // Responsive images: ![alt](./images/x.png) becomes a <picture> with the
+  // AVIF/WebP srcsets listed in image_manifest.json (scripts/process_images.py),
+  // plus intrinsic width/height and lazy loading. Images without variants
+  // (or when the manifest is missing) render as plain <img>.
+  let imageManifest = null;
+  const loadImageManifest = () => {
+    if (imageManifest === null) {
+      try {
+        imageManifest = JSON.parse(fs.readFileSync(path.join(__dirname, '_data', 'image_manifest.json'), 'utf-8'));
+      } catch (err) {
+        imageManifest = {};
+      }
+    }
+    return imageManifest;
+  };
+
+  // Manifest key (path relative to clase/) of an image src on the page being rendered
+  const manifestEntry = (src, env) => {
+    const inputPath = env && env.page && env.page.inputPath;
+    if (!src || !inputPath || /^([a-z]+:|\/|\{)/i.test(src)) return null;
+    const pageDir = path.posix.dirname(path.relative("clase", inputPath).split(path.sep).join('/'));
+    const key = path.posix.normalize(path.posix.join(pageDir, decodeURI(src)));
+    return loadImageManifest()[key] || null;
+  };
+
+  const defaultImage = md.renderer.rules.image;
+  md.renderer.rules.image = function(tokens, idx, options, env, self) {
+    const token = tokens[idx];
+    const entry = manifestEntry(token.attrGet('src'), env);
+    if (!entry || !entry.variants.length) {
+      return defaultImage(tokens, idx, options, env, self);
+    }
+
+    token.attrSet('width', String(entry.width));
+    token.attrSet('height', String(entry.height));
+    token.attrSet('loading', 'lazy');
+    token.attrSet('decoding', 'async');
+
+    const prefix = pathPrefix.replace(/\/$/, '');
+    const sources = ['avif', 'webp'].map(format => {
+      const srcset = entry.variants
+        .filter(variant => variant.format === format)
+        .map(variant => `${prefix}${variant.url} ${variant.width}w`)
+        .join(', ');
+      return srcset
+        ? `<source type="image/${format}" srcset="${srcset}" sizes="(max-width: 768px) 100vw, 768px">`
+        : '';
+    }).join('');
+
+    return `<picture>${sources}${defaultImage(tokens, idx, options, env, self)}</picture>`;
+  };
+
   eleventyConfig.setLibrary("md", md);
 
   // ============================================
@@ -214,6 +277,39 @@ module.exports = function(eleventyConfig) {
   // Add docs directory to watch targets for hot reload
   eleventyConfig.addWatchTarget("../uu_framework/docs/");
 
+  // docsContent.js only loads the pre-parsed docs_bundle.json, so refresh it
+  // before every build (and every --serve rebuild). Unchanged docs come from
+  // the docs_bundle.py cache; if Python is unavailable the last bundle is used.
+  eleventyConfig.on("eleventy.before", () => {
+    try {
+      execFileSync("python3", [
+        path.join(__dirname, "..", "scripts", "docs_bundle.py"),
+        "--quiet",
+        "--docs", path.join(__dirname, "..", "docs"),
+        "--output", path.join(__dirname, "_data", "docs_bundle.json")
+      ], { stdio: "inherit" });
+    } catch (err) {
+      console.warn(`[docs] Could not refresh docs_bundle.json (${err.message}); using the existing bundle`);
+    }
+  });
+
+  // The <picture> sources point at /img/ derivatives, which builds publish
+  // after Eleventy (process_images.py --publish). Browsers do not fall back to
+  // the <img> when a <source> 404s, so --serve/--watch publish them too.
+  eleventyConfig.on("eleventy.after", ({ dir, runMode }) => {
+    if (runMode === "build") return;
+    try {
+      execFileSync("python3", [
+        path.join(__dirname, "..", "scripts", "process_images.py"),
+        "--publish", path.resolve(dir.output),
+        "--config", path.join(__dirname, "..", "config", "site.yaml"),
+        "--manifest", path.join(__dirname, "_data", "image_manifest.json")
+      ], { stdio: "inherit", cwd: path.join(__dirname, "..", "..") });
+    } catch (err) {
+      console.warn(`[images] Could not publish image derivatives (${err.message})`);
+    }
+  });
+
   // ============================================
   // Shortcodes
   // ============================================
@@ -102,6 +102,45 @@ function getNavTitle(item, metadata) {
 }
 
 module.exports = {
+  // Precomputed by extract_metadata.py: table of contents (h2/h3, with the
+  // same anchors markdown-it-anchor renders), word count and reading time
+  pageOutline: function(data) {
+    const metadata = data.metadata || {};
+    const relativePath = data.page?.inputPath?.replace('./clase/', '');
+    const meta = relativePath && metadata[relativePath];
+    if (!meta || !meta.headings) return null;
+
+    const toc = [];
+    const walk = headings => headings.forEach(h => {
+      if (h.level === 2 || h.level === 3) {
+        toc.push({ level: h.level, text: h.text, slug: h.slug });
+      }
+      walk(h.children);
+    });
+    walk(meta.headings);
+
+    return {
+      toc,
+      wordCount: meta.word_count,
+      readingTime: meta.reading_time,
+      codeBlocks: meta.code_blocks
+    };
+  },
+
+  // Git history of the page (created/last-updated dates, authors) from metadata.json
+  pageHistory: function(data) {
+    const metadata = data.metadata || {};
+    const relativePath = data.page?.inputPath?.replace('./clase/', '');
+    const meta = relativePath && metadata[relativePath];
+    if (!meta || !meta.last_updated) return null;
+
+    return {
+      created: meta.created.slice(0, 10),
+      updated: meta.last_updated.slice(0, 10),
+      authors: meta.authors || []
+    };
+  },
+
   // Compute previous page
   prevPage: function(data) {
     const collections = data.collections;
@@ -11,6 +11,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+from records import FileMetadata, Task, TaskType, intern
+
 
 def get_chapter_name(file_path: str) -> str:
     """Extract chapter name from file path."""
@@ -39,91 +41,89 @@ def is_overdue(due_date: str) -> bool:
 
 def aggregate_all_tasks(
     content_dir: Path,
-    metadata: Dict[str, Any],
-    verbose: bool = False
-) -> Dict[str, List[Dict[str, Any]]]:
+    metadata: Dict[str, FileMetadata],
+    verbose: bool = False,
+    index: Any = None
+) -> Dict[str, List[Task]]:
     """
     Aggregate all tasks from metadata.
 
+    Pass a query.ContentIndex built over the same metadata to reuse its
+    component index instead of scanning every page.
+
     Returns:
         Dict with keys: 'homework', 'exams', 'projects'
-        Each contains list of task dicts
+        Each contains list of Task records (records.tasks_to_dict gives
+        the tasks.json shape)
     """
+    from query import ContentIndex
+
     tasks = {
         'homework': [],
         'exams': [],
         'projects': [],
     }
 
-    for file_path, file_meta in metadata.items():
-        components = file_meta.get('components', [])
-        chapter = get_chapter_name(file_path)
-
-        for comp in components:
-            comp_type = comp.get('type')
-            attrs = comp.get('attrs', {})
+    index = index or ContentIndex(metadata)
+    for comp_type in ('homework', 'exam', 'project'):
+        for file_path, comp in index.components(comp_type):
+            chapter = intern(get_chapter_name(file_path))
+            attrs = comp.attrs
+            common = {
+                'id': attrs.get('id', ''),
+                'chapter': chapter,
+                'file': file_path,
+                'url': '/' + file_path.replace('.md', '/'),
+                'summary': comp.content_preview[:100],
+                'points': attrs.get('points'),
+            }
 
             if comp_type == 'homework':
-                task = {
-                    'id': attrs.get('id', ''),
-                    'title': attrs.get('title', 'Tarea'),
-                    'due': attrs.get('due'),
-                    'points': attrs.get('points'),
-                    'chapter': chapter,
-                    'file': file_path,
-                    'url': '/' + file_path.replace('.md', '/'),
-                    'summary': comp.get('content_preview', '')[:100],
-                    'overdue': is_overdue(attrs.get('due')),
-                    'type': 'homework',
-                }
+                task = Task(
+                    type=TaskType.HOMEWORK,
+                    title=attrs.get('title', 'Tarea'),
+                    due=attrs.get('due'),
+                    overdue=is_overdue(attrs.get('due')),
+                    **common,
+                )
                 tasks['homework'].append(task)
 
                 if verbose:
-                    print(f"      Found homework: {task['title']} in {chapter}")
+                    print(f"      Found homework: {task.title} in {chapter}")
 
             elif comp_type == 'exam':
-                task = {
-                    'id': attrs.get('id', ''),
-                    'title': attrs.get('title', 'Examen'),
-                    'date': attrs.get('date'),
-                    'location': attrs.get('location'),
-                    'duration': attrs.get('duration'),
-                    'points': attrs.get('points'),
-                    'chapter': chapter,
-                    'file': file_path,
-                    'url': '/' + file_path.replace('.md', '/'),
-                    'summary': comp.get('content_preview', '')[:100],
-                    'overdue': is_overdue(attrs.get('date')),
-                    'type': 'exam',
-                }
+                task = Task(
+                    type=TaskType.EXAM,
+                    title=attrs.get('title', 'Examen'),
+                    date=attrs.get('date'),
+                    location=attrs.get('location'),
+                    duration=attrs.get('duration'),
+                    overdue=is_overdue(attrs.get('date')),
+                    **common,
+                )
                 tasks['exams'].append(task)
 
                 if verbose:
-                    print(f"      Found exam: {task['title']} in {chapter}")
+                    print(f"      Found exam: {task.title} in {chapter}")
 
             elif comp_type == 'project':
-                task = {
-                    'id': attrs.get('id', ''),
-                    'title': attrs.get('title', 'Proyecto'),
-                    'due': attrs.get('due'),
-                    'points': attrs.get('points'),
-                    'team_size': attrs.get('team_size'),
-                    'chapter': chapter,
-                    'file': file_path,
-                    'url': '/' + file_path.replace('.md', '/'),
-                    'summary': comp.get('content_preview', '')[:100],
-                    'overdue': is_overdue(attrs.get('due')),
-                    'type': 'project',
-                }
+                task = Task(
+                    type=TaskType.PROJECT,
+                    title=attrs.get('title', 'Proyecto'),
+                    due=attrs.get('due'),
+                    team_size=attrs.get('team_size'),
+                    overdue=is_overdue(attrs.get('due')),
+                    **common,
+                )
                 tasks['projects'].append(task)
 
                 if verbose:
-                    print(f"      Found project: {task['title']} in {chapter}")
+                    print(f"      Found project: {task.title} in {chapter}")
 
     # Sort by file path (follows section numbering convention)
     # e.g., a_stack/02_llms/... comes before a_stack/03_os_setup/...
     def sort_key(task):
-        return task.get('file', '')
+        return task.file
 
     tasks['homework'].sort(key=sort_key)
     tasks['exams'].sort(key=sort_key)
@@ -133,8 +133,8 @@ def aggregate_all_tasks(
 
 
 def aggregate_by_chapter(
-    tasks: Dict[str, List[Dict[str, Any]]]
-) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    tasks: Dict[str, List[Task]]
+) -> Dict[str, Dict[str, List[Task]]]:
     """
     Reorganize tasks by chapter.
 
@@ -145,7 +145,7 @@ def aggregate_by_chapter(
 
     for task_type, task_list in tasks.items():
         for task in task_list:
-            chapter = task.get('chapter', 'General')
+            chapter = task.chapter or 'General'
 
             if chapter not in by_chapter:
                 by_chapter[chapter] = {
@@ -181,5 +181,9 @@ if __name__ == '__main__':
         }
     }
 
-    tasks = aggregate_all_tasks(Path('clase'), sample_metadata, verbose=True)
-    print(json.dumps(tasks, indent=2, ensure_ascii=False))
+    from records import tasks_to_dict
+
+    metadata = {path: FileMetadata.from_dict({'path': path, **meta})
+                for path, meta in sample_metadata.items()}
+    tasks = aggregate_all_tasks(Path('clase'), metadata, verbose=True)
+    print(json.dumps(tasks_to_dict(tasks), indent=2, ensure_ascii=False))
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Asset Reachability Script
+
+Builds a reference graph from every page (markdown, Nunjucks templates,
+layouts/components and the landing page) to the static assets it uses,
+then publishes only reachable assets and reports orphans with their sizes.
+
+Publishable assets follow the deploy conventions: everything inside */images/
+directories, all PDFs and root favicon files (b_libros is never published).
+
+build_site_graph gives the same page -> asset edges for the built site (what
+a browser downloads for each HTML page, responsive <picture> sources
+included); page_weight.py measures page budgets from it.
+
+Usage:
+    python3 asset_graph.py [CONTENT_DIR]           # Report orphans
+    python3 asset_graph.py --publish _site         # Copy reachable assets, prune the rest
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+from pathlib import Path
+from html.parser import HTMLParser
+from urllib.parse import unquote
+from typing import Dict, List, Any, Optional, Tuple
+
+
+PAGE_SUFFIXES = ('.md', '.njk', '.html')
+ROOT_ASSETS = ('favicon.ico', 'apple-touch-icon.png')
+NEVER_PUBLISH = ('b_libros',)
+
+# Fenced code blocks, inline code and template comments: paths there are
+# examples, not references
+CODE_BLOCK_RE = re.compile(r'^(```|~~~).*?^\1', re.MULTILINE | re.DOTALL)
+INLINE_CODE_RE = re.compile(r'`[^`\n]+`')
+TEMPLATE_COMMENT_RE = re.compile(r'\{#.*?#\}', re.DOTALL)
+
+REFERENCE_PATTERNS = [
+    # Markdown images/links: ![alt](path) / [text](path "title") / [text](<path with spaces>)
+    re.compile(r'\]\(\s*<([^>]+)>'),
+    re.compile(r'\]\(\s*([^)\s{]+)'),
+    # HTML attributes: src="...", href="...", data="..."
+    re.compile(r'\b(?:src|href|data|poster)\s*=\s*["\']([^"\'{]+)["\']'),
+    # Nunjucks url filter: {{ '/images/x.png' | url }}
+    re.compile(r'\{\{\s*["\']([^"\']+)["\']\s*\|\s*url\s*\}\}'),
+    # pdf.njk macro: {{ pdf('/path/file.pdf', 'Title') }} or {% pdf "path" %}
+    re.compile(r'\bpdf\(\s*["\']([^"\']+)["\']'),
+    re.compile(r'\{%\s*pdf\s+["\']([^"\']+)["\']'),
+    # code-file.njk: file objects declared inline with a url/path key
+    re.compile(r'\b(?:url|path)\s*:\s*["\']([^"\']+\.\w+)["\']'),
+]
+
+# srcset="a-480w.webp 480w, a-960w.webp 960w": every candidate is a reference
+SRCSET_RE = re.compile(r'\bsrcset\s*=\s*["\']([^"\'{]+)["\']')
+
+EXTERNAL_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', re.IGNORECASE)
+
+
+def strip_code(text: str) -> str:
+    """Remove code and comments so example paths are not treated as references."""
+    text = CODE_BLOCK_RE.sub('', text)
+    text = TEMPLATE_COMMENT_RE.sub('', text)
+    return INLINE_CODE_RE.sub('', text)
+
+
+def srcset_candidates(srcset: str) -> List[Tuple[str, float]]:
+    """(url, width or pixel density) of each candidate in a srcset attribute."""
+    candidates = []
+    for candidate in srcset.split(','):
+        parts = candidate.split()
+        if not parts:
+            continue
+        descriptor = parts[1] if len(parts) > 1 else '1x'
+        try:
+            size = float(descriptor[:-1])
+        except ValueError:
+            size = 1.0
+        candidates.append((parts[0], size))
+    return candidates
+
+
+def extract_references(text: str) -> List[str]:
+    """Extract raw local references (paths/URLs) from page source."""
+    text = strip_code(text)
+    refs = []
+    for pattern in REFERENCE_PATTERNS:
+        for match in pattern.finditer(text):
+            refs.append(match.group(1).strip())
+    for match in SRCSET_RE.finditer(text):
+        refs.extend(url for url, _ in srcset_candidates(match.group(1)))
+    return [ref for ref in refs if ref and not EXTERNAL_RE.match(ref)]
+
+
+def resolve_reference(ref: str, page_dir: Path, content_dir: Path) -> Optional[str]:
+    """
+    Resolve a reference to a content-relative path.
+
+    Absolute references (/images/x.png) are relative to the site root, which is
+    the content directory. Relative references are relative to the page's
+    directory. Returns None when the reference points outside the content tree.
+    """
+    ref = unquote(ref.split('#', 1)[0].split('?', 1)[0])
+    if not ref:
+        return None
+
+    if ref.startswith('/'):
+        target = content_dir / ref.lstrip('/')
+    else:
+        target = page_dir / ref
+
+    target = Path(os.path.normpath(target))
+    try:
+        return str(target.relative_to(content_dir))
+    except ValueError:
+        return None
+
+
+def is_publishable(rel_path: str) -> bool:
+    """Whether a content file is a publishable static asset (deploy conventions)."""
+    if any(part in NEVER_PUBLISH for part in Path(rel_path).parts):
+        return False
+    path = Path(rel_path)
+    if 'images' in path.parent.parts:
+        return True
+    if path.suffix.lower() == '.pdf':
+        return True
+    return str(path) in ROOT_ASSETS
+
+
+def find_assets(content_dir: Path) -> Dict[str, int]:
+    """Find all publishable assets in the content directory, with sizes in bytes."""
+    assets = {}
+    for path in Path(content_dir).rglob('*'):
+        if not path.is_file():
+            continue
+        rel_path = str(path.relative_to(content_dir))
+        if is_publishable(rel_path):
+            assets[rel_path] = path.stat().st_size
+    return assets
+
+
+def find_pages(content_dir: Path, templates_dir: Optional[Path]) -> List[Path]:
+    """Find all source pages that can reference assets."""
+    pages = [
+        p for p in Path(content_dir).rglob('*')
+        if p.suffix in PAGE_SUFFIXES and p.is_file()
+        and 'images' not in p.relative_to(content_dir).parent.parts
+        and not any(part in NEVER_PUBLISH for part in p.parts)
+    ]
+    if templates_dir and Path(templates_dir).exists():
+        pages.extend(p for p in Path(templates_dir).rglob('*.njk') if p.is_file())
+    return sorted(pages)
+
+
+def build_asset_graph(
+    content_dir: Path,
+    templates_dir: Optional[Path] = None,
+    landing_page: Optional[Path] = None,
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    Build the page -> asset reference graph.
+
+    Templates (layouts and components) are resolved against the site root,
+    since their relative paths depend on the page being rendered. The landing
+    page (root README.md) is resolved relative to its own directory.
+
+    Returns:
+        {
+            'pages': {page: [asset, ...]},
+            'assets': {asset: {'size': 1234, 'referenced_by': [page, ...]}},
+            'reachable': [asset, ...],
+            'orphans': [{'path': asset, 'size': 1234}, ...],   # largest first
+            'missing': [{'page': page, 'ref': asset}, ...],
+        }
+    """
+    content_path = Path(content_dir).resolve()
+    if not content_path.exists():
+        print(f"      Warning: Content directory {content_dir} does not exist")
+        return {'pages': {}, 'assets': {}, 'reachable': [], 'orphans': [], 'missing': []}
+
+    assets = find_assets(content_path)
+    pages = find_pages(content_path, Path(templates_dir).resolve() if templates_dir else None)
+    landing_path = None
+    if landing_page and Path(landing_page).exists():
+        landing_path = Path(landing_page).resolve()
+        pages.append(landing_path)
+
+    graph = {}
+    referenced_by = {}
+    missing = []
+
+    for page in pages:
+        try:
+            text = page.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            if verbose:
+                print(f"      Warning: Could not read {page}: {e}")
+            continue
+
+        if page.is_relative_to(content_path):
+            page_key = str(page.relative_to(content_path))
+            page_dir = page.parent
+        elif page == landing_path:
+            page_key = str(landing_page)
+            page_dir = page.parent
+        else:
+            # Templates render at arbitrary URLs: only site-root references resolve
+            page_key = os.path.relpath(page)
+            page_dir = content_path
+
+        page_assets = []
+        for ref in extract_references(text):
+            rel_path = resolve_reference(ref, page_dir, content_path)
+            if rel_path is None or Path(rel_path).suffix in PAGE_SUFFIXES:
+                continue
+            if rel_path in assets:
+                if rel_path not in page_assets:
+                    page_assets.append(rel_path)
+                    referenced_by.setdefault(rel_path, []).append(page_key)
+            elif is_publishable(rel_path) and not (content_path / rel_path).is_dir():
+                missing.append({'page': page_key, 'ref': rel_path})
+
+        if page_assets:
+            graph[page_key] = page_assets
+            if verbose:
+                print(f"      {page_key}: {len(page_assets)} assets")
+
+    reachable = sorted(referenced_by)
+    orphans = sorted(
+        ({'path': path, 'size': size} for path, size in assets.items()
+         if path not in referenced_by),
+        key=lambda o: (-o['size'], o['path'])
+    )
+
+    return {
+        'pages': graph,
+        'assets': {
+            path: {'size': size, 'referenced_by': referenced_by.get(path, [])}
+            for path, size in sorted(assets.items())
+        },
+        'reachable': reachable,
+        'orphans': orphans,
+        'missing': missing,
+    }
+
+
+class EmbeddedRefParser(HTMLParser):
+    """
+    Collect the resources a browser downloads for a built page: src of img,
+    iframe, embed, script and media, object data, stylesheets and icons.
+
+    A srcset counts once, by its widest candidate. Inside <picture> the first
+    <source> is what a browser that supports its type (AVIF first) fetches, so
+    the <img> fallback is not counted.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.refs = []
+        self._picture = None      # None outside <picture>; True once a <source> was taken
+
+    def _widest(self, srcset: str) -> None:
+        candidates = srcset_candidates(srcset)
+        if candidates:
+            self.refs.append(max(candidates, key=lambda c: c[1])[0])
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'picture':
+            self._picture = False
+        elif tag == 'source':
+            if self._picture is False and attrs.get('srcset'):
+                self._widest(attrs['srcset'])
+                self._picture = True
+        elif tag == 'img':
+            if self._picture:
+                return
+            if attrs.get('srcset'):
+                self._widest(attrs['srcset'])
+            elif attrs.get('src'):
+                self.refs.append(attrs['src'])
+        elif tag in ('iframe', 'embed', 'script', 'audio', 'video') and attrs.get('src'):
+            self.refs.append(attrs['src'])
+        elif tag == 'object' and attrs.get('data'):
+            self.refs.append(attrs['data'])
+        elif tag == 'link' and attrs.get('href'):
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'stylesheet' in rel or 'icon' in rel or 'apple-touch-icon' in rel:
+                self.refs.append(attrs['href'])
+
+    def handle_endtag(self, tag):
+        if tag == 'picture':
+            self._picture = None
+
+
+def resolve_site_path(ref: str, page_dir: Path, site_dir: Path, path_prefix: str) -> Optional[Path]:
+    """
+    Map a URL from built HTML to a file in the site directory.
+
+    Absolute URLs carry the deploy path prefix (/repo_name/...), which is
+    stripped. Returns None for external URLs or files outside the site.
+    """
+    ref = unquote(ref.split('#', 1)[0].split('?', 1)[0])
+    if not ref or '://' in ref or ref.startswith(('//', 'data:', 'mailto:', 'javascript:')):
+        return None
+
+    if ref.startswith('/'):
+        prefix = path_prefix.rstrip('/')
+        if prefix and (ref == prefix or ref.startswith(prefix + '/')):
+            ref = ref[len(prefix):]
+        target = site_dir / ref.lstrip('/')
+    else:
+        target = page_dir / ref
+
+    target = Path(os.path.normpath(target))
+    if target.is_dir():
+        target = target / 'index.html'
+    if not target.is_file() or not target.is_relative_to(site_dir):
+        return None
+    return target
+
+
+def build_site_graph(site_dir: Path, path_prefix: str = '') -> Dict[str, List[str]]:
+    """
+    Build the page -> embedded asset graph for every HTML page of a built site.
+
+    Returns:
+        Dict mapping site-relative page paths to site-relative asset paths
+    """
+    site_path = Path(site_dir).resolve()
+    graph = {}
+
+    for page in sorted(site_path.rglob('*.html')):
+        parser = EmbeddedRefParser()
+        try:
+            parser.feed(page.read_text(encoding='utf-8', errors='replace'))
+        except Exception as e:
+            print(f"      Warning: Could not parse {page}: {e}")
+            continue
+
+        assets = []
+        for ref in parser.refs:
+            target = resolve_site_path(ref, page.parent, site_path, path_prefix)
+            if target is None:
+                continue
+            rel_target = str(target.relative_to(site_path))
+            if rel_target not in assets:
+                assets.append(rel_target)
+
+        graph[str(page.relative_to(site_path))] = assets
+
+    return graph
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for humans."""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_orphan_report(graph: Dict[str, Any]) -> None:
+    """Print orphaned assets with their sizes (largest first)."""
+    orphans = graph['orphans']
+    reachable_size = sum(graph['assets'][p]['size'] for p in graph['reachable'])
+    orphan_size = sum(o['size'] for o in orphans)
+
+    print(f"      Reachable: {len(graph['reachable'])} assets ({format_size(reachable_size)})")
+    print(f"      Orphans:   {len(orphans)} assets ({format_size(orphan_size)})")
+    for orphan in orphans:
+        print(f"        {format_size(orphan['size']):>10s}  {orphan['path']}")
+
+    if graph['missing']:
+        print(f"      Broken references: {len(graph['missing'])}")
+        for item in graph['missing']:
+            print(f"        {item['page']} -> {item['ref']}")
+
+
+def publish_assets(
+    graph: Dict[str, Any],
+    content_dir: Path,
+    site_dir: Path,
+    verbose: bool = False
+) -> Dict[str, int]:
+    """
+    Copy reachable assets into the site and remove orphans already there
+    (e.g. copied by Eleventy passthrough).
+
+    Returns counts: {'copied': n, 'unchanged': n, 'pruned': n}
+    """
+    content_path = Path(content_dir)
+    site_path = Path(site_dir)
+    counts = {'copied': 0, 'unchanged': 0, 'pruned': 0}
+
+    for rel_path in graph['reachable']:
+        source = content_path / rel_path
+        target = site_path / rel_path
+        if target.exists():
+            src_stat, dst_stat = source.stat(), target.stat()
+            if src_stat.st_size == dst_stat.st_size and src_stat.st_mtime <= dst_stat.st_mtime:
+                counts['unchanged'] += 1
+                continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+        counts['copied'] += 1
+        if verbose:
+            print(f"      Copied: {rel_path}")
+
+    for orphan in graph['orphans']:
+        target = site_path / orphan['path']
+        if target.is_file():
+            target.unlink()
+            counts['pruned'] += 1
+            if verbose:
+                print(f"      Pruned: {orphan['path']}")
+
+    return counts
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Asset reachability analysis')
+    parser.add_argument('content', type=Path, nargs='?', default=Path('clase'),
+                        help='Path to content directory')
+    parser.add_argument('--templates', type=Path,
+                        default=Path('uu_framework/eleventy/_includes'),
+                        help='Path to layouts/components')
+    parser.add_argument('--landing', type=Path, default=Path('README.md'),
+                        help='Landing page source (root README.md)')
+    parser.add_argument('--output', type=Path,
+                        help='Write the reference graph as JSON to this path')
+    parser.add_argument('--publish', type=Path, metavar='SITE_DIR',
+                        help='Copy reachable assets into SITE_DIR and prune orphans')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Enable verbose output')
+    args = parser.parse_args()
+
+    print("Building asset reference graph...")
+    graph = build_asset_graph(args.content, args.templates, args.landing, args.verbose)
+    print_orphan_report(graph)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(graph, f, indent=2, ensure_ascii=False)
+        print(f"      Saved asset graph to {args.output}")
+
+    if args.publish:
+        counts = publish_assets(graph, args.content, args.publish, args.verbose)
+        print(f"      Published to {args.publish}: {counts['copied']} copied, "
+              f"{counts['unchanged']} unchanged, {counts['pruned']} orphans pruned")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
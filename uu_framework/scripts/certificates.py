@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Certificate Ingestion Script
+
+Reads the certificate PDFs students submit in estudiantes/*/certificaciones/
+(homework 6.1 and 6.3) and extracts the text layer, student name, course
+title, completion date and credential number of each DataCamp certificate.
+
+Extraction runs in a process pool and results are cached by git blob hash,
+so re-verifying the class only parses newly added PDFs. One JSON record is
+written per student directory, flagging certificates that are missing (no
+parsed PDF for a task, or no certificates folder at all) or unparseable (e.g.
+image-only PDFs with no text layer).
+
+Requires pypdf (pip install pypdf).
+
+Usage:
+    python3 certificates.py                              # Report + records
+    python3 certificates.py --output certificados/       # Records directory
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+from roster import STUDENTS_DIR, load_task_paths, compile_task_paths
+from similarity import list_files
+
+
+# Certificate course titles -> homework IDs
+COURSE_TASKS = {
+    'introduction to github concepts': '6.1',
+    'intermediate github concepts': '6.3',
+}
+
+MONTHS = {m: i for i, m in enumerate(
+    ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'], 1)}
+
+CACHE_VERSION = 1
+
+
+def _spaced(label: str) -> str:
+    """Regex for a label printed with letter spacing ('H A S  B E E N')."""
+    return r'\s*'.join(re.escape(c) for c in label.replace(' ', ''))
+
+
+CERTIFICATE_RE = re.compile(
+    r'(?:#(?P<credential>[\d,]+)\s*)?'
+    + _spaced('HAS BEEN AWARDED TO') + r'\s*(?P<name>.+?)\s*'
+    + _spaced('FOR SUCCESSFULLY COMPLETING') + r'\s*(?P<course>.+?)\s*'
+    + r'(?:' + _spaced('LENGTH') + r'.*?)?'
+    + _spaced('COMPLETED ON') + r'\s*(?P<month>[A-Z]{3})\w*\s+(?P<day>\d{1,2}),?\s+(?P<year>\d{4})',
+    re.DOTALL
+)
+
+# Text layers split accented letters out of words ('Juli á n')
+SPLIT_ACCENT_RE = re.compile(r'(?<=\w) ([^\x00-\x7f]) (?=\w)')
+
+
+def extract_text(pdf_path: str) -> Dict[str, Any]:
+    """Extract the text layer of a PDF (runs in a worker process)."""
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(pdf_path)
+        text = '\n'.join((page.extract_text() or '') for page in reader.pages)
+        return {'pages': len(reader.pages), 'text': text}
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+
+def parse_certificate(text: str) -> Optional[Dict[str, Any]]:
+    """Parse a DataCamp certificate's text layer. Returns None when it does not match."""
+    match = CERTIFICATE_RE.search(text)
+    if not match or match.group('month').upper() not in MONTHS:
+        return None
+
+    name = SPLIT_ACCENT_RE.sub(r'\1', ' '.join(match.group('name').split()))
+    course = ' '.join(match.group('course').split())
+    completed = '{}-{:02d}-{:02d}'.format(
+        match.group('year'), MONTHS[match.group('month').upper()], int(match.group('day')))
+
+    return {
+        'name': name,
+        'course': course,
+        'task': COURSE_TASKS.get(course.lower()),
+        'completed': completed,
+        'credential_id': (match.group('credential') or '').replace(',', '') or None,
+    }
+
+
+def load_cache(cache_path: Path) -> Dict[str, Any]:
+    """Load extracted certificates keyed by blob hash."""
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                return cache
+        except (OSError, ValueError):
+            pass
+    return {'version': CACHE_VERSION, 'blobs': {}}
+
+
+def ingest_certificates(
+    files: Dict[str, str],
+    cache: Dict[str, Any],
+    workers: Optional[int] = None,
+    verbose: bool = False
+) -> int:
+    """
+    Extract and parse every certificate PDF whose blob is not cached.
+
+    Returns the number of PDFs parsed in this run.
+    """
+    blobs = cache['blobs']
+    jobs = {}
+    for path, sha in files.items():
+        if path.lower().endswith('.pdf') and sha not in blobs and sha not in jobs:
+            jobs[sha] = path
+
+    if not jobs:
+        return 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(extract_text, list(jobs.values()))
+        for (sha, path), result in zip(jobs.items(), results):
+            entry = {'pages': result.get('pages', 0)}
+            if 'error' in result:
+                entry['error'] = result['error']
+            elif not result['text'].strip():
+                entry['error'] = 'no text layer (scanned or image-only PDF)'
+            else:
+                entry['text'] = result['text']
+                entry['certificate'] = parse_certificate(result['text'])
+                if entry['certificate'] is None:
+                    entry['error'] = 'text does not look like a DataCamp certificate'
+            blobs[sha] = entry
+            if verbose:
+                print(f"      Parsed {path}: {entry.get('error') or entry['certificate']['course']}")
+
+    return len(jobs)
+
+
+def list_students(students_dir: Path) -> List[str]:
+    """Every student directory (estudiantes/*), certificates folder or not."""
+    if not students_dir.is_dir():
+        return []
+    return [p.name for p in students_dir.iterdir() if p.is_dir() and not p.name.startswith('.')]
+
+
+def new_record(student: str) -> Dict[str, Any]:
+    return {'student': student, 'certificates': [], 'unparseable': [],
+            'missing': [], 'other_evidence': {}}
+
+
+def build_records(
+    files: Dict[str, str],
+    cache: Dict[str, Any],
+    task_paths: Dict[str, List[str]],
+    students: Optional[List[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    One record per student in `students` (plus any student with a certificates
+    folder), so students who never created the folder are reported as missing
+    every certificate.
+
+    Returns:
+        {student: {
+            'student': ..., 'certificates': [{file, blob, name, course, task, completed, credential_id}],
+            'unparseable': [{file, blob, error}],
+            'missing': [task ids without a parsed certificate],
+            'other_evidence': {task: [non-PDF files, e.g. screenshots]},
+        }}
+    """
+    patterns = compile_task_paths({t: task_paths[t] for t in COURSE_TASKS.values() if t in task_paths})
+    records = {student: new_record(student) for student in students or []}
+
+    for path, sha in files.items():
+        parts = Path(path).parts
+        if len(parts) < 4 or not parts[2].lower().startswith('certifica'):
+            continue
+        student = parts[1]
+        record = records.setdefault(student, new_record(student))
+
+        if path.lower().endswith('.pdf'):
+            entry = cache['blobs'].get(sha, {})
+            if entry.get('certificate'):
+                record['certificates'].append({'file': path, 'blob': sha, **entry['certificate']})
+            else:
+                record['unparseable'].append({'file': path, 'blob': sha,
+                                              'error': entry.get('error', 'not processed')})
+        else:
+            rel_path = '/'.join(parts[2:])
+            for task_id, pattern in patterns.items():
+                if pattern.search(rel_path):
+                    record['other_evidence'].setdefault(task_id, []).append(path)
+
+    for record in records.values():
+        found = {c['task'] for c in record['certificates']}
+        record['missing'] = [t for t in sorted(set(COURSE_TASKS.values())) if t not in found]
+
+    return dict(sorted(records.items(), key=lambda r: r[0].lower()))
+
+
+def print_report(records: Dict[str, Dict[str, Any]]) -> None:
+    """Print one line per certificate and the flagged students."""
+    for student, record in records.items():
+        for cert in record['certificates']:
+            print(f"      {student:<22s} {cert['task'] or '?':>4s}  {cert['completed']}  "
+                  f"{cert['name']} - {cert['course']}")
+        for item in record['unparseable']:
+            print(f"      {student:<22s}  !!!  {Path(item['file']).name}: {item['error']}")
+
+    flagged = [r for r in records.values() if r['missing']]
+    print(f"\n      {sum(len(r['certificates']) for r in records.values())} certificates parsed, "
+          f"{sum(len(r['unparseable']) for r in records.values())} unparseable, "
+          f"{len(flagged)}/{len(records)} students missing a certificate PDF")
+    for record in flagged:
+        evidence = sum(len(record['other_evidence'].get(t, [])) for t in record['missing'])
+        note = f" ({evidence} other evidence files)" if evidence else ''
+        print(f"        {record['student']}: {', '.join(record['missing'])}{note}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Certificate PDF ingestion')
+    parser.add_argument('--students', type=Path, default=Path(STUDENTS_DIR),
+                        help='Path to students directory')
+    parser.add_argument('--config', type=Path,
+                        default=Path('uu_framework/config/site.yaml'),
+                        help='Path to site configuration (roster path heuristics)')
+    parser.add_argument('--cache', type=Path,
+                        default=Path('uu_framework/.cache/certificates.json'),
+                        help='Extraction cache keyed by blob hash')
+    parser.add_argument('--output', type=Path,
+                        default=Path('uu_framework/.cache/certificados'),
+                        help='Directory for the per-student JSON records')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of extraction processes (default: CPU count)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Enable verbose output')
+    args = parser.parse_args()
+
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        print("Error: pypdf not installed")
+        print("Install with: pip install pypdf")
+        return 1
+
+    files = list_files(args.students)
+    cache = load_cache(args.cache)
+
+    print("Ingesting certificates...")
+    parsed = ingest_certificates(files, cache, args.workers, args.verbose)
+    print(f"      {parsed} new PDFs parsed, "
+          f"{sum(1 for p in files if p.lower().endswith('.pdf')) - parsed} from cache")
+
+    args.cache.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.cache, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+    records = build_records(files, cache, load_task_paths(args.config),
+                            list_students(args.students))
+    print_report(records)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    for student, record in records.items():
+        with open(args.output / f'{student}.json', 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+    print(f"      Saved {len(records)} records to {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
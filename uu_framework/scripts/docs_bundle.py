@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Documentation Bundle
+
+Parses uu_framework/docs once, with the same frontmatter parser as course
+content (extract_metadata.parse_frontmatter), into docs_bundle.json: one
+entry per page with its permalink, title, frontmatter and body. The
+docsContent.js data file loads that bundle instead of re-reading every doc,
+and the docs hierarchy takes its titles from it.
+
+Parsed pages are cached by file size and mtime, so a rebuild only re-reads
+docs that changed.
+
+Usage:
+    python3 docs_bundle.py                 # Write the bundle and print a summary
+    python3 docs_bundle.py --rebuild       # Ignore the cache
+    python3 docs_bundle.py --quiet         # Summary only (Eleventy runs this before each build)
+
+    docs = build_docs_bundle(Path('uu_framework/docs'), load_cache(DEFAULT_CACHE))
+    docs[1]
+    # {'section': 'dev', 'filename': '00_index.md', 'slug': '',
+    #  'permalink': '/docs/dev/', 'title': 'Developer Guide', ...}
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from extract_metadata import parse_frontmatter
+
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE = Path('uu_framework/.cache/docs_bundle.json')
+
+# Sections rendered under /docs/, in bundle order
+DOCS_SECTIONS = ('dev', 'profesor', 'estudiante')
+
+SECTION_TITLES = {
+    'dev': 'Developer Guide',
+    'profesor': 'Guía del Profesor',
+    'estudiante': 'Guía del Estudiante',
+}
+
+ROOT_CONTENT = """# Documentación
+
+Guías y documentación del framework uu_framework.
+
+## Secciones
+
+| Sección | Idioma | Descripción |
+|---------|--------|-------------|
+| [Developer Guide](/docs/dev/) | English | Technical documentation for developers |
+| [Guía del Profesor](/docs/profesor/) | Español | Guía para crear contenido |
+| [Guía del Estudiante](/docs/estudiante/) | Español | Guía de uso del sitio |
+"""
+
+
+def root_entry() -> Dict[str, Any]:
+    """The /docs/ landing page, which has no source file."""
+    return {
+        'section': 'root',
+        'filename': '00_index.md',
+        'slug': '',
+        'permalink': '/docs/',
+        'title': 'Documentación',
+        'content': ROOT_CONTENT,
+        'data': {'title': 'Documentación'},
+    }
+
+
+def parse_doc(file_path: Path) -> Dict[str, Any]:
+    """Frontmatter and body of one doc, with frontmatter made JSON-safe (dates as strings)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data, content = parse_frontmatter(f.read())
+    return {'data': json.loads(json.dumps(data, default=str)), 'content': content}
+
+
+def doc_entry(section: str, file_path: Path, parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Bundle entry for a parsed doc (same shape docsContent.js used to build)."""
+    filename = file_path.name
+    slug = '' if file_path.stem == '00_index' else file_path.stem
+    permalink = f'/docs/{section}/{slug}/' if slug else f'/docs/{section}/'
+    title = parsed['data'].get('title') or re.sub(r'^\d+_', '', file_path.stem).replace('_', ' ')
+    return {
+        'section': section,
+        'filename': filename,
+        'slug': slug,
+        'permalink': permalink,
+        'title': title,
+        'content': parsed['content'],
+        'data': parsed['data'],
+    }
+
+
+def load_cache(cache_path: Path) -> Dict[str, Any]:
+    """Saved parses, or an empty cache when there is none."""
+    if cache_path.exists():
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache: Dict[str, Any], cache_path: Path) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+
+def build_docs_bundle(
+    docs_dir: Path,
+    cache: Optional[Dict[str, Any]] = None,
+    verbose: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Bundle entries for every section page, preceded by the /docs/ landing page
+    (empty when docs_dir does not exist).
+
+    `cache` (from load_cache) is updated in place: unchanged files are taken
+    from it, changed or new files are parsed, and deleted files are dropped.
+    """
+    if not docs_dir.exists():
+        if verbose:
+            print(f"      Docs directory not found: {docs_dir}")
+        return []
+
+    if cache is None:
+        cache = {}
+    if cache.get('version') != CACHE_VERSION or cache.get('docs') != str(docs_dir):
+        cache.clear()
+        cache.update({'version': CACHE_VERSION, 'docs': str(docs_dir), 'files': {}})
+    cached = cache['files']
+
+    docs = [root_entry()]
+    files = {}
+    parsed_count = 0
+    for section in DOCS_SECTIONS:
+        section_dir = docs_dir / section
+        if not section_dir.is_dir():
+            continue
+        for file_path in sorted(section_dir.glob('*.md')):
+            rel = f'{section}/{file_path.name}'
+            stat = file_path.stat()
+            entry = cached.get(rel)
+            if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, **parse_doc(file_path)}
+                parsed_count += 1
+            files[rel] = entry
+            docs.append(doc_entry(section, file_path, entry))
+    cache['files'] = files
+
+    if verbose:
+        print(f"      Parsed {parsed_count} docs ({len(files) - parsed_count} cached)")
+    return docs
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pre-parsed bundle of uu_framework/docs')
+    parser.add_argument('--docs', type=Path, default=Path('uu_framework/docs'),
+                        help='Path to documentation directory')
+    parser.add_argument('--output', type=Path,
+                        default=Path('uu_framework/eleventy/_data/docs_bundle.json'),
+                        help='Bundle file to write')
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE,
+                        help='Saved parses (enables incremental rebuilds)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Ignore the cache and parse every doc')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Only print the summary line (used by the Eleventy rebuild hook)')
+    args = parser.parse_args()
+
+    cache = {} if args.rebuild else load_cache(args.cache)
+    docs = build_docs_bundle(args.docs, cache, verbose=not args.quiet)
+    save_cache(cache, args.cache)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(docs, f, indent=2, ensure_ascii=False)
+    print(f"{len(docs)} docs written to {args.output}")
+    if not args.quiet:
+        for doc in docs:
+            print(f"  {doc['permalink']:40s} {doc['title']}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,14 +2,31 @@
 """
 Metadata Extraction Script
 
-Extracts YAML frontmatter and component markers from markdown files.
+Extracts YAML frontmatter and component markers from markdown files, plus
+each page's heading tree (with its rendered anchors), word count, reading
+time and code-block count from the same pass over the body.
 Gracefully handles files without frontmatter.
 """
 
 import os
 import re
+import json
+import math
+import unicodedata
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from records import Component, ComponentType, FileMetadata, Heading, intern
+
+
+# Spanish prose reading speed used for reading_time (minutes)
+WORDS_PER_MINUTE = 200
+
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+ATX_RE = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_RE = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+# markdown-it-attrs block at the end of a heading: {#id .class key=value}
+HEADING_ATTRS_RE = re.compile(r'[ \t]*\{[ \t]*((?:[#.][\w-]+|[\w-]+=\S+)(?:[ \t]+(?:[#.][\w-]+|[\w-]+=\S+))*)[ \t]*\}$')
 
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
@@ -47,7 +64,7 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
     return frontmatter, remaining
 
 
-def extract_components(content: str) -> List[Dict[str, Any]]:
+def extract_components(content: str) -> List[Component]:
     """
     Extract :::component markers from markdown content.
 
@@ -57,7 +74,7 @@ def extract_components(content: str) -> List[Dict[str, Any]]:
         :::
     """
     components = []
-    component_types = ['homework', 'exercise', 'prompt', 'example', 'exam', 'project']
+    component_types = {t.value: t for t in ComponentType}
 
     # Pattern to match :::type{attrs}\ncontent\n:::
     pattern = r':::(\w+)(?:\{([^}]*)\})?\s*\n(.*?)\n:::'
@@ -75,11 +92,11 @@ def extract_components(content: str) -> List[Dict[str, Any]]:
         for attr_match in re.finditer(r'(\w+)=["\']([^"\']+)["\']', attrs_str):
             attrs[attr_match.group(1)] = attr_match.group(2)
 
-        components.append({
-            'type': comp_type,
-            'attrs': attrs,
-            'content_preview': comp_content[:200] if comp_content else ''
-        })
+        components.append(Component(
+            type=component_types[comp_type],
+            attrs=attrs,
+            content_preview=comp_content[:200] if comp_content else ''
+        ))
 
     return components
 
@@ -129,7 +146,139 @@ def get_order_from_filename(filepath: Path) -> int:
     return 999
 
 
-def extract_file_metadata(filepath: Path, verbose: bool = False) -> Dict[str, Any]:
+def slugify(text: str) -> str:
+    """
+    Accent-folded heading anchor: 'Configuración Inicial' -> 'configuracion-inicial'.
+
+    Must stay identical to the slugify passed to markdown-it-anchor in
+    .eleventy.js, so the anchors listed in metadata match the rendered ids.
+    """
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(c for c in text if not '\u0300' <= c <= '\u036f')
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def unique_slug(slug: str, seen: Dict[str, bool]) -> str:
+    """Deduplicate like markdown-it-anchor: slug, slug-1, slug-2, ..."""
+    unique, i = slug, 1
+    while unique in seen:
+        unique = f'{slug}-{i}'
+        i += 1
+    seen[unique] = True
+    return unique
+
+
+def heading_text(raw: str) -> str:
+    """Plain text of a heading's inline markdown (what markdown-it-anchor slugifies)."""
+    text = re.sub(r'!\[[^\]]*\]\([^)]*\)', '', raw)          # images aren't text
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)     # links keep their label
+    text = re.sub(r'<[^>]+>', '', text)                      # inline html
+    text = re.sub(r'(`+)(.*?)\1', r'\2', text)                # code spans keep their content
+    text = re.sub(r'\\([!-/:-@\[-`{-~])', r'\1', text)        # backslash escapes
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def iter_prose_lines(body: str) -> Iterator[Tuple[str, bool]]:
+    """
+    Yield (line, in_code) for each body line; in_code is True for fenced
+    code blocks, fences included.
+    """
+    fence = None
+    for line in body.split('\n'):
+        match = FENCE_RE.match(line)
+        if fence is None:
+            if match:
+                fence = match.group(1)
+                yield line, True
+                continue
+            yield line, False
+        else:
+            # A fence closes with the same character, at least as long, and nothing else
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence) \
+                    and not line.strip().lstrip(fence[0]):
+                fence = None
+            yield line, True
+
+
+def extract_headings(body: str) -> List[Heading]:
+    """
+    Heading tree of a markdown body (ATX and setext headings outside code),
+    with the same anchors markdown-it-anchor assigns when rendering.
+    """
+    found = []
+    seen = {}
+    previous = ''
+    for line, in_code in iter_prose_lines(body):
+        if in_code:
+            previous = ''
+            continue
+
+        level, raw = None, None
+        atx = ATX_RE.match(line)
+        if atx:
+            level, raw = len(atx.group(1)), atx.group(2) or ''
+        elif previous and SETEXT_RE.match(line):
+            # Underlined heading: the previous paragraph line is the text
+            level, raw = (1 if line.strip()[0] == '=' else 2), previous.strip()
+
+        if level is None:
+            is_text = line.strip() and not re.match(r'^ {0,3}([-*+>|<]|\d+[.)]\s|:::)', line)
+            previous = line if is_text else ''
+            continue
+
+        previous = ''
+        anchor_id = None
+        attrs = HEADING_ATTRS_RE.search(raw)
+        if attrs:
+            raw = raw[:attrs.start()]
+            id_match = re.search(r'(?:^|\s)#([\w-]+)', attrs.group(1))
+            anchor_id = id_match.group(1) if id_match else None
+        text = heading_text(raw)
+        slug = unique_slug(anchor_id or slugify(text), seen)
+        found.append((level, text, slug))
+
+    # Nest each heading under the closest preceding heading of a lower level
+    roots, stack = [], []
+    for level, text, slug in found:
+        node = (level, text, slug, [])
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        (stack[-1][3] if stack else roots).append(node)
+        stack.append(node)
+
+    def freeze(node):
+        level, text, slug, children = node
+        display = re.sub(r'(\*\*|__|\*)', '', text)
+        return Heading(level, display, slug, tuple(freeze(c) for c in children))
+
+    return [freeze(node) for node in roots]
+
+
+def text_stats(body: str) -> Tuple[int, int, int]:
+    """
+    (word count, reading time in minutes, fenced code blocks) of a markdown
+    body. Code and markup (urls, html tags, container markers) are not words.
+    """
+    words = 0
+    code_blocks = 0
+    in_block = False
+    for line, in_code in iter_prose_lines(body):
+        if in_code:
+            if not in_block:
+                code_blocks += 1
+            in_block = True
+            continue
+        in_block = False
+        if line.lstrip().startswith(':::'):
+            continue
+        line = re.sub(r'!?\[([^\]]*)\]\([^)]*\)', r'\1', line)
+        line = re.sub(r'<[^>]+>|https?://\S+', ' ', line)
+        words += len(re.findall(r'[^\W_]+(?:[\'’-][^\W_]+)*', line))
+    reading_time = max(1, math.ceil(words / WORDS_PER_MINUTE)) if words else 0
+    return words, reading_time, code_blocks
+
+
+def extract_file_metadata(filepath: Path, verbose: bool = False) -> Optional[FileMetadata]:
     """Extract metadata from a single markdown file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -137,7 +286,7 @@ def extract_file_metadata(filepath: Path, verbose: bool = False) -> Dict[str, An
     except Exception as e:
         if verbose:
             print(f"      Warning: Could not read {filepath}: {e}")
-        return {}
+        return None
 
     # Parse frontmatter
     frontmatter, body = parse_frontmatter(content)
@@ -145,46 +294,51 @@ def extract_file_metadata(filepath: Path, verbose: bool = False) -> Dict[str, An
     # Extract components
     components = extract_components(body)
 
+    # Headings (TOC + anchors) and reading stats from the same body
+    headings = extract_headings(body)
+    word_count, reading_time, code_blocks = text_stats(body)
+
     # Build metadata
-    metadata = {
-        'path': str(filepath),
-        'title': frontmatter.get('title') or extract_h1_title(body) or title_from_filename(filepath),
-        'type': frontmatter.get('type', 'lesson'),
-        'order': frontmatter.get('order') or get_order_from_filename(filepath),
-        'date': frontmatter.get('date'),
-        'summary': frontmatter.get('summary'),
-        'tags': frontmatter.get('tags', []),
-        'due_date': frontmatter.get('due_date'),
-        'components': components,
-        'has_frontmatter': bool(frontmatter),
-    }
+    tags = frontmatter.get('tags', [])
+    metadata = FileMetadata(
+        path=str(filepath),
+        title=frontmatter.get('title') or extract_h1_title(body) or title_from_filename(filepath),
+        type=intern(frontmatter.get('type', 'lesson')),
+        order=frontmatter.get('order') or get_order_from_filename(filepath),
+        date=frontmatter.get('date'),
+        summary=frontmatter.get('summary'),
+        tags=tuple(intern(t) for t in tags) if isinstance(tags, list) else tags,
+        due_date=frontmatter.get('due_date'),
+        components=tuple(components),
+        has_frontmatter=bool(frontmatter),
+        headings=tuple(headings),
+        word_count=word_count,
+        reading_time=reading_time,
+        code_blocks=code_blocks,
+    )
 
     return metadata
 
 
-def extract_all_metadata(
+def iter_metadata(
     content_dir: Path,
     exclude: List[str] = None,
     verbose: bool = False
-) -> Dict[str, Dict[str, Any]]:
+) -> Iterator[Tuple[str, FileMetadata]]:
     """
-    Extract metadata from all markdown files in content directory.
+    Yield (relative path, FileMetadata) for each markdown file as it is parsed.
 
-    Returns:
-        Dict mapping file paths to their metadata
+    Files are discovered lazily, so consumers can start (and memory stays
+    bounded) before the whole corpus has been read.
     """
     exclude = exclude or []
-    metadata = {}
 
     content_path = Path(content_dir)
     if not content_path.exists():
         print(f"      Warning: Content directory {content_dir} does not exist")
-        return metadata
+        return
 
-    # Find all markdown files
-    md_files = list(content_path.rglob('*.md'))
-
-    for filepath in md_files:
+    for filepath in content_path.rglob('*.md'):
         # Check exclusions
         rel_path = filepath.relative_to(content_path)
         skip = False
@@ -200,18 +354,115 @@ def extract_all_metadata(
 
         file_meta = extract_file_metadata(filepath, verbose)
         if file_meta:
-            metadata[str(rel_path)] = file_meta
-
             if verbose:
                 print(f"      Processed: {rel_path}")
 
-    return metadata
+            yield str(rel_path), file_meta
+
+
+def extract_all_metadata(
+    content_dir: Path,
+    exclude: List[str] = None,
+    verbose: bool = False
+) -> Dict[str, FileMetadata]:
+    """
+    Extract metadata from all markdown files in content directory.
+
+    Returns:
+        Dict mapping file paths to their FileMetadata records
+        (records.metadata_to_dict gives the metadata.json shape)
+    """
+    return dict(iter_metadata(content_dir, exclude, verbose))
+
+
+class MetadataWriter:
+    """
+    Incremental NDJSON writer: one line per record, {"file": <relative path>,
+    **FileMetadata.to_dict()}, written as soon as the record is produced.
+
+    With json_path, the dict-shaped metadata.json is written in the same
+    pass (byte-identical to json.dump(..., indent=2)), so it never has to be
+    re-read from the NDJSON.
+
+    Usage:
+        with MetadataWriter(path) as writer:
+            for rel_path, meta in iter_metadata(content_dir):
+                writer.write(rel_path, meta)
+    """
+
+    def __init__(self, path: Path, json_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.json_path = Path(json_path) if json_path else None
+        self.count = 0
+        self._file = None
+        self._json = None
+
+    def __enter__(self) -> 'MetadataWriter':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        if self.json_path:
+            self._json = open(self.json_path, 'w', encoding='utf-8')
+        return self
+
+    def write(self, rel_path: str, meta: FileMetadata) -> None:
+        record = meta.to_dict()
+        self._file.write(json.dumps({'file': rel_path, **record}, ensure_ascii=False))
+        self._file.write('\n')
+        if self._json:
+            _write_json_entry(self._json, rel_path, record, self.count)
+        self.count += 1
+
+    def __exit__(self, *exc) -> None:
+        self._file.close()
+        self._file = None
+        if self._json:
+            self._json.write('\n}' if self.count else '{}')
+            self._json.close()
+            self._json = None
+
+
+def _write_json_entry(out, rel_path: str, record: Dict[str, Any], index: int) -> None:
+    """Append one "path": {...} entry of the dict-shaped metadata.json."""
+    # Nested one level deeper than a top-level dump
+    value = json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+    key = json.dumps(rel_path, ensure_ascii=False)
+    out.write('{\n  ' if index == 0 else ',\n  ')
+    out.write(f"{key}: {value}")
+
+
+def read_metadata_ndjson(path: Path) -> Iterator[Tuple[str, FileMetadata]]:
+    """Yield (relative path, FileMetadata) back from a metadata.ndjson file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record.pop('file'), FileMetadata.from_dict(record)
+
+
+def materialize_metadata_json(ndjson_path: Path, json_path: Path) -> int:
+    """
+    Stream an existing metadata.ndjson into the dict-shaped metadata.json,
+    one record at a time. The output is byte-identical to
+    json.dump(..., indent=2). (preprocess.py writes both in one pass with
+    MetadataWriter(json_path=...) instead.)
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open(json_path, 'w', encoding='utf-8') as out:
+        for rel_path, meta in read_metadata_ndjson(ndjson_path):
+            _write_json_entry(out, rel_path, meta.to_dict(), count)
+            count += 1
+        out.write('\n}' if count else '{}')
+    return count
 
 
 if __name__ == '__main__':
     import sys
-    import json
 
     content_dir = sys.argv[1] if len(sys.argv) > 1 else 'clase'
+    from records import metadata_to_dict
+
     metadata = extract_all_metadata(Path(content_dir), verbose=True)
-    print(json.dumps(metadata, indent=2, ensure_ascii=False))
+    print(json.dumps(metadata_to_dict(metadata), indent=2, ensure_ascii=False))
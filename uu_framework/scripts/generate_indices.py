@@ -16,6 +16,8 @@ import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from records import FileMetadata, NodeType, TreeNode
+
 
 def get_sort_key(name: str) -> tuple:
     """
@@ -67,16 +69,16 @@ def get_sort_key(name: str) -> tuple:
 
 def build_tree(
     dir_path: Path,
-    metadata: Dict[str, Any],
+    metadata: Dict[str, FileMetadata],
     base_path: Path,
     exclude: List[str],
     depth: int = 0
-) -> Dict[str, Any]:
+) -> Optional[TreeNode]:
     """
     Recursively build hierarchy tree from directory.
 
     Returns:
-        Dict with structure:
+        TreeNode whose to_dict() has the structure:
         {
             'name': 'dirname',
             'path': 'relative/path',
@@ -95,25 +97,23 @@ def build_tree(
         if excl in str(rel_path):
             return None
 
-    node = {
-        'name': name,
-        'path': str(rel_path),
-        'type': 'directory',
-        'order': get_sort_key(name),
-        'children': [],
-        'has_index': False,
-    }
+    node = TreeNode(
+        name=name,
+        path=str(rel_path),
+        type=NodeType.DIRECTORY,
+        order=get_sort_key(name),
+    )
 
     # Get title from index file if exists
     index_path = dir_path / '00_index.md'
     rel_index = str(rel_path / '00_index.md')
 
     if index_path.exists() and rel_index in metadata:
-        node['has_index'] = True
-        node['title'] = metadata[rel_index].get('title', name)
+        node.has_index = True
+        node.title = metadata[rel_index].title or name
     else:
         # Generate title from directory name
-        node['title'] = title_from_dirname(name)
+        node.title = title_from_dirname(name)
 
     # Process children
     children = []
@@ -143,28 +143,28 @@ def build_tree(
                 continue
 
             rel_file = str(rel_item)
-            file_meta = metadata.get(rel_file, {})
-
-            children.append({
-                'name': item.name,
-                'path': rel_file,
-                'type': 'file',
-                'title': file_meta.get('title', title_from_filename(item.stem)),
-                'order': get_sort_key(item.name),
-                'summary': file_meta.get('summary'),
-            })
+            file_meta = metadata.get(rel_file)
+
+            children.append(TreeNode(
+                name=item.name,
+                path=rel_file,
+                type=NodeType.FILE,
+                title=file_meta.title if file_meta else title_from_filename(item.stem),
+                order=get_sort_key(item.name),
+                summary=file_meta.summary if file_meta else None,
+            ))
         elif item.suffix == '.py':
             # Python files
-            children.append({
-                'name': item.name,
-                'path': str(rel_item),
-                'type': 'code',
-                'title': item.name,
-                'order': get_sort_key(item.name),
-            })
+            children.append(TreeNode(
+                name=item.name,
+                path=str(rel_item),
+                type=NodeType.CODE,
+                title=item.name,
+                order=get_sort_key(item.name),
+            ))
 
     # Sort children
-    node['children'] = sorted(children, key=lambda x: x['order'])
+    node.children = sorted(children, key=lambda x: x.order)
 
     return node
 
@@ -191,7 +191,7 @@ def title_from_filename(name: str) -> str:
     return ' '.join(word.capitalize() for word in clean.split()) or name
 
 
-def validate_sequence(children: List[Dict], parent_path: str, verbose: bool = False) -> List[str]:
+def validate_sequence(children: List[TreeNode], parent_path: str, verbose: bool = False) -> List[str]:
     """
     Validate that numbered items follow a logical sequence.
     Returns list of warning messages.
@@ -201,7 +201,7 @@ def validate_sequence(children: List[Dict], parent_path: str, verbose: bool = Fa
     # Extract numbered items
     numbered = []
     for child in children:
-        name = child['name']
+        name = child.name
         match = re.match(r'^(\d+)[_-]', name)
         if match:
             num = int(match.group(1))
@@ -239,21 +239,21 @@ def validate_sequence(children: List[Dict], parent_path: str, verbose: bool = Fa
     return warnings
 
 
-def validate_hierarchy(node: Dict, path: str = '', verbose: bool = False) -> List[str]:
+def validate_hierarchy(node: TreeNode, path: str = '', verbose: bool = False) -> List[str]:
     """
     Recursively validate hierarchy for sequence issues.
     """
     warnings = []
 
-    if 'children' in node and node['children']:
+    if node.children:
         # Validate this level
-        current_path = path + '/' + node['name'] if path else node['name']
-        if node.get('type') in ['directory', 'root']:
-            warnings.extend(validate_sequence(node['children'], current_path, verbose))
+        current_path = path + '/' + node.name if path else node.name
+        if node.type in (NodeType.DIRECTORY, NodeType.ROOT):
+            warnings.extend(validate_sequence(node.children, current_path, verbose))
 
         # Recurse into children
-        for child in node['children']:
-            if child.get('type') == 'directory':
+        for child in node.children:
+            if child.type is NodeType.DIRECTORY:
                 warnings.extend(validate_hierarchy(child, current_path, verbose))
 
     return warnings
@@ -261,27 +261,28 @@ def validate_hierarchy(node: Dict, path: str = '', verbose: bool = False) -> Lis
 
 def generate_hierarchy(
     content_dir: Path,
-    metadata: Dict[str, Any],
+    metadata: Dict[str, FileMetadata],
     exclude: List[str] = None,
     verbose: bool = False
-) -> Dict[str, Any]:
+) -> TreeNode:
     """
     Generate complete hierarchy tree for content directory.
+
+    Returns the root TreeNode; its to_dict() is the hierarchy.json shape.
     """
     exclude = exclude or []
     content_path = Path(content_dir)
 
-    if not content_path.exists():
-        return {'children': []}
-
     # Build tree starting from content directory
-    tree = {
-        'name': content_path.name,
-        'path': '',
-        'type': 'root',
-        'title': 'Contenido',
-        'children': [],
-    }
+    tree = TreeNode(
+        name=content_path.name,
+        path='',
+        type=NodeType.ROOT,
+        title='Contenido',
+    )
+
+    if not content_path.exists():
+        return tree
 
     for item in sorted(content_path.iterdir(), key=lambda x: get_sort_key(x.name)):
         if item.name.startswith('.'):
@@ -299,32 +300,32 @@ def generate_hierarchy(
         if item.is_dir():
             child = build_tree(item, metadata, content_path, exclude)
             if child:
-                tree['children'].append(child)
+                tree.children.append(child)
                 if verbose:
                     print(f"      Added: {item.name}")
         elif item.suffix == '.md':
             # Include root-level markdown files (except index files, README, and top-bar-only pages)
             if item.name not in ['00_index.md', 'README_FLOW.md', 'aleatorio.md']:
                 rel_file = item.name
-                file_meta = metadata.get(rel_file, {})
+                file_meta = metadata.get(rel_file)
 
                 # Check if this is a utility page (no numbers)
                 is_utility = get_sort_key(item.name)[0] == -1
 
-                tree['children'].append({
-                    'name': item.name,
-                    'path': rel_file,
-                    'type': 'file',
-                    'title': file_meta.get('title', title_from_filename(item.stem)),
-                    'order': get_sort_key(item.name),
-                    'summary': file_meta.get('summary'),
-                    'no_number': is_utility,  # Utility pages don't show numbers
-                })
+                tree.children.append(TreeNode(
+                    name=item.name,
+                    path=rel_file,
+                    type=NodeType.FILE,
+                    title=file_meta.title if file_meta else title_from_filename(item.stem),
+                    order=get_sort_key(item.name),
+                    summary=file_meta.summary if file_meta else None,
+                    no_number=is_utility,  # Utility pages don't show numbers
+                ))
                 if verbose:
                     print(f"      Added file: {item.name}")
 
     # Sort top-level children
-    tree['children'] = sorted(tree['children'], key=lambda x: x['order'])
+    tree.children = sorted(tree.children, key=lambda x: x.order)
 
     # Validate hierarchy for sequence gaps (always print warnings)
     warnings = validate_hierarchy(tree, verbose=verbose)
@@ -342,4 +343,4 @@ if __name__ == '__main__':
 
     content_dir = sys.argv[1] if len(sys.argv) > 1 else 'clase'
     hierarchy = generate_hierarchy(Path(content_dir), {}, verbose=True)
-    print(json.dumps(hierarchy, indent=2, ensure_ascii=False, default=str))
+    print(json.dumps(hierarchy.to_dict(), indent=2, ensure_ascii=False, default=str))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Git History Provider
+
+Computes, for every content file, its first and last commit dates and its
+author list from a single `git log --name-only` pass, instead of one
+`git log -1 -- <file>` process per page.
+
+History is saved with the HEAD it was computed at. When HEAD has not moved
+the saved history is reused without walking any commit; when it moved
+forward only the new commits are walked; a rewritten history (HEAD no longer
+descends from the saved commit) triggers a full rebuild.
+
+Usage:
+    python3 git_history.py                 # Update and print a summary
+    python3 git_history.py --rebuild       # Ignore the saved history
+
+    history = update_history(load_history(path), Path('clase'))
+    history['files']['06_git/01_setup_ssh.md']
+    # {'created': '2026-01-20T...', 'updated': '2026-02-03T...', 'authors': [...]}
+"""
+
+import sys
+import json
+import subprocess
+import dataclasses
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from gitlog import git, is_ancestor, iter_log
+from records import FileMetadata, intern
+
+
+# 2: files keyed by unquoted paths (earlier states may hold quoted ones)
+STATE_VERSION = 2
+
+DEFAULT_STATE = Path('uu_framework/.cache/git_history.json')
+
+
+def iter_file_commits(
+    content_dir: Path,
+    since: Optional[str],
+    head: str
+) -> Iterator[Tuple[str, int, str, str, str]]:
+    """
+    Yield (commit, timestamp, iso date, author, path) for every file touched
+    under content_dir in commits after `since`, oldest first, from one git log.
+    Paths are relative to content_dir (the keys of metadata.json).
+    """
+    revision = f'{since}..{head}' if since else head
+    for (commit, timestamp, iso, author), paths in iter_log(
+            ['%H', '%ct', '%cI', '%aN'], revision, ['.'], cwd=content_dir, relative=True):
+        for path in paths:
+            yield commit, int(timestamp), iso, author, path
+
+
+def load_history(state_path: Path) -> Dict[str, Any]:
+    """Saved history, or an empty state when there is none."""
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_history(state: Dict[str, Any], state_path: Path) -> None:
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+
+
+def update_history(
+    state: Dict[str, Any],
+    content_dir: Path,
+    head: str = 'HEAD',
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    Extend the saved history with commits after state['last_commit'].
+
+    Falls back to a full rebuild when there is no usable state (first run,
+    different content directory, or the last commit is no longer in history).
+    """
+    head_sha = git('rev-parse', head, cwd=content_dir).strip()
+
+    since = state.get('last_commit')
+    if (state.get('version') != STATE_VERSION or state.get('content') != str(content_dir)
+            or (since and since != head_sha and not is_ancestor(since, head_sha, content_dir))):
+        if verbose and since:
+            print("      Saved git history is stale, rebuilding from full history")
+        state = {}
+        since = None
+
+    files = state.get('files', {})
+
+    if since != head_sha:
+        if git('rev-parse', '--is-shallow-repository', cwd=content_dir).strip() == 'true':
+            print("      Warning: shallow clone, creation dates and authors are incomplete "
+                  "(checkout with fetch-depth: 0)")
+
+        new_commits = set()
+        for commit, timestamp, iso, author, path in iter_file_commits(content_dir, since, head_sha):
+            new_commits.add(commit)
+            entry = files.get(path)
+            if entry is None:
+                files[path] = {
+                    'created': iso, 'created_ts': timestamp,
+                    'updated': iso, 'updated_ts': timestamp,
+                    'authors': [author],
+                }
+                continue
+            # Commit order is topological; dates can go backwards across merges
+            if timestamp < entry['created_ts']:
+                entry['created'], entry['created_ts'] = iso, timestamp
+            if timestamp >= entry['updated_ts']:
+                entry['updated'], entry['updated_ts'] = iso, timestamp
+            if author not in entry['authors']:
+                entry['authors'].append(author)
+        if verbose:
+            print(f"      Indexed {len(new_commits)} new commits")
+    elif verbose:
+        print(f"      Git history up to date at {head_sha[:12]}")
+
+    return {
+        'version': STATE_VERSION,
+        'content': str(content_dir),
+        'last_commit': head_sha,
+        'files': files,
+    }
+
+
+def with_history(meta: FileMetadata, entry: Optional[Dict[str, Any]]) -> FileMetadata:
+    """A copy of a metadata record carrying its file's git history (if any)."""
+    if not entry:
+        return meta
+    return dataclasses.replace(
+        meta,
+        created=entry['created'],
+        last_updated=entry['updated'],
+        authors=tuple(intern(a) for a in entry['authors']),
+    )
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Per-file git history for content pages')
+    parser.add_argument('--content', type=Path, default=Path('clase'),
+                        help='Path to content directory')
+    parser.add_argument('--state', type=Path, default=DEFAULT_STATE,
+                        help='Saved history (enables incremental updates)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Ignore saved history and walk the full log')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Enable verbose output')
+    args = parser.parse_args()
+
+    state = {} if args.rebuild else load_history(args.state)
+    try:
+        state = update_history(state, args.content, verbose=args.verbose)
+    except subprocess.CalledProcessError as e:
+        print(f"Error running git: {e.stderr.strip() if e.stderr else e}")
+        return 1
+    save_history(state, args.state)
+
+    files = sorted(state['files'].items(), key=lambda item: item[1]['updated_ts'], reverse=True)
+    print(f"{len(files)} files at {state['last_commit'][:12]}")
+    for path, entry in files[:20]:
+        print(f"  {entry['updated'][:10]}  {path}  ({', '.join(entry['authors'])})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
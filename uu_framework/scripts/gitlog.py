@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Git Log Helpers
+
+Shared by roster.py and git_history.py: running git, checking whether a
+saved commit can be extended incrementally, and reading file changes from a
+single `git log -z` pass.
+
+Paths are read with `-c core.quotepath=off` and `-z`, so they come back
+verbatim (accents, spaces, narrow no-break spaces) instead of quoted and
+octal-escaped.
+
+Usage:
+    for (commit, ts), changes in iter_log(['%H', '%ct'], 'HEAD', ['estudiantes'],
+                                          name_status=True):
+        for status, path in changes:
+            ...
+"""
+
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Iterator, Tuple, Union
+
+
+def git(*args: str, cwd: Optional[Path] = None) -> str:
+    """Run a git command (inside cwd when given) and return its stdout."""
+    prefix = ['git', '-C', str(cwd)] if cwd is not None else ['git']
+    result = subprocess.run([*prefix, *args], capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def is_ancestor(commit: str, head: str, cwd: Optional[Path] = None) -> bool:
+    """Whether commit is reachable from head (so history can be extended incrementally)."""
+    prefix = ['git', '-C', str(cwd)] if cwd is not None else ['git']
+    result = subprocess.run([*prefix, 'merge-base', '--is-ancestor', commit, head],
+                            capture_output=True)
+    return result.returncode == 0
+
+
+def iter_log(
+    fields: List[str],
+    revision: str,
+    paths: List[str],
+    cwd: Optional[Path] = None,
+    name_status: bool = False,
+    relative: bool = False
+) -> Iterator[Tuple[List[str], List[Union[str, Tuple[str, str]]]]]:
+    """
+    Yield (header, changes) for every commit in revision touching paths,
+    oldest first, from one `git log -z --no-renames` pass.
+
+    header holds one value per `fields` placeholder (e.g. ['%H', '%ct']).
+    changes lists the paths the commit touched, or (status, path) pairs with
+    name_status. With relative, paths are relative to cwd.
+    """
+    args = ['-c', 'core.quotepath=off', 'log', '--reverse', '--no-renames', '-z',
+            '--name-status' if name_status else '--name-only',
+            '--format=%x1e' + '%x1f'.join(fields)]
+    if relative:
+        args.append('--relative')
+    output = git(*args, revision, '--', *paths, cwd=cwd)
+
+    for record in output.split('\x1e'):
+        if not record.strip('\0\n'):
+            continue
+        header, _, body = record.partition('\0')
+        if body.startswith('\n'):
+            body = body[1:]
+        entries = body.split('\0')
+        if name_status:
+            # name-status with -z: status and path are separate NUL-terminated fields
+            changes = [(status, path) for status, path in zip(entries[0::2], entries[1::2]) if path]
+        else:
+            changes = [path for path in entries if path]
+        yield header.split('\x1f', len(fields) - 1), changes
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Page Weight Budget Report
+
+Post-build analyzer: walks the built site (_site), takes the page -> asset
+edges from asset_graph.build_site_graph and reports each page's transfer
+weight split into HTML, CSS, JS, images and embedded PDFs. Pages are sorted heaviest first and checked
+against budgets from the `budgets` section of site.yaml; the script exits
+non-zero when any budget is exceeded.
+
+Weights are cold-cache: shared assets (stylesheets, favicons) count toward
+every page that loads them. Only embedded resources count (img, iframe,
+stylesheet, script); links to other pages or downloads do not. Responsive
+images count the AVIF/WebP variant a wide-screen browser fetches (the widest
+candidate of the first <source>), not the PNG fallback.
+
+Usage:
+    python3 page_weight.py [SITE_DIR] [--json page_weight.json] [--budget images_kb=1024]
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+from typing import Dict, List, Any
+
+from asset_graph import build_site_graph, format_size
+
+
+CATEGORIES = ('html', 'css', 'js', 'images', 'pdf', 'other')
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.avif', '.ico')
+
+# Budgets in KB; a page fails when any category (or its total) exceeds its budget.
+# asset_kb applies to every single asset, catching e.g. a 10 MB PNG in one lesson.
+DEFAULT_BUDGETS = {
+    'total_kb': 4096,
+    'html_kb': 512,
+    'css_kb': 512,
+    'js_kb': 512,
+    'images_kb': 2048,
+    'pdf_kb': 4096,
+    'asset_kb': 3072,
+}
+
+
+def get_budgets(config: dict, overrides: List[str] = None) -> Dict[str, float]:
+    """Merge site.yaml budgets and KEY=VALUE command-line overrides over defaults."""
+    budgets = dict(DEFAULT_BUDGETS)
+    budgets.update((config or {}).get('budgets', {}) or {})
+    for override in overrides or []:
+        key, _, value = override.partition('=')
+        if key not in DEFAULT_BUDGETS:
+            raise ValueError(f"Unknown budget '{key}' (valid: {', '.join(DEFAULT_BUDGETS)})")
+        budgets[key] = float(value)
+    return budgets
+
+
+def categorize(path: str) -> str:
+    """Classify an asset path into a weight category."""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.html', '.htm'):
+        return 'html'
+    if suffix == '.css':
+        return 'css'
+    if suffix in ('.js', '.mjs'):
+        return 'js'
+    if suffix in IMAGE_SUFFIXES:
+        return 'images'
+    if suffix == '.pdf':
+        return 'pdf'
+    return 'other'
+
+
+def measure_pages(site_dir: Path, graph: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """
+    Compute each page's transfer weight by category.
+
+    Returns:
+        List of page records sorted by total weight (heaviest first):
+        {'page': 'a/index.html', 'total': 123, 'html': 10, 'css': ..., 'assets': [...]}
+    """
+    site_path = Path(site_dir).resolve()
+    sizes = {}
+
+    def size_of(rel_path: str) -> int:
+        if rel_path not in sizes:
+            sizes[rel_path] = (site_path / rel_path).stat().st_size
+        return sizes[rel_path]
+
+    pages = []
+    for page, assets in graph.items():
+        record = {category: 0 for category in CATEGORIES}
+        record['html'] = size_of(page)
+        asset_records = []
+        for asset in assets:
+            size = size_of(asset)
+            record[categorize(asset)] += size
+            asset_records.append({'path': asset, 'size': size})
+        record['total'] = sum(record[c] for c in CATEGORIES)
+        record['page'] = page
+        record['assets'] = sorted(asset_records, key=lambda a: -a['size'])
+        pages.append(record)
+
+    pages.sort(key=lambda p: (-p['total'], p['page']))
+    return pages
+
+
+def check_budgets(pages: List[Dict[str, Any]], budgets: Dict[str, float]) -> List[Dict[str, Any]]:
+    """
+    Check every page against the budgets.
+
+    Returns:
+        List of violations: {'page': ..., 'budget': 'images_kb', 'limit_kb': .., 'actual_kb': .., 'asset': ..}
+    """
+    violations = []
+    for page in pages:
+        checks = [('total_kb', page['total'])]
+        checks += [(f"{c}_kb", page[c]) for c in CATEGORIES if f"{c}_kb" in budgets]
+        for budget, actual in checks:
+            limit = budgets.get(budget)
+            if limit is not None and actual > limit * 1024:
+                violations.append({
+                    'page': page['page'], 'budget': budget,
+                    'limit_kb': limit, 'actual_kb': round(actual / 1024, 1),
+                })
+        asset_limit = budgets.get('asset_kb')
+        if asset_limit is not None:
+            for asset in page['assets']:
+                if asset['size'] > asset_limit * 1024:
+                    violations.append({
+                        'page': page['page'], 'budget': 'asset_kb', 'asset': asset['path'],
+                        'limit_kb': asset_limit, 'actual_kb': round(asset['size'] / 1024, 1),
+                    })
+    return violations
+
+
+def print_report(pages: List[Dict[str, Any]], violations: List[Dict[str, Any]], top: int = 15) -> None:
+    """Print a text summary of the heaviest pages and budget violations."""
+    print(f"\n      {'Total':>10s} {'HTML':>9s} {'CSS':>9s} {'Images':>9s} {'PDF':>9s}  Page")
+    for page in pages[:top]:
+        print(f"      {format_size(page['total']):>10s} {format_size(page['html']):>9s} "
+              f"{format_size(page['css']):>9s} {format_size(page['images']):>9s} "
+              f"{format_size(page['pdf']):>9s}  {page['page']}")
+    if len(pages) > top:
+        print(f"      ... {len(pages) - top} more pages")
+
+    if violations:
+        print(f"\n      Budget violations: {len(violations)}")
+        for v in violations:
+            subject = f"{v['page']} ({v['asset']})" if v.get('asset') else v['page']
+            print(f"        {v['budget']}: {v['actual_kb']} KB > {v['limit_kb']} KB  {subject}")
+    else:
+        print("\n      All pages within budget")
+
+
+def load_path_prefix(repo_json: Path) -> str:
+    """Read the deploy path prefix from repo.json (generated by preprocessing)."""
+    try:
+        with open(repo_json, 'r', encoding='utf-8') as f:
+            return json.load(f).get('base_url', '')
+    except (OSError, ValueError):
+        return ''
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Per-page weight budget report')
+    parser.add_argument('site', type=Path, nargs='?', default=Path('_site'),
+                        help='Path to built site')
+    parser.add_argument('--config', type=Path,
+                        default=Path('uu_framework/config/site.yaml'),
+                        help='Path to site configuration')
+    parser.add_argument('--prefix', default=None,
+                        help='URL path prefix (default: base_url from repo.json)')
+    parser.add_argument('--budget', action='append', default=[], metavar='KEY=KB',
+                        help='Override a budget, e.g. --budget images_kb=1024')
+    parser.add_argument('--json', type=Path, metavar='PATH',
+                        help='Write the full report as JSON')
+    parser.add_argument('--top', type=int, default=15,
+                        help='Number of pages in the text summary')
+    args = parser.parse_args()
+
+    if not args.site.exists():
+        print(f"Error: site directory {args.site} not found (build the site first)")
+        return 1
+
+    try:
+        import yaml
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    except (ImportError, FileNotFoundError):
+        config = {}
+
+    prefix = args.prefix
+    if prefix is None:
+        prefix = os.environ.get('PATH_PREFIX') or load_path_prefix(
+            Path('uu_framework/eleventy/_data/repo.json'))
+
+    try:
+        budgets = get_budgets(config, args.budget)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Measuring page weight in {args.site}...")
+    graph = build_site_graph(args.site, prefix)
+    pages = measure_pages(args.site, graph)
+    violations = check_budgets(pages, budgets)
+
+    print(f"      {len(pages)} pages analyzed")
+    print_report(pages, violations, args.top)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'budgets': budgets, 'pages': pages, 'violations': violations},
+                      f, indent=2, ensure_ascii=False)
+        print(f"      Saved report to {args.json}")
+
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,6 +8,7 @@ Runs all preprocessing steps in order:
 2. Extract metadata from markdown files
 3. Generate hierarchy tree
 4. Aggregate tasks (homework, exams, projects)
+5. Generate responsive image derivatives
 
 Usage:
     python3 preprocess.py [--config CONFIG_PATH] [--content CONTENT_DIR]
@@ -16,6 +17,7 @@ Usage:
 import os
 import sys
 import argparse
+import subprocess
 import json
 import re
 from pathlib import Path
@@ -24,10 +26,17 @@ from pathlib import Path
 SCRIPT_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from extract_metadata import extract_all_metadata
+from extract_metadata import iter_metadata, MetadataWriter
+from git_history import load_history, update_history, save_history, with_history, DEFAULT_STATE
 from generate_indices import generate_hierarchy
 from aggregate_tasks import aggregate_all_tasks
-from process_calendar_topics import process_calendar_topics
+from process_calendar_topics import (process_calendar_topics, build_calendar_index, build_ics,
+                                     source_stamp)
+from process_images import process_images
+from docs_bundle import (build_docs_bundle, load_cache, save_cache, DOCS_SECTIONS, SECTION_TITLES,
+                         DEFAULT_CACHE as DOCS_CACHE)
+from query import ContentIndex
+from records import tasks_to_dict
 
 
 def detect_git_info(verbose: bool = False) -> dict:
@@ -144,52 +153,45 @@ def load_config(config_path: Path) -> dict:
         return {}
 
 
-def generate_docs_hierarchy(docs_dir: Path, verbose: bool = False) -> dict:
+def generate_docs_hierarchy(docs: list, verbose: bool = False) -> dict:
     """
-    Generate hierarchy for documentation from uu_framework/docs/.
+    Generate hierarchy for documentation from the parsed docs bundle.
     Returns a hierarchy dict to be merged into main hierarchy.
     Docs are processed separately and rendered to /docs/ path.
     """
-    if not docs_dir.exists():
-        if verbose:
-            print(f"      Docs directory not found: {docs_dir}")
-        return None
-
     docs_children = []
-    for item in sorted(docs_dir.iterdir()):
-        if item.is_dir() and item.name in ['dev', 'profesor', 'estudiante']:
-            section = {
-                "name": item.name,
-                "path": f"docs/{item.name}",
-                "url": f"/docs/{item.name}/",  # Direct URL to avoid /00_index/
-                "type": "directory",
-                "title": {
-                    "dev": "Developer Guide",
-                    "profesor": "Guía del Profesor",
-                    "estudiante": "Guía del Estudiante"
-                }.get(item.name, item.name.title()),
-                "has_index": False,  # Uses pagination, not actual 00_index.md
+    for name in sorted(DOCS_SECTIONS):
+        pages = [doc for doc in docs if doc['section'] == name]
+        if not pages:
+            continue
+        section = {
+            "name": name,
+            "path": f"docs/{name}",
+            "url": f"/docs/{name}/",  # Direct URL to avoid /00_index/
+            "type": "directory",
+            "title": SECTION_TITLES.get(name, name.title()),
+            "has_index": False,  # Uses pagination, not actual 00_index.md
+            "no_number": True,  # Docs don't show numbers
+            "children": []
+        }
+
+        # Add children (files in directory)
+        for doc in pages:
+            stem = doc['filename'][:-len('.md')]
+            child_entry = {
+                "name": stem,
+                "path": f"docs/{name}/{stem}",
+                "type": "file",
+                "title": get_doc_title(doc),
+                "has_index": False,
                 "no_number": True,  # Docs don't show numbers
                 "children": []
             }
+            section["children"].append(child_entry)
 
-            # Add children (files in directory)
-            for child in sorted(item.iterdir()):
-                if child.is_file() and child.suffix == '.md':
-                    child_entry = {
-                        "name": child.stem,
-                        "path": f"docs/{item.name}/{child.stem}",
-                        "type": "file",
-                        "title": get_title_from_file(child),
-                        "has_index": False,
-                        "no_number": True,  # Docs don't show numbers
-                        "children": []
-                    }
-                    section["children"].append(child_entry)
-
-            docs_children.append(section)
-            if verbose:
-                print(f"      Found: {item.name}/ ({len(section['children'])} files)")
+        docs_children.append(section)
+        if verbose:
+            print(f"      Found: {name}/ ({len(section['children'])} files)")
 
     if docs_children:
         return {
@@ -205,22 +207,13 @@ def generate_docs_hierarchy(docs_dir: Path, verbose: bool = False) -> dict:
     return None
 
 
-def get_title_from_file(file_path: Path) -> str:
-    """Extract title from markdown file frontmatter or filename."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Check for YAML frontmatter
-            if content.startswith('---'):
-                end = content.find('---', 3)
-                if end > 0:
-                    match = re.search(r'^title:\s*["\']?(.+?)["\']?\s*$', content[3:end], re.MULTILINE)
-                    if match:
-                        return match.group(1)
-    except Exception:
-        pass
+def get_doc_title(doc: dict) -> str:
+    """Navigation title of a bundled doc: frontmatter title or filename."""
+    title = doc['data'].get('title')
+    if title:
+        return str(title)
     # Fallback to filename
-    name = file_path.stem
+    name = doc['filename'][:-len('.md')]
     # Remove numeric prefix
     name = re.sub(r'^\d+_', '', name)
     return name.replace('_', ' ').title()
@@ -314,9 +307,20 @@ def main():
     parser.add_argument('--docs', type=Path,
                         default=Path('uu_framework/docs'),
                         help='Path to documentation directory')
+    parser.add_argument('--docs-cache', type=Path,
+                        default=DOCS_CACHE,
+                        help='Saved doc parses (only changed docs are re-read)')
     parser.add_argument('--output', type=Path,
                         default=Path('uu_framework/eleventy/_data'),
                         help='Path to output data directory')
+    parser.add_argument('--metadata-json', action=argparse.BooleanOptionalAction, default=True,
+                        help='Also write the dict-shaped metadata.json (default: yes; '
+                             'metadata.ndjson is always written)')
+    parser.add_argument('--git-history', action=argparse.BooleanOptionalAction, default=True,
+                        help='Add created/last-updated dates and authors from git (default: yes)')
+    parser.add_argument('--history-state', type=Path,
+                        default=DEFAULT_STATE,
+                        help='Saved git history (only commits after its HEAD are walked)')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Enable verbose output')
 
@@ -343,21 +347,57 @@ def main():
 
     # Step 1: Extract metadata from all markdown files
     print("\n[1/5] Extracting metadata from markdown files...")
-    metadata = extract_all_metadata(args.content, exclude, args.verbose)
-
-    # Save metadata
+    # Created/last-updated dates and authors from one git log pass (cached by HEAD)
+    history = {}
+    if args.git_history:
+        try:
+            state = update_history(load_history(args.history_state), args.content,
+                                   verbose=args.verbose)
+            save_history(state, args.history_state)
+            history = state['files']
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            print(f"      Warning: git history unavailable, skipping ({e})")
+
+    # Each record gets its git history and is written to metadata.ndjson (and
+    # metadata.json) and indexed (type, tag, chapter, component, due date) as
+    # soon as it is parsed. The index keeps every record: the hierarchy and
+    # task steps below need the whole corpus, so memory is not bounded.
+    ndjson_path = args.output / 'metadata.ndjson'
     metadata_path = args.output / 'metadata.json'
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
-    print(f"      Saved {len(metadata)} file metadata records to {metadata_path}")
+    content_index = ContentIndex()
+    with MetadataWriter(ndjson_path, metadata_path if args.metadata_json else None) as writer:
+        for rel_path, file_meta in iter_metadata(args.content, exclude, args.verbose):
+            file_meta = with_history(file_meta, history.get(rel_path))
+            writer.write(rel_path, file_meta)
+            content_index.add(rel_path, file_meta)
+    metadata = content_index.metadata
+    print(f"      Saved {writer.count} file metadata records to {ndjson_path}")
+
+    # metadata.json is what eleventyComputed.js reads (titles, TOC, history)
+    if args.metadata_json:
+        print(f"      Saved {len(metadata)} file metadata records to {metadata_path}")
+    elif metadata_path.exists():
+        # A leftover copy would silently serve stale titles, TOCs and dates
+        metadata_path.unlink()
+        print(f"      Warning: removed stale {metadata_path} (--no-metadata-json); "
+              "pages fall back to file-name titles without TOC or history")
 
     # Step 2: Generate hierarchy tree
     print("\n[2/5] Generating hierarchy tree...")
-    hierarchy = generate_hierarchy(args.content, metadata, exclude, args.verbose)
+    hierarchy = generate_hierarchy(args.content, metadata, exclude, args.verbose).to_dict()
 
-    # Add documentation hierarchy (from uu_framework/docs/, rendered to /docs/)
+    # Parse uu_framework/docs once (cached by size/mtime) into the bundle
+    # loaded by docsContent.js, and add its hierarchy (rendered to /docs/)
     print("\n[2b/5] Adding documentation hierarchy...")
-    docs_hierarchy = generate_docs_hierarchy(args.docs, args.verbose)
+    docs_cache = load_cache(args.docs_cache)
+    docs = build_docs_bundle(args.docs, docs_cache, args.verbose)
+    save_cache(docs_cache, args.docs_cache)
+    docs_bundle_path = args.output / 'docs_bundle.json'
+    with open(docs_bundle_path, 'w', encoding='utf-8') as f:
+        json.dump(docs, f, indent=2, ensure_ascii=False)
+    print(f"      Saved {len(docs)} docs to {docs_bundle_path}")
+
+    docs_hierarchy = generate_docs_hierarchy(docs, args.verbose)
     if docs_hierarchy and 'children' in hierarchy:
         hierarchy['children'].append(docs_hierarchy)
         print(f"      Added docs section with {len(docs_hierarchy['children'])} subsections")
@@ -369,10 +409,11 @@ def main():
     with open(hierarchy_path, 'w', encoding='utf-8') as f:
         json.dump(hierarchy, f, indent=2, ensure_ascii=False)
     print(f"      Saved hierarchy to {hierarchy_path}")
+    content_index.set_hierarchy(hierarchy)
 
     # Step 3: Aggregate tasks (homework, exams, projects)
     print("\n[3/5] Aggregating tasks...")
-    tasks = aggregate_all_tasks(args.content, metadata, args.verbose)
+    tasks = tasks_to_dict(aggregate_all_tasks(args.content, metadata, args.verbose, index=content_index))
 
     # Save tasks
     tasks_path = args.output / 'tasks.json'
@@ -391,6 +432,29 @@ def main():
         json.dump(calendar_topics, f, indent=2, ensure_ascii=False)
     print(f"      Saved {len(calendar_topics)} calendar entries to {calendar_path}")
 
+    # Merge topics and task dates into the calendar index and .ics feed
+    calendar_index = build_calendar_index(calendar_topics, tasks, args.verbose)
+    calendar_index_path = args.output / 'calendar_index.json'
+    with open(calendar_index_path, 'w', encoding='utf-8') as f:
+        json.dump(calendar_index, f, indent=2, ensure_ascii=False)
+    print(f"      Saved {len(calendar_index['days'])} calendar days to {calendar_index_path}")
+
+    ics_path = args.output / 'calendario.ics'
+    with open(ics_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(build_ics(calendar_index, config.get('site', {}),
+                          stamp=source_stamp(calendar_index, history)))
+    print(f"      Saved calendar feed to {ics_path}")
+
+    # Step 4b: Generate responsive image variants (cached by source hash)
+    print("\n[4b/5] Generating responsive image variants...")
+    image_manifest, image_failures = process_images(args.content, config, verbose=args.verbose)
+
+    # Save image manifest
+    image_manifest_path = args.output / 'image_manifest.json'
+    with open(image_manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(image_manifest, f, indent=2, ensure_ascii=False)
+    print(f"      Saved {len(image_manifest)} image records to {image_manifest_path}")
+
     # Save site config for templates
     site_path = args.output / 'site.json'
     with open(site_path, 'w', encoding='utf-8') as f:
@@ -409,6 +473,10 @@ def main():
         json.dump(repo_config, f, indent=2, ensure_ascii=False)
     print(f"      Saved repository config to {repo_path}")
 
+    if image_failures:
+        print(f"\nERROR: {image_failures} image variants failed to encode (see above)")
+        return 1
+
     print("\n" + "=" * 60)
     print("Preprocessing complete!")
     print("=" * 60)
@@ -4,12 +4,24 @@ Process calendar topics from CSV file.
 
 Reads clase/calendario_temas.csv and converts it to JSON format for use in templates.
 Creates a placeholder CSV if it doesn't exist, but NEVER overwrites existing data.
+
+Also merges the topics with the aggregated tasks into a date-keyed calendar
+index (with precomputed month grids) and an iCalendar (.ics) feed.
 """
 
 import csv
 import json
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
+
+# Task lists in tasks.json, in the order they are shown on a day
+TASK_GROUPS = ('homework', 'exams', 'projects')
+TASK_BADGES = {'homework': 'HW', 'exam': 'EX', 'project': 'PR'}
+
+MONTH_NAMES = [
+    'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+    'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
+]
 
 
 def create_placeholder_csv(csv_path: Path):
@@ -114,6 +126,210 @@ def process_calendar_topics(csv_path: Path, verbose: bool = False) -> list:
     return topics
 
 
+def task_date(task: dict) -> str:
+    """Date a task lands on: due date for homework/projects, date for exams."""
+    return task.get('due') or task.get('date')
+
+
+def month_grid(year: int, month: int) -> list:
+    """
+    Sunday-first 6x7 grid for a month, including the padding days of the
+    previous and next month (always 42 cells, like the calendar page).
+    """
+    first = date(year, month, 1)
+    start = first - timedelta(days=(first.weekday() + 1) % 7)
+    weeks = []
+    for w in range(6):
+        week = []
+        for d in range(7):
+            day = start + timedelta(days=w * 7 + d)
+            week.append({
+                'date': day.isoformat(),
+                'day': day.day,
+                'in_month': day.month == month
+            })
+        weeks.append(week)
+    return weeks
+
+
+def build_calendar_index(topics: list, tasks: dict, verbose: bool = False) -> dict:
+    """
+    Merge class sessions, holidays and task dates into one date-keyed index.
+
+    Returns a dictionary with:
+    - tasks: every dated task, sorted by date
+    - days: {YYYY-MM-DD: {topic, tasks}} where tasks are indices into `tasks`
+    - months: {YYYY-MM: {year, month, title, weeks}} with precomputed grids
+      for every month between the first and last dated entry
+    - range: first and last month keys (None when there is nothing dated)
+    """
+    dated = []
+    for group in TASK_GROUPS:
+        for task in tasks.get(group, []):
+            if task_date(task):
+                dated.append(task)
+    # Stable sort keeps homework before exams before projects on the same day
+    dated.sort(key=task_date)
+
+    days = {}
+    for topic in topics:
+        days[topic['date']] = {
+            'topic': {
+                'clase': topic['clase'],
+                'topic': topic['topic'],
+                'is_holiday': topic['is_holiday']
+            },
+            'tasks': []
+        }
+    for i, task in enumerate(dated):
+        day = days.setdefault(task_date(task), {'topic': None, 'tasks': []})
+        day['tasks'].append(i)
+    days = dict(sorted(days.items()))
+
+    months = {}
+    if days:
+        year, month = map(int, next(iter(days))[:7].split('-'))
+        last = next(reversed(days))[:7]
+        while f"{year:04d}-{month:02d}" <= last:
+            months[f"{year:04d}-{month:02d}"] = {
+                'year': year,
+                'month': month,
+                'title': f"{MONTH_NAMES[month - 1]} {year}",
+                'weeks': month_grid(year, month)
+            }
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    if verbose:
+        print(f"      Indexed {len(days)} calendar days across {len(months)} months")
+
+    return {
+        'tasks': dated,
+        'days': days,
+        'months': months,
+        'range': {
+            'first': next(iter(months), None),
+            'last': next(reversed(months), None)
+        }
+    }
+
+
+def _ics_escape(text: str) -> str:
+    """Escape a TEXT value (RFC 5545 section 3.3.11)."""
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def _ics_fold(line: str) -> str:
+    """Fold a content line at 75 octets without splitting UTF-8 characters."""
+    parts = []
+    current, size = '', 0
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > 75:
+            parts.append(current)
+            current, size = ' ', 1
+        current += char
+        size += width
+    parts.append(current)
+    return '\r\n'.join(parts)
+
+
+def source_stamp(index: dict, history: dict = None, csv_name: str = 'calendario_temas.csv') -> datetime:
+    """
+    DTSTAMP for the feed, derived from its sources so rebuilding unchanged
+    content gives a byte-identical .ics.
+
+    The latest commit date (git_history.py entries, keyed by content path)
+    of the topics CSV and of the files defining the tasks; without history,
+    midnight UTC of the first calendar day.
+    """
+    history = history or {}
+    files = [csv_name] + [task['file'] for task in index['tasks'] if task.get('file')]
+    stamps = [history[f]['updated_ts'] for f in files if f in history]
+    if stamps:
+        return datetime.fromtimestamp(max(stamps), timezone.utc)
+    if index['days']:
+        return datetime.combine(date.fromisoformat(min(index['days'])), datetime.min.time(),
+                                timezone.utc)
+    return datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def build_ics(index: dict, site: dict, stamp: datetime = None) -> str:
+    """
+    Render the calendar index as an iCalendar feed.
+
+    One all-day event per class session, holiday and task date. UIDs are
+    stable across builds so subscribed clients update events in place.
+    `stamp` defaults to source_stamp(index).
+    """
+    stamp = (stamp or source_stamp(index)).astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    name = site.get('name', 'Calendario')
+    domain = site.get('domain', '')
+    site_url = f"https://{domain}{site.get('base_url', '')}" if domain else ''
+    uid_host = domain or 'uu_framework'
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f"PRODID:-//{_ics_escape(name)}//uu_framework//ES",
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f"X-WR-CALNAME:{_ics_escape(name)}",
+        'X-WR-TIMEZONE:America/Mexico_City',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT12H',
+        'X-PUBLISHED-TTL:PT12H',
+    ]
+
+    def event(day, uid, summary, description='', url='', category=''):
+        start = date.fromisoformat(day)
+        lines.extend([
+            'BEGIN:VEVENT',
+            f"UID:{uid}@{uid_host}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{(start + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{_ics_escape(summary)}",
+        ])
+        if description:
+            lines.append(f"DESCRIPTION:{_ics_escape(description)}")
+        if url:
+            lines.append(f"URL:{url}")
+        if category:
+            lines.append(f"CATEGORIES:{_ics_escape(category)}")
+        lines.extend(['TRANSP:TRANSPARENT', 'END:VEVENT'])
+
+    for day, entry in index['days'].items():
+        topic = entry['topic']
+        if topic is None:
+            continue
+        if topic['is_holiday']:
+            event(day, f"asueto-{day}", 'Asueto', 'No hay clase', category='Asueto')
+        else:
+            summary = f"Clase {topic['clase']}"
+            if topic['topic']:
+                summary += f": {topic['topic']}"
+            event(day, f"clase-{day}", summary, topic['topic'], category='Clase')
+
+    for task in index['tasks']:
+        details = []
+        if task.get('points'):
+            details.append(f"{task['points']} puntos")
+        if task.get('chapter'):
+            details.append(task['chapter'])
+        if task.get('duration'):
+            details.append(f"Duración: {task['duration']}")
+        description = ' • '.join(details)
+        if task.get('summary'):
+            description += f"\n\n{task['summary']}"
+        url = f"{site_url}{task['url']}" if site_url and task.get('url') else ''
+        event(task_date(task), f"{task['type']}-{task['id']}-{task_date(task)}",
+              f"[{TASK_BADGES.get(task['type'], task['type'])}] {task['id']}: {task['title']}",
+              description, url, category=task['type'])
+
+    lines.append('END:VCALENDAR')
+    return ''.join(_ics_fold(line) + '\r\n' for line in lines)
+
+
 def main():
     """Test function for standalone execution."""
     import sys
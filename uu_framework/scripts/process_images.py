@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Image Derivative Generation Script
+
+Generates resized WebP/AVIF variants of content images (files inside
+*/images/ directories) plus width/height metadata, and writes a manifest
+that templates use for srcset and lazy loading.
+
+Derivatives are cached by source hash and target spec, so unchanged images
+are never re-encoded. Encoding runs in a process pool.
+
+Requires Pillow (pip install pillow). AVIF needs a Pillow build with AVIF
+support; formats Pillow cannot encode are skipped with a warning.
+
+Usage:
+    python3 process_images.py [CONTENT_DIR]
+    python3 process_images.py --publish _site
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+
+DEFAULT_IMAGE_CONFIG = {
+    'widths': [480, 960, 1600],
+    'formats': ['webp', 'avif'],
+    'quality': 80,
+    'cache_dir': 'uu_framework/.cache/images',
+    'url_prefix': '/img',
+    'exclude': ['b_libros'],
+}
+
+# Pillow format names for each output extension
+PIL_FORMATS = {
+    'webp': 'WEBP',
+    'avif': 'AVIF',
+}
+
+
+def get_image_config(config: dict) -> dict:
+    """Merge the `images` section of site.yaml over the defaults."""
+    image_config = dict(DEFAULT_IMAGE_CONFIG)
+    image_config.update((config or {}).get('images', {}) or {})
+    return image_config
+
+
+def file_hash(filepath: Path) -> str:
+    """Calculate SHA-256 hash of file content."""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_content_images(content_dir: Path, exclude: List[str]) -> List[Path]:
+    """Find all images stored in */images/ directories of the content tree."""
+    images = []
+    for path in sorted(Path(content_dir).rglob('*')):
+        if path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+            continue
+        if 'images' not in path.parent.parts:
+            continue
+        rel_path = str(path.relative_to(content_dir))
+        if any(excl in rel_path for excl in exclude):
+            continue
+        images.append(path)
+    return images
+
+
+def target_widths(source_width: int, widths: List[int]) -> List[int]:
+    """
+    Widths to generate for a source image.
+
+    Never upscales: keeps configured widths smaller than the source, plus the
+    source width itself (capped at the largest configured width).
+    """
+    targets = {w for w in widths if w < source_width}
+    targets.add(min(source_width, max(widths)))
+    return sorted(targets)
+
+
+def derivative_name(source_hash: str, width: int, fmt: str, quality: int) -> str:
+    """Cache file name for a derivative: source hash + target spec."""
+    return f"{source_hash[:16]}-{width}w-q{quality}.{fmt}"
+
+
+def load_pillow():
+    """Import Pillow, registering the AVIF plugin when it is installed."""
+    from PIL import Image
+
+    # Older Pillow builds only encode AVIF through pillow-avif-plugin
+    try:
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        pass
+    return Image
+
+
+def supported_formats(formats: List[str]) -> List[str]:
+    """Return the subset of formats the installed Pillow can encode."""
+    Image = load_pillow()
+    Image.init()
+
+    available = []
+    for fmt in formats:
+        pil_format = PIL_FORMATS.get(fmt)
+        if pil_format is None:
+            print(f"      Warning: unknown image format '{fmt}', skipping")
+            continue
+        if pil_format not in Image.SAVE:
+            print(f"      Warning: Pillow cannot encode {fmt}, skipping {fmt} variants")
+            continue
+        available.append(fmt)
+    return available
+
+
+def encode_variant(source: str, target: str, width: int, fmt: str, quality: int) -> str:
+    """
+    Resize and encode a single derivative (runs in a worker process).
+
+    Writes to a temporary file first so an interrupted build never leaves a
+    truncated file in the cache.
+    """
+    Image = load_pillow()
+
+    with Image.open(source) as img:
+        if img.width != width:
+            height = round(img.height * width / img.width)
+            img = img.resize((width, height), Image.LANCZOS)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+        tmp_target = f"{target}.tmp"
+        img.save(tmp_target, format=PIL_FORMATS[fmt], quality=quality)
+    os.replace(tmp_target, target)
+    return target
+
+
+def process_images(
+    content_dir: Path,
+    config: dict = None,
+    workers: Optional[int] = None,
+    verbose: bool = False
+) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """
+    Generate derivatives for all content images.
+
+    Variants whose encode fails are left out of the manifest, so pages never
+    reference a derivative that was not produced.
+
+    Returns:
+        (manifest, failed): number of failed encodes, and a manifest dict
+        mapping content-relative image paths to:
+        {
+            'width': 1500, 'height': 750, 'hash': '...',
+            'src': '/08_containers/images/exp1_startup.png',
+            'variants': [{'format': 'webp', 'width': 480, 'height': 240,
+                          'url': '/img/<hash>-480w-q80.webp'}, ...]
+        }
+    """
+    image_config = get_image_config(config)
+
+    try:
+        from PIL import Image
+    except ImportError:
+        print("      Warning: Pillow not installed, skipping image derivatives")
+        print("      Install with: pip install pillow")
+        return {}, 0
+
+    content_path = Path(content_dir)
+    if not content_path.exists():
+        print(f"      Warning: Content directory {content_dir} does not exist")
+        return {}, 0
+
+    cache_dir = Path(image_config['cache_dir'])
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    formats = supported_formats(image_config['formats'])
+    widths = sorted(int(w) for w in image_config['widths'])
+    quality = int(image_config['quality'])
+    url_prefix = image_config['url_prefix'].rstrip('/')
+
+    manifest = {}
+    jobs = []
+
+    for image_path in find_content_images(content_path, image_config['exclude']):
+        rel_path = str(image_path.relative_to(content_path))
+        source_hash = file_hash(image_path)
+
+        with Image.open(image_path) as img:
+            source_width, source_height = img.size
+
+        entry = {
+            'width': source_width,
+            'height': source_height,
+            'hash': source_hash,
+            'src': '/' + rel_path,
+            'variants': [],
+        }
+
+        for fmt in formats:
+            for width in target_widths(source_width, widths):
+                name = derivative_name(source_hash, width, fmt, quality)
+                target = cache_dir / name
+                entry['variants'].append({
+                    'format': fmt,
+                    'width': width,
+                    'height': round(source_height * width / source_width),
+                    'url': f"{url_prefix}/{name}",
+                })
+                if not target.exists():
+                    jobs.append((str(image_path), str(target), width, fmt, quality))
+
+        manifest[rel_path] = entry
+
+    failed = set()
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(encode_variant, *job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    future.result()
+                    if verbose:
+                        print(f"      Encoded: {Path(job[1]).name}")
+                except Exception as e:
+                    failed.add(f"{url_prefix}/{Path(job[1]).name}")
+                    print(f"      Error encoding {job[0]} ({job[3]}, {job[2]}w): {e}")
+
+    if failed:
+        for entry in manifest.values():
+            entry['variants'] = [v for v in entry['variants'] if v['url'] not in failed]
+
+    total_variants = sum(len(e['variants']) for e in manifest.values())
+    print(f"      {len(manifest)} images, {total_variants} variants "
+          f"({len(jobs) - len(failed)} encoded, {total_variants - len(jobs) + len(failed)} cached"
+          f"{f', {len(failed)} failed' if failed else ''})")
+
+    return manifest, len(failed)
+
+
+def publish_derivatives(
+    manifest: Dict[str, Dict[str, Any]],
+    site_dir: Path,
+    config: dict = None,
+    verbose: bool = False
+) -> Tuple[int, int]:
+    """
+    Copy the derivatives listed in the manifest into the built site.
+
+    Only manifest entries are published, so stale cache files never ship.
+    Returns (published, missing): missing derivatives are listed in the
+    manifest but absent from the cache, and would 404 on the site.
+    """
+    image_config = get_image_config(config)
+    cache_dir = Path(image_config['cache_dir'])
+    url_prefix = image_config['url_prefix'].strip('/')
+
+    out_dir = Path(site_dir) / url_prefix
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    published = missing = 0
+    for entry in manifest.values():
+        for variant in entry['variants']:
+            name = variant['url'].rsplit('/', 1)[-1]
+            source = cache_dir / name
+            if not source.exists():
+                print(f"      Missing derivative: {source} ({entry['src']})")
+                missing += 1
+                continue
+            target = out_dir / name
+            if not target.exists():
+                shutil.copy2(source, target)
+                if verbose:
+                    print(f"      Published: {target}")
+            published += 1
+
+    return published, missing
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate responsive image derivatives')
+    parser.add_argument('content', type=Path, nargs='?', default=Path('clase'),
+                        help='Path to content directory')
+    parser.add_argument('--config', type=Path,
+                        default=Path('uu_framework/config/site.yaml'),
+                        help='Path to site configuration')
+    parser.add_argument('--manifest', type=Path,
+                        default=Path('uu_framework/eleventy/_data/image_manifest.json'),
+                        help='Path to image manifest')
+    parser.add_argument('--publish', type=Path, metavar='SITE_DIR',
+                        help='Copy derivatives from the manifest into SITE_DIR')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of encoder processes (default: CPU count)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Enable verbose output')
+    args = parser.parse_args()
+
+    try:
+        import yaml
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    except (ImportError, FileNotFoundError):
+        config = {}
+
+    if args.publish:
+        if not args.manifest.exists():
+            print(f"Error: manifest not found at {args.manifest}")
+            print("Run preprocessing first: python3 uu_framework/scripts/preprocess.py")
+            return 1
+        with open(args.manifest, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        count, missing = publish_derivatives(manifest, args.publish, config, args.verbose)
+        print(f"Published {count} image derivatives to {args.publish}")
+        if missing:
+            print(f"Error: {missing} derivatives in the manifest are missing from the cache")
+            print("Re-run preprocessing: python3 uu_framework/scripts/preprocess.py")
+            return 1
+        return 0
+
+    manifest, failed = process_images(args.content, config, args.workers, args.verbose)
+    args.manifest.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    print(f"Saved image manifest to {args.manifest}")
+    if failed:
+        print(f"Error: {failed} image variants failed to encode")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
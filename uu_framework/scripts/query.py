@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Content Query API
+
+In-memory indexes over the preprocessor outputs, so tooling and pipeline
+stages can look pages up by type, tag, chapter, component type or due date
+without re-scanning the whole metadata dict.
+
+A ContentIndex is built once, either from the JSON files in _data
+(ContentIndex.load), from the in-memory results of the preprocessor
+(ContentIndex(metadata, hierarchy)), or record by record as pages are
+parsed (index.add(path, meta), then index.set_hierarchy(tree)). Exact-key
+lookups are dict hits; date ranges use bisect over a sorted list of due
+dates.
+
+Usage:
+    from query import ContentIndex
+
+    index = ContentIndex.load('uu_framework/eleventy/_data')
+    index.pages_with_tag('git')
+    index.components('homework', chapter='06_git')
+    index.due_between('2026-02-01', '2026-02-28')
+
+    python3 query.py --type homework --due-from 2026-02-01
+"""
+
+import re
+import sys
+import json
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from aggregate_tasks import get_chapter_name
+from records import Component, FileMetadata
+
+
+DEFAULT_DATA_DIR = Path('uu_framework/eleventy/_data')
+
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Component attribute holding the date a component is due on
+DATE_ATTRS = ('due', 'date')
+
+
+def _as_date(value: Any) -> Optional[str]:
+    """ISO date string (YYYY-MM-DD) from a frontmatter/attribute value, or None."""
+    if value is None:
+        return None
+    value = str(value).strip()[:10]
+    return value if DATE_RE.match(value) else None
+
+
+def _as_list(value: Any) -> List[str]:
+    """Frontmatter tags may be a list, a single string or missing."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value]
+
+
+def chapter_of(path: str) -> str:
+    """Top-level content directory of a path ('' for root-level files)."""
+    head, sep, _ = path.partition('/')
+    return head if sep else ''
+
+
+class ContentIndex:
+    """
+    Secondary indexes over metadata.json (and optionally hierarchy.json).
+
+    All lookups return paths (keys of metadata) or (path, component) pairs in
+    metadata order, so results are stable across runs.
+    """
+
+    def __init__(self, metadata: Dict[str, FileMetadata] = None, hierarchy: Dict[str, Any] = None):
+        self.metadata: Dict[str, FileMetadata] = {}
+        self.hierarchy = None
+
+        self.by_type: Dict[str, List[str]] = {}
+        self.by_tag: Dict[str, List[str]] = {}
+        self.by_chapter: Dict[str, List[str]] = {}
+        self.by_component: Dict[str, List[Tuple[str, Component]]] = {}
+        self.by_chapter_component: Dict[Tuple[str, str], List[Tuple[str, Component]]] = {}
+        self.chapter_names: Dict[str, str] = {}
+
+        # Sorted (date, seq) keys with a parallel list of entries, for bisect;
+        # entries added since the last sort wait in _due_pending
+        self._due_keys: List[Tuple[str, int]] = []
+        self._due_entries: List[Tuple[str, str, Optional[Component]]] = []
+        self._due_pending: List[Tuple[str, str, Optional[Component]]] = []
+
+        # Hierarchy nodes by path, and each node's parent path
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.parents: Dict[str, str] = {}
+
+        for path, meta in (metadata or {}).items():
+            self.add(path, meta)
+        if hierarchy:
+            self.set_hierarchy(hierarchy)
+
+    @classmethod
+    def load(cls, data_dir: Path = DEFAULT_DATA_DIR) -> 'ContentIndex':
+        """Build the index from metadata.json (and hierarchy.json if present)."""
+        data_dir = Path(data_dir)
+        with open(data_dir / 'metadata.json', encoding='utf-8') as f:
+            metadata = {path: FileMetadata.from_dict(meta) for path, meta in json.load(f).items()}
+        hierarchy = None
+        hierarchy_path = data_dir / 'hierarchy.json'
+        if hierarchy_path.exists():
+            with open(hierarchy_path, encoding='utf-8') as f:
+                hierarchy = json.load(f)
+        return cls(metadata, hierarchy)
+
+    def add(self, path: str, meta: FileMetadata) -> None:
+        """Index one page (e.g. as it is streamed out of iter_metadata)."""
+        self.metadata[path] = meta
+        self.by_type.setdefault(meta.type or 'lesson', []).append(path)
+
+        for tag in _as_list(meta.tags):
+            self.by_tag.setdefault(tag.lower(), []).append(path)
+
+        chapter = chapter_of(path)
+        self.by_chapter.setdefault(chapter, []).append(path)
+        if chapter:
+            self.chapter_names.setdefault(get_chapter_name(path).lower(), chapter)
+
+        page_due = _as_date(meta.due_date)
+        if page_due:
+            self._due_pending.append((page_due, path, None))
+
+        for comp in meta.components:
+            comp_type = comp.type.value
+            self.by_component.setdefault(comp_type, []).append((path, comp))
+            self.by_chapter_component.setdefault((chapter, comp_type), []).append((path, comp))
+            for attr in DATE_ATTRS:
+                comp_due = _as_date(comp.attrs.get(attr))
+                if comp_due:
+                    self._due_pending.append((comp_due, path, comp))
+                    break
+
+    def set_hierarchy(self, hierarchy: Dict[str, Any]) -> None:
+        """Attach (or replace) the hierarchy tree used by node/parent/children."""
+        self.hierarchy = hierarchy
+        self.nodes = {}
+        self.parents = {}
+        self._index_tree(hierarchy, None)
+
+    def _sort_due(self) -> None:
+        if not self._due_pending:
+            return
+        # Python's sort is stable: same-day entries keep metadata order
+        due = self._due_entries + self._due_pending
+        due.sort(key=lambda entry: entry[0])
+        self._due_keys = [(entry[0], i) for i, entry in enumerate(due)]
+        self._due_entries = due
+        self._due_pending = []
+
+    def _index_tree(self, node: Dict[str, Any], parent: Optional[str]) -> None:
+        path = node.get('path', '')
+        self.nodes[path] = node
+        if parent is not None:
+            self.parents[path] = parent
+        for child in node.get('children', []):
+            self._index_tree(child, path)
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+
+    def page(self, path: str) -> Optional[FileMetadata]:
+        """Metadata for a content-relative path (e.g. '06_git/01_intro.md')."""
+        return self.metadata.get(path)
+
+    def pages_of_type(self, page_type: str) -> List[str]:
+        """Paths whose frontmatter `type` matches (lesson, homework, ...)."""
+        return self.by_type.get(page_type, [])
+
+    def pages_with_tag(self, tag: str) -> List[str]:
+        """Paths tagged with `tag` (case-insensitive)."""
+        return self.by_tag.get(tag.lower(), [])
+
+    def resolve_chapter(self, chapter: str) -> str:
+        """Chapter directory from a directory name or a display name ('Git')."""
+        if chapter in self.by_chapter:
+            return chapter
+        return self.chapter_names.get(chapter.lower(), chapter)
+
+    def pages_in_chapter(self, chapter: str) -> List[str]:
+        """Paths under a top-level chapter directory."""
+        return self.by_chapter.get(self.resolve_chapter(chapter), [])
+
+    # ------------------------------------------------------------------
+    # Components and dates
+    # ------------------------------------------------------------------
+
+    def components(self, comp_type: str, chapter: str = None) -> List[Tuple[str, Component]]:
+        """(path, component) pairs of a component type, optionally in one chapter."""
+        if chapter is None:
+            return self.by_component.get(comp_type, [])
+        return self.by_chapter_component.get((self.resolve_chapter(chapter), comp_type), [])
+
+    def due_between(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Tuple[str, str, Optional[Component]]]:
+        """
+        (date, path, component) for everything due in [start, end], by date.
+
+        Either bound may be omitted. `component` is None for pages whose
+        frontmatter sets `due_date`.
+        """
+        self._sort_due()
+        lo = bisect_left(self._due_keys, (start, -1)) if start else 0
+        hi = bisect_right(self._due_keys, (end, len(self._due_keys))) if end else len(self._due_keys)
+        return self._due_entries[lo:hi]
+
+    def due_on(self, date: str) -> List[Tuple[str, str, Optional[Component]]]:
+        """Everything due on a single date."""
+        return self.due_between(date, date)
+
+    # ------------------------------------------------------------------
+    # Hierarchy
+    # ------------------------------------------------------------------
+
+    def node(self, path: str) -> Optional[Dict[str, Any]]:
+        """Hierarchy node for a path ('' is the root); requires hierarchy."""
+        return self.nodes.get(path)
+
+    def parent(self, path: str) -> Optional[Dict[str, Any]]:
+        """Parent hierarchy node of a path."""
+        parent = self.parents.get(path)
+        return self.nodes.get(parent) if parent is not None else None
+
+    def children(self, path: str) -> List[Dict[str, Any]]:
+        """Child hierarchy nodes of a directory path."""
+        node = self.nodes.get(path)
+        return node.get('children', []) if node else []
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query the preprocessed content index')
+    parser.add_argument('--data', type=Path, default=DEFAULT_DATA_DIR,
+                        help='Directory with metadata.json / hierarchy.json')
+    parser.add_argument('--type', dest='comp_type',
+                        help='Component type (homework, exam, project, exercise, ...)')
+    parser.add_argument('--tag', help='Pages with this tag')
+    parser.add_argument('--chapter', help='Restrict to a chapter (directory or display name)')
+    parser.add_argument('--due-from', help='Due on or after YYYY-MM-DD')
+    parser.add_argument('--due-to', help='Due on or before YYYY-MM-DD')
+    args = parser.parse_args()
+
+    index = ContentIndex.load(args.data)
+
+    if args.due_from or args.due_to:
+        chapter = index.resolve_chapter(args.chapter) if args.chapter else None
+        for date, path, comp in index.due_between(args.due_from, args.due_to):
+            if comp is not None and args.comp_type and comp.type != args.comp_type:
+                continue
+            if chapter is not None and chapter_of(path) != chapter:
+                continue
+            label = comp.attrs.get('title', comp.type.value) if comp else index.page(path).title
+            print(f"{date}  {path}  {label}")
+    elif args.comp_type:
+        for path, comp in index.components(args.comp_type, args.chapter):
+            print(f"{path}  {comp.attrs.get('id', '')}  {comp.attrs.get('title', '')}")
+    elif args.tag:
+        for path in index.pages_with_tag(args.tag):
+            print(path)
+    elif args.chapter:
+        for path in index.pages_in_chapter(args.chapter):
+            print(path)
+    else:
+        print(f"{len(index.metadata)} pages, {len(index.due_between())} dated entries")
+        for comp_type, found in sorted(index.by_component.items()):
+            print(f"  {comp_type}: {len(found)}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
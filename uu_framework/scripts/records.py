@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Record Types
+
+Slotted dataclasses for the preprocessor's per-page, per-node and per-task
+records. They replace one dict per record (with its repeated string keys and
+mostly-None values) by fixed slots, and closed vocabularies (node, component
+and task types) by str Enums whose members are shared singletons.
+
+Each record has to_dict()/from_dict() producing the exact JSON shapes of
+metadata.json, hierarchy.json and tasks.json, so templates are unaffected.
+"""
+
+import sys
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class NodeType(str, Enum):
+    ROOT = 'root'
+    DIRECTORY = 'directory'
+    FILE = 'file'
+    CODE = 'code'
+
+
+class ComponentType(str, Enum):
+    HOMEWORK = 'homework'
+    EXERCISE = 'exercise'
+    PROMPT = 'prompt'
+    EXAMPLE = 'example'
+    EXAM = 'exam'
+    PROJECT = 'project'
+
+
+class TaskType(str, Enum):
+    HOMEWORK = 'homework'
+    EXAM = 'exam'
+    PROJECT = 'project'
+
+    @property
+    def group(self) -> str:
+        """Key of this task type's list in tasks.json."""
+        return TASK_GROUPS[self]
+
+
+TASK_GROUPS = {
+    TaskType.HOMEWORK: 'homework',
+    TaskType.EXAM: 'exams',
+    TaskType.PROJECT: 'projects',
+}
+
+
+def intern(value: Any) -> Any:
+    """Intern strings that repeat across records (page types, tags, chapters)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True)
+class Component:
+    """A :::type{attrs} block found in a page."""
+    type: ComponentType
+    attrs: Dict[str, str]
+    content_preview: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': self.type.value,
+            'attrs': self.attrs,
+            'content_preview': self.content_preview,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Component':
+        return cls(ComponentType(data['type']), data.get('attrs', {}),
+                   data.get('content_preview', ''))
+
+
+@dataclass(frozen=True, slots=True)
+class Heading:
+    """A heading of a page, its rendered anchor (slug) and its subheadings."""
+    level: int
+    text: str
+    slug: str
+    children: Tuple['Heading', ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'level': self.level,
+            'text': self.text,
+            'slug': self.slug,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Heading':
+        return cls(data['level'], data['text'], data['slug'],
+                   tuple(cls.from_dict(c) for c in data.get('children', [])))
+
+
+@dataclass(frozen=True, slots=True)
+class FileMetadata:
+    """Metadata of one markdown file (a value of metadata.json)."""
+    path: str
+    title: str
+    type: str = 'lesson'
+    order: Any = 999
+    date: Any = None
+    summary: Optional[str] = None
+    # A tuple when frontmatter gives a list; any other value is kept as-is
+    tags: Any = ()
+    due_date: Any = None
+    components: Tuple[Component, ...] = ()
+    has_frontmatter: bool = False
+    headings: Tuple[Heading, ...] = ()
+    word_count: int = 0
+    reading_time: int = 0
+    code_blocks: int = 0
+    # From git history (git_history.py): ISO commit dates and author names
+    created: Optional[str] = None
+    last_updated: Optional[str] = None
+    authors: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'title': self.title,
+            'type': self.type,
+            'order': self.order,
+            'date': self.date,
+            'summary': self.summary,
+            'tags': list(self.tags) if isinstance(self.tags, tuple) else self.tags,
+            'due_date': self.due_date,
+            'components': [comp.to_dict() for comp in self.components],
+            'has_frontmatter': self.has_frontmatter,
+            'headings': [heading.to_dict() for heading in self.headings],
+            'word_count': self.word_count,
+            'reading_time': self.reading_time,
+            'code_blocks': self.code_blocks,
+            'created': self.created,
+            'last_updated': self.last_updated,
+            'authors': list(self.authors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FileMetadata':
+        tags = data.get('tags', [])
+        return cls(
+            path=data.get('path', ''),
+            title=data.get('title', ''),
+            type=intern(data.get('type', 'lesson')),
+            order=data.get('order', 999),
+            date=data.get('date'),
+            summary=data.get('summary'),
+            tags=tuple(intern(t) for t in tags) if isinstance(tags, list) else tags,
+            due_date=data.get('due_date'),
+            components=tuple(Component.from_dict(c) for c in data.get('components', [])),
+            has_frontmatter=data.get('has_frontmatter', False),
+            headings=tuple(Heading.from_dict(h) for h in data.get('headings', [])),
+            word_count=data.get('word_count', 0),
+            reading_time=data.get('reading_time', 0),
+            code_blocks=data.get('code_blocks', 0),
+            created=data.get('created'),
+            last_updated=data.get('last_updated'),
+            authors=tuple(intern(a) for a in data.get('authors', [])),
+        )
+
+
+@dataclass(slots=True)
+class TreeNode:
+    """
+    A node of hierarchy.json. Mutable so children can be filled in and
+    sorted while the tree is built.
+    """
+    name: str
+    path: str
+    type: NodeType
+    title: str = ''
+    order: Optional[tuple] = None
+    summary: Optional[str] = None
+    has_index: bool = False
+    # Only emitted when set (root-level files carry it, nested ones don't)
+    no_number: Optional[bool] = None
+    children: List['TreeNode'] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        node = {'name': self.name, 'path': self.path, 'type': self.type.value}
+        if self.type is NodeType.ROOT:
+            node['title'] = self.title
+            node['children'] = [child.to_dict() for child in self.children]
+        elif self.type is NodeType.DIRECTORY:
+            node['order'] = self.order
+            node['children'] = [child.to_dict() for child in self.children]
+            node['has_index'] = self.has_index
+            node['title'] = self.title
+        else:
+            node['title'] = self.title
+            node['order'] = self.order
+            if self.type is NodeType.FILE:
+                node['summary'] = self.summary
+        if self.no_number is not None:
+            node['no_number'] = self.no_number
+        return node
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TreeNode':
+        order = data.get('order')
+        return cls(
+            name=data.get('name', ''),
+            path=data.get('path', ''),
+            type=NodeType(data.get('type', 'file')),
+            title=data.get('title', ''),
+            order=tuple(order) if isinstance(order, list) else order,
+            summary=data.get('summary'),
+            has_index=data.get('has_index', False),
+            no_number=data.get('no_number'),
+            children=[cls.from_dict(c) for c in data.get('children', [])],
+        )
+
+
+# tasks.json key order for each task type
+TASK_FIELDS = {
+    TaskType.HOMEWORK: ('id', 'title', 'due', 'points', 'chapter', 'file', 'url',
+                        'summary', 'overdue'),
+    TaskType.EXAM: ('id', 'title', 'date', 'location', 'duration', 'points', 'chapter',
+                    'file', 'url', 'summary', 'overdue'),
+    TaskType.PROJECT: ('id', 'title', 'due', 'points', 'team_size', 'chapter', 'file',
+                       'url', 'summary', 'overdue'),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    """A homework, exam or project (an entry of tasks.json)."""
+    type: TaskType
+    id: str
+    title: str
+    chapter: str
+    file: str
+    url: str
+    summary: str = ''
+    overdue: bool = False
+    due: Optional[str] = None
+    date: Optional[str] = None
+    location: Optional[str] = None
+    duration: Optional[str] = None
+    points: Optional[str] = None
+    team_size: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        task = {name: getattr(self, name) for name in TASK_FIELDS[self.type]}
+        task['type'] = self.type.value
+        return task
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Task':
+        task_type = TaskType(data['type'])
+        return cls(task_type, **{name: data.get(name) for name in TASK_FIELDS[task_type]})
+
+
+def metadata_to_dict(metadata: Dict[str, FileMetadata]) -> Dict[str, Dict[str, Any]]:
+    """metadata.json shape from extract_all_metadata's records."""
+    return {path: meta.to_dict() for path, meta in metadata.items()}
+
+
+def tasks_to_dict(tasks: Dict[str, List[Task]]) -> Dict[str, List[Dict[str, Any]]]:
+    """tasks.json shape from aggregate_all_tasks's records."""
+    return {group: [task.to_dict() for task in items] for group, items in tasks.items()}
@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+RegexGolf Grader
+
+Grades the regex_golf.txt files students submit for homework 7.1
+(estudiantes/<usuario>/regex/regex_golf.txt and its layout variants).
+
+Each submission is parsed into (level, regex) answers. Unique answers are
+compiled once and evaluated against the level's match/reject word lists in a
+pool of sandboxed worker processes: every pattern gets a time limit, and a
+worker stuck in catastrophic backtracking is killed and replaced instead of
+hanging the run. Patterns are also checked statically for ReDoS risk
+(nested unbounded quantifiers, overlapping alternation inside a repeat).
+
+Scoring follows alf.nu: 10 points per matched word on the left, minus 10 per
+matched word on the right, minus the regex length.
+
+Word lists are not shipped (copy them from https://alf.nu/RegexGolf) and go in
+a YAML or JSON levels file:
+
+    levels:
+      Warmup:
+        match: [afoot, catfoot, ...]
+        reject: [Atlas, Aymoro, ...]
+      It never ends:
+        match: [...]
+        reject: [...]
+        forbidden: ["$"]           # optional: substrings the level disallows
+
+Without a levels file only parsing and the ReDoS check run.
+
+Usage:
+    python3 regex_golf.py --levels levels.yaml
+    python3 regex_golf.py --levels levels.yaml --csv scores.csv --timeout 0.5
+"""
+
+import re
+import sys
+import argparse
+import json
+import time
+import unicodedata
+import multiprocessing as mp
+from multiprocessing import connection as mp_connection
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from roster import STUDENTS_DIR, load_task_paths, compile_task_paths
+
+
+TASK_ID = '7.1'
+
+LEVEL_HEADER_RE = re.compile(r'^=+\s*NIVEL\s*:\s*\[?(.+?)\]?\s*(?:\(\d+\))?\s*=+\s*$', re.IGNORECASE)
+ANSWER_RE = re.compile(r'^\s*Regex\s+usado\s*:\s*(.*?)\s*$', re.IGNORECASE)
+
+DEFAULT_TIMEOUT = 1.0          # Seconds per pattern (all words of a level)
+DEFAULT_MEMORY_LIMIT_MB = 512  # Address space limit for each worker
+
+
+# =============================================================================
+# Parsing
+# =============================================================================
+
+def normalize_level(name: str) -> str:
+    """Normalize a level name for matching ('[Anchor]' -> 'anchor')."""
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '', name.lower())
+
+
+def parse_submission(text: str) -> List[Tuple[str, str]]:
+    """
+    Parse a regex_golf.txt file into (level, regex) pairs.
+
+    The level is the closest '=== NIVEL: X ===' header, or the previous
+    non-empty line when students write bare level names.
+    """
+    answers = []
+    level = None
+    previous = None
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        header = LEVEL_HEADER_RE.match(stripped)
+        if header:
+            level = header.group(1).strip()
+            continue
+
+        answer = ANSWER_RE.match(line)
+        if answer:
+            pattern = answer.group(1)
+            if len(pattern) > 1 and pattern[0] == pattern[-1] == '`':
+                pattern = pattern[1:-1]
+            name = level or previous
+            if name and pattern:
+                answers.append((name, pattern))
+            level = None
+            continue
+
+        if stripped:
+            previous = stripped
+
+    return answers
+
+
+def find_submissions(students_dir: Path, config_path: Path) -> Dict[str, Path]:
+    """
+    Find each student's regex golf file using the roster path heuristics
+    for homework 7.1. When a student has several, the one with the most
+    parsed answers wins.
+    """
+    task_pattern = compile_task_paths(load_task_paths(config_path)).get(TASK_ID)
+    submissions = {}
+
+    for path in sorted(Path(students_dir).rglob('*')):
+        if not path.is_file():
+            continue
+        name = path.name.strip().lower()
+        if 'regex' not in name or not name.endswith('.txt'):
+            continue
+        student, *rest = path.relative_to(students_dir).parts
+        rel_path = '/'.join(rest)
+        if task_pattern and not task_pattern.search(rel_path):
+            continue
+
+        current = submissions.get(student)
+        if current is None or count_answers(path) > count_answers(current):
+            submissions[student] = path
+
+    return submissions
+
+
+def submissions_from_files(files: List[Path], students_dir: Path) -> Dict[str, Path]:
+    """
+    Key explicit submission files by student: the path component after the
+    students directory (as in find_submissions), or the whole path for files
+    outside it.
+
+    Raises:
+        ValueError: if two files belong to the same student
+    """
+    submissions = {}
+    duplicates = []
+    for path in files:
+        parts = path.parts
+        if students_dir.name in parts[:-1]:
+            student = parts[parts.index(students_dir.name) + 1]
+            if student == path.name:
+                student = str(path)
+        else:
+            student = str(path)
+        if student in submissions:
+            duplicates.append(f"{student}: {submissions[student]}, {path}")
+            continue
+        submissions[student] = path
+    if duplicates:
+        raise ValueError("more than one file per student:\n  " + "\n  ".join(duplicates))
+    return submissions
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def count_answers(path: Path) -> int:
+    """Number of (level, regex) answers parsed from a submission file."""
+    return len(parse_submission(path.read_text(encoding='utf-8', errors='replace')))
+
+
+def load_levels(levels_path: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    """Load word lists keyed by normalized level name."""
+    if levels_path is None:
+        return {}
+
+    with open(levels_path, 'r', encoding='utf-8') as f:
+        if levels_path.suffix in ('.yaml', '.yml'):
+            import yaml
+            data = yaml.safe_load(f) or {}
+        else:
+            data = json.load(f)
+
+    levels = {}
+    for name, spec in (data.get('levels') or data).items():
+        levels[normalize_level(name)] = {
+            'name': name,
+            'match': list(spec.get('match', [])),
+            'reject': list(spec.get('reject', [])),
+            'forbidden': list(spec.get('forbidden', [])),
+        }
+    return levels
+
+
+def resolve_level(name: str, levels: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """
+    Match a submitted level name to a levels-file key: exact, then prefix
+    ('Anchor' -> 'anchors'), then containment ('Solución Anchors' -> 'anchors').
+    """
+    key = normalize_level(name)
+    if key in levels:
+        return key
+    for candidate in levels:
+        if candidate.startswith(key) or key.startswith(candidate):
+            return candidate
+    for candidate in levels:
+        if candidate in key:
+            return candidate
+    return None
+
+
+# =============================================================================
+# Static ReDoS check
+# =============================================================================
+
+def _is_repeat(op) -> bool:
+    return op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, 'POSSESSIVE_REPEAT', None))
+
+
+def _first_chars(items) -> Optional[set]:
+    """Characters a (sub)pattern can start with; None means 'any character'."""
+    chars = set()
+    for op, av in items:
+        if op == sre_parse.AT:
+            continue
+        if op == sre_parse.LITERAL:
+            return chars | {av}
+        if op in (sre_parse.ANY, sre_parse.NOT_LITERAL, sre_parse.CATEGORY, sre_parse.GROUPREF):
+            return None
+        if op == sre_parse.IN:
+            for item_op, item_av in av:
+                if item_op == sre_parse.LITERAL:
+                    chars.add(item_av)
+                elif item_op == sre_parse.RANGE:
+                    chars.update(range(item_av[0], item_av[1] + 1))
+                else:
+                    return None
+            return chars
+        if op == sre_parse.SUBPATTERN:
+            first = _first_chars(av[-1])
+        elif op == sre_parse.BRANCH:
+            first = set()
+            for branch in av[1]:
+                branch_first = _first_chars(branch)
+                if branch_first is None:
+                    return None
+                first |= branch_first
+        elif _is_repeat(op):
+            first = _first_chars(av[2])
+            if first is None:
+                return None
+            if av[0] == 0:
+                chars |= first
+                continue
+        else:
+            return None
+        if first is None:
+            return None
+        return chars | first
+    return chars
+
+
+def _contains_unbounded_repeat(items) -> bool:
+    for op, av in items:
+        if _is_repeat(op):
+            if av[1] == sre_parse.MAXREPEAT or _contains_unbounded_repeat(av[2]):
+                return True
+        elif op == sre_parse.SUBPATTERN and _contains_unbounded_repeat(av[-1]):
+            return True
+        elif op == sre_parse.BRANCH and any(_contains_unbounded_repeat(b) for b in av[1]):
+            return True
+    return False
+
+
+def _find_branches(items) -> List[list]:
+    """Alternations directly inside a pattern (through groups)."""
+    found = []
+    for op, av in items:
+        if op == sre_parse.BRANCH:
+            found.append(av[1])
+        elif op == sre_parse.SUBPATTERN:
+            found.extend(_find_branches(av[-1]))
+    return found
+
+
+def _walk_risks(items, risks: List[str]) -> None:
+    for op, av in items:
+        if _is_repeat(op):
+            body = av[2]
+            if av[1] == sre_parse.MAXREPEAT:
+                if _contains_unbounded_repeat(body):
+                    risks.append('nested unbounded quantifier')
+                for branches in _find_branches(body):
+                    firsts = [_first_chars(b) for b in branches]
+                    seen = set()
+                    for first in firsts:
+                        if first is None or seen & first:
+                            risks.append('overlapping alternation inside repeat')
+                            break
+                        seen |= first
+            _walk_risks(body, risks)
+        elif op == sre_parse.SUBPATTERN:
+            _walk_risks(av[-1], risks)
+        elif op == sre_parse.BRANCH:
+            for branch in av[1]:
+                _walk_risks(branch, risks)
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            _walk_risks(av[1], risks)
+
+
+def redos_risks(pattern: str) -> List[str]:
+    """
+    Static check for patterns prone to catastrophic backtracking.
+
+    Flags unbounded repeats that contain another unbounded repeat, e.g. (a+)+,
+    and alternations inside an unbounded repeat whose branches can start with
+    the same character, e.g. (a|ab)*. Returns a list of findings (empty when
+    none or when the pattern does not parse).
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return []
+    risks = []
+    _walk_risks(list(parsed), risks)
+    return list(dict.fromkeys(risks))
+
+
+# =============================================================================
+# Sandboxed evaluation
+# =============================================================================
+
+def evaluate_pattern(pattern: str, match: List[str], reject: List[str]) -> Dict[str, Any]:
+    """Compile a pattern once and test it against both word lists (search semantics)."""
+    start = time.perf_counter()
+    try:
+        compiled = re.compile(pattern)
+    except re.error as e:
+        return {'error': f'invalid regex: {e}'}
+
+    try:
+        matched = sum(1 for word in match if compiled.search(word))
+        wrong = sum(1 for word in reject if compiled.search(word))
+    except MemoryError:
+        return {'error': 'memory limit exceeded'}
+
+    return {
+        'matched': matched,
+        'wrong': wrong,
+        'score': 10 * (matched - wrong) - len(pattern),
+        'solved': matched == len(match) and wrong == 0,
+        'ms': round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def _limit_memory(limit_mb: int) -> None:
+    try:
+        import resource
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def _worker_main(conn, memory_limit_mb: int) -> None:
+    _limit_memory(memory_limit_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        conn.send(evaluate_pattern(*task))
+
+
+def run_sandboxed(
+    tasks: List[Tuple[str, List[str], List[str]]],
+    workers: int,
+    timeout: float = DEFAULT_TIMEOUT,
+    memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate (pattern, match, reject) tasks in worker processes.
+
+    Python's re engine cannot be interrupted, so each task gets a deadline
+    and a worker that misses it is terminated and replaced.
+    """
+    results = [None] * len(tasks)
+    pending = list(range(len(tasks)))[::-1]
+    busy = {}
+
+    def spawn():
+        parent_conn, child_conn = mp.Pipe()
+        proc = mp.Process(target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True)
+        proc.start()
+        child_conn.close()
+        return proc, parent_conn
+
+    idle = [spawn() for _ in range(min(workers, len(tasks)))]
+
+    while pending or busy:
+        while pending and idle:
+            proc, conn = idle.pop()
+            index = pending.pop()
+            conn.send(tasks[index])
+            busy[conn] = (proc, index, time.monotonic())
+
+        deadline = min(start for _, _, start in busy.values()) + timeout
+        for conn in mp_connection.wait(list(busy), timeout=max(0.0, deadline - time.monotonic())):
+            proc, index, _ = busy.pop(conn)
+            try:
+                results[index] = conn.recv()
+                idle.append((proc, conn))
+            except EOFError:
+                results[index] = {'error': 'worker crashed'}
+                proc.join()
+                if pending:
+                    idle.append(spawn())
+
+        now = time.monotonic()
+        for conn, (proc, index, start) in list(busy.items()):
+            if now - start >= timeout:
+                proc.terminate()
+                proc.join()
+                conn.close()
+                del busy[conn]
+                results[index] = {'error': f'timeout (>{timeout}s)', 'timed_out': True}
+                if pending:
+                    idle.append(spawn())
+
+    for proc, conn in idle:
+        conn.send(None)
+        proc.join()
+
+    return results
+
+
+def grade_submissions(
+    submissions: Dict[str, Path],
+    levels: Dict[str, Dict[str, Any]],
+    workers: int,
+    timeout: float = DEFAULT_TIMEOUT,
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    Grade every submission. Identical (level, regex) answers across students
+    are evaluated once.
+
+    Returns:
+        {
+            'levels': {level key: display name},
+            'students': {student: {'file': path, 'total': n, 'answers': {level: {...}}}},
+        }
+    """
+    students = {}
+    unique = {}
+
+    for student, path in submissions.items():
+        answers = {}
+        for name, pattern in parse_submission(path.read_text(encoding='utf-8', errors='replace')):
+            key = resolve_level(name, levels) if levels else normalize_level(name)
+            if key is None:
+                if verbose:
+                    print(f"      Warning: {student}: unknown level '{name}'")
+                continue
+            answer = {'level': name, 'pattern': pattern, 'risks': redos_risks(pattern)}
+            level = levels.get(key)
+            if level:
+                forbidden = [s for s in level['forbidden'] if s in pattern]
+                if forbidden:
+                    answer['error'] = f"uses forbidden {' '.join(forbidden)}"
+                else:
+                    unique.setdefault((key, pattern), []).append(answer)
+            answers[key] = answer
+        students[student] = {'file': str(path), 'answers': answers}
+
+    if unique:
+        keys = list(unique)
+        tasks = [(pattern, levels[key]['match'], levels[key]['reject']) for key, pattern in keys]
+        if verbose:
+            print(f"      Evaluating {len(tasks)} unique answers with {workers} workers")
+        for task_key, result in zip(keys, run_sandboxed(tasks, workers, timeout)):
+            for answer in unique[task_key]:
+                answer.update(result)
+
+    for record in students.values():
+        record['total'] = sum(a.get('score', 0) for a in record['answers'].values()
+                              if not a.get('error'))
+
+    if levels:
+        level_names = {key: spec['name'] for key, spec in levels.items()}
+    else:
+        level_names = {}
+        for record in students.values():
+            for key, answer in record['answers'].items():
+                level_names.setdefault(key, answer['level'])
+    return {'levels': level_names, 'students': students}
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def _cell(answer: Optional[Dict[str, Any]]) -> str:
+    if answer is None:
+        return '-'
+    if answer.get('timed_out'):
+        return 'T/O'
+    if answer.get('error'):
+        return 'ERR'
+    if 'score' not in answer:
+        return 'ok'
+    return f"{answer['score']}{'' if answer['solved'] else '*'}"
+
+
+def print_scores(graded: Dict[str, Any]) -> None:
+    """Print the scores table, then errors and ReDoS findings."""
+    keys = list(graded['levels'])
+    width = max([len(s) for s in graded['students']] + [10])
+    header = [n[:12] for n in graded['levels'].values()]
+
+    print(f"{'Estudiante':<{width}s}  " + '  '.join(f"{h:>12s}" for h in header) + f"  {'Total':>6s}")
+    ranked = sorted(graded['students'].items(), key=lambda s: (-s[1]['total'], s[0].lower()))
+    for student, record in ranked:
+        cells = [_cell(record['answers'].get(k)) for k in keys]
+        print(f"{student:<{width}s}  " + '  '.join(f"{c:>12s}" for c in cells)
+              + f"  {record['total']:>6d}")
+    print("  * = no resuelve el nivel completo, T/O = timeout, ERR = error")
+
+    for student, record in ranked:
+        for answer in record['answers'].values():
+            notes = []
+            if answer.get('error'):
+                notes.append(answer['error'])
+            if answer['risks']:
+                notes.append('ReDoS: ' + ', '.join(answer['risks']))
+            if notes:
+                print(f"  {student} [{answer['level']}] {answer['pattern']!r}: {'; '.join(notes)}")
+
+
+def write_csv(graded: Dict[str, Any], csv_path: Path) -> None:
+    """One row per (student, level) answer."""
+    import csv
+
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['student', 'level', 'pattern', 'matched', 'wrong', 'score',
+                         'solved', 'error', 'redos_risks'])
+        for student, record in sorted(graded['students'].items()):
+            for answer in record['answers'].values():
+                writer.writerow([
+                    student, answer['level'], answer['pattern'],
+                    answer.get('matched', ''), answer.get('wrong', ''),
+                    answer.get('score', ''), answer.get('solved', ''),
+                    answer.get('error', ''), '; '.join(answer['risks']),
+                ])
+
+
+def main():
+    import os
+
+    parser = argparse.ArgumentParser(description='Batch RegexGolf grader')
+    parser.add_argument('files', type=Path, nargs='*',
+                        help='Submission files (default: discover in estudiantes/)')
+    parser.add_argument('--levels', type=Path,
+                        help='YAML/JSON file with match/reject word lists per level')
+    parser.add_argument('--students', type=Path, default=Path(STUDENTS_DIR),
+                        help='Path to students directory')
+    parser.add_argument('--config', type=Path,
+                        default=Path('uu_framework/config/site.yaml'),
+                        help='Path to site configuration (roster path heuristics)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='Seconds allowed per pattern')
+    parser.add_argument('--workers', type=positive_int, default=os.cpu_count() or 1,
+                        help='Worker processes')
+    parser.add_argument('--csv', type=Path, help='Write per-answer results as CSV')
+    parser.add_argument('--json', type=Path, help='Write full results as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Enable verbose output')
+    args = parser.parse_args()
+
+    if args.files:
+        try:
+            submissions = submissions_from_files(args.files, args.students)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 2
+    else:
+        submissions = find_submissions(args.students, args.config)
+    if not submissions:
+        print("No regex golf submissions found")
+        return 1
+
+    levels = load_levels(args.levels)
+    if not levels:
+        print("Warning: no --levels file; only parsing and ReDoS checks will run")
+
+    start = time.perf_counter()
+    graded = grade_submissions(submissions, levels, args.workers, args.timeout, args.verbose)
+    print_scores(graded)
+    print(f"Graded {len(submissions)} submissions in {time.perf_counter() - start:.2f}s")
+
+    if args.csv:
+        write_csv(graded, args.csv)
+        print(f"Saved CSV to {args.csv}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(graded, f, indent=2, ensure_ascii=False)
+        print(f"Saved JSON to {args.json}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Roster Progress Script
+
+Builds a students x tasks matrix from estudiantes/ and git history: each cell
+holds the first time (and commit) a file matching the task's path heuristics
+appeared in the student's directory.
+
+Task IDs come from aggregate_all_tasks (tasks.json). Path heuristics map task
+IDs to regexes matched against paths inside estudiantes/<student>/, and can be
+overridden in the `roster.task_paths` section of site.yaml.
+
+History is read with one batched `git log --name-status` pass. The matrix is
+saved with the last indexed commit, so refreshing it only walks new commits.
+
+Usage:
+    python3 roster.py                      # Update and print the matrix
+    python3 roster.py --csv roster.csv     # Also export as CSV
+    python3 roster.py --rebuild            # Ignore the saved state
+"""
+
+import re
+import sys
+import json
+import hashlib
+import subprocess
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+from gitlog import git, is_ancestor, iter_log
+
+
+STUDENTS_DIR = 'estudiantes'
+
+# Regexes (case-insensitive) matched against paths relative to estudiantes/<student>/.
+# Layouts vary across students (certificaciones/ vs certificados/, regex/ vs regexGolf/).
+DEFAULT_TASK_PATHS = {
+    '6.1': [r'^certifica\w*/(?!.*intermedi)[^/]+\.(?:md|pdf|png|jpe?g)$'],
+    '6.3': [r'^certifica\w*/[^/]*intermedi'],
+    '7.1': [r'^(?:tarea_)?regex[^/]*/'],
+    '7.2': [r'^(?:tarea_)?bandit[^/]*/'],
+}
+
+# Bump when the saved matrix changes shape (2: unquoted paths from gitlog.iter_log)
+STATE_VERSION = 2
+
+
+def compile_task_paths(task_paths: Dict[str, List[str]]) -> Dict[str, re.Pattern]:
+    """Compile each task's regex list into a single pattern."""
+    return {
+        task_id: re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+        for task_id, patterns in task_paths.items()
+        if patterns
+    }
+
+
+def heuristics_key(task_paths: Dict[str, List[str]]) -> str:
+    """Hash of the heuristics; a change invalidates the saved matrix."""
+    return hashlib.sha256(json.dumps(task_paths, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def load_task_ids(tasks_json: Path, content_dir: Path) -> List[str]:
+    """
+    Load homework IDs from tasks.json, or aggregate them from content
+    when preprocessing has not run yet.
+    """
+    if tasks_json.exists():
+        with open(tasks_json, 'r', encoding='utf-8') as f:
+            tasks = json.load(f)
+    else:
+        from extract_metadata import extract_all_metadata
+        from aggregate_tasks import aggregate_all_tasks
+        from records import tasks_to_dict
+        metadata = extract_all_metadata(content_dir)
+        tasks = tasks_to_dict(aggregate_all_tasks(content_dir, metadata))
+
+    return list(dict.fromkeys(t['id'] for t in tasks.get('homework', []) if t.get('id')))
+
+
+def iter_added_files(since: Optional[str], head: str):
+    """
+    Yield (commit, timestamp, path) for every file added or modified under
+    estudiantes/ in commits after `since` (oldest first), from a single git log.
+    """
+    revision = f'{since}..{head}' if since else head
+    for (commit, timestamp), changes in iter_log(['%H', '%ct'], revision, [STUDENTS_DIR],
+                                                 name_status=True):
+        for status, path in changes:
+            if status[:1] in ('A', 'M'):
+                yield commit, int(timestamp), path
+
+
+def split_student_path(path: str) -> Optional[Tuple[str, str]]:
+    """Split estudiantes/<student>/<rel> into (student, rel)."""
+    parts = path.split('/', 2)
+    if len(parts) < 3 or parts[0] != STUDENTS_DIR or parts[1].startswith('.'):
+        return None
+    return parts[1], parts[2]
+
+
+def update_matrix(
+    state: Dict[str, Any],
+    task_paths: Dict[str, List[str]],
+    head: str = 'HEAD',
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    Extend the matrix with commits after state['last_commit'].
+
+    Falls back to a full rebuild when there is no usable state (first run,
+    heuristics changed, or the last commit is no longer in history).
+    """
+    head_sha = git('rev-parse', head).strip()
+    key = heuristics_key(task_paths)
+
+    since = state.get('last_commit')
+    if (state.get('version') != STATE_VERSION or state.get('heuristics') != key
+            or (since and not is_ancestor(since, head_sha))):
+        if verbose and since:
+            print("      Saved roster state is stale, rebuilding from full history")
+        state = {}
+        since = None
+
+    students = state.get('students', {})
+    patterns = compile_task_paths(task_paths)
+
+    if since != head_sha:
+        new_commits = set()
+        for commit, timestamp, path in iter_added_files(since, head_sha):
+            new_commits.add(commit)
+            split = split_student_path(path)
+            if split is None:
+                continue
+            student, rel_path = split
+            row = students.setdefault(student, {})
+            for task_id, pattern in patterns.items():
+                if task_id not in row and pattern.search(rel_path):
+                    row[task_id] = {
+                        'first_submitted': datetime.fromtimestamp(
+                            timestamp, timezone.utc).isoformat(),
+                        'commit': commit,
+                        'path': rel_path,
+                    }
+        if verbose:
+            print(f"      Indexed {len(new_commits)} new commits")
+
+    # Students with a directory but no matching submissions still get a row
+    for line in git('ls-tree', '-d', '--name-only', head_sha, f'{STUDENTS_DIR}/').splitlines():
+        name = line.split('/', 1)[-1]
+        if name and not name.startswith('.'):
+            students.setdefault(name, {})
+
+    return {
+        'version': STATE_VERSION,
+        'heuristics': key,
+        'last_commit': head_sha,
+        'students': dict(sorted(students.items(), key=lambda s: s[0].lower())),
+    }
+
+
+def build_roster(
+    state: Dict[str, Any],
+    task_ids: List[str],
+    task_paths: Dict[str, List[str]]
+) -> Dict[str, Any]:
+    """Shape the matrix for output: tasks (columns), students (rows), cells."""
+    tracked = [t for t in task_ids if t in task_paths]
+    return {
+        'last_commit': state['last_commit'],
+        'tasks': tracked,
+        'untracked_tasks': [t for t in task_ids if t not in task_paths],
+        'students': {
+            student: {t: row.get(t) for t in tracked}
+            for student, row in state['students'].items()
+        },
+    }
+
+
+def print_matrix(roster: Dict[str, Any]) -> None:
+    """Print the matrix with first-submission dates."""
+    tasks = roster['tasks']
+    width = max([len(s) for s in roster['students']] + [10])
+    print(f"{'Estudiante':<{width}s}  " + '  '.join(f"{t:>10s}" for t in tasks))
+    for student, row in roster['students'].items():
+        cells = [(row[t]['first_submitted'][:10] if row[t] else '-') for t in tasks]
+        print(f"{student:<{width}s}  " + '  '.join(f"{c:>10s}" for c in cells))
+    for task_id in tasks:
+        done = sum(1 for row in roster['students'].values() if row[task_id])
+        print(f"  {task_id}: {done}/{len(roster['students'])} entregas")
+    if roster['untracked_tasks']:
+        print(f"  Sin heuristica de rutas: {', '.join(roster['untracked_tasks'])}")
+
+
+def write_csv(roster: Dict[str, Any], csv_path: Path) -> None:
+    """Export the matrix as CSV (one row per student, first-submission timestamps)."""
+    import csv
+
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['student'] + roster['tasks'])
+        for student, row in roster['students'].items():
+            writer.writerow([student] + [
+                row[t]['first_submitted'] if row[t] else '' for t in roster['tasks']
+            ])
+
+
+def load_task_paths(config_path: Path) -> Dict[str, List[str]]:
+    """Default path heuristics, overridden per task by site.yaml roster.task_paths."""
+    task_paths = dict(DEFAULT_TASK_PATHS)
+    try:
+        import yaml
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        task_paths.update((config.get('roster') or {}).get('task_paths') or {})
+    except (ImportError, FileNotFoundError):
+        pass
+    return task_paths
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Students x tasks progress matrix')
+    parser.add_argument('--config', type=Path,
+                        default=Path('uu_framework/config/site.yaml'),
+                        help='Path to site configuration')
+    parser.add_argument('--content', type=Path, default=Path('clase'),
+                        help='Path to content directory')
+    parser.add_argument('--tasks', type=Path,
+                        default=Path('uu_framework/eleventy/_data/tasks.json'),
+                        help='Path to tasks.json (generated by preprocessing)')
+    parser.add_argument('--state', type=Path,
+                        default=Path('uu_framework/.cache/roster.json'),
+                        help='Saved matrix state (enables incremental updates)')
+    parser.add_argument('--csv', type=Path, help='Export the matrix as CSV')
+    parser.add_argument('--json', type=Path, help='Export the matrix as JSON')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Ignore saved state and walk the full history')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Enable verbose output')
+    args = parser.parse_args()
+
+    task_paths = load_task_paths(args.config)
+    task_ids = load_task_ids(args.tasks, args.content)
+
+    state = {}
+    if args.state.exists() and not args.rebuild:
+        with open(args.state, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+    try:
+        state = update_matrix(state, task_paths, verbose=args.verbose)
+    except subprocess.CalledProcessError as e:
+        print(f"Error running git: {e.stderr.strip() if e.stderr else e}")
+        return 1
+
+    args.state.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.state, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+
+    roster = build_roster(state, task_ids, task_paths)
+    print_matrix(roster)
+
+    if args.csv:
+        write_csv(roster, args.csv)
+        print(f"Saved CSV to {args.csv}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(roster, f, indent=2, ensure_ascii=False)
+        print(f"Saved JSON to {args.json}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Submission Similarity Index
+
+Finds duplicate and near-duplicate submissions across students in
+estudiantes/ without comparing every pair:
+
+- Exact duplicates: files with the same git blob hash (any file type).
+- Near-duplicates: text files are reduced to a MinHash signature over word
+  shingles; LSH banding puts similar signatures in the same bucket, so only
+  candidates sharing a bucket are compared.
+
+Signatures are cached per blob hash, so a run only processes files whose
+content has never been seen. Files are assigned to homework IDs with the
+roster path heuristics (roster.task_paths in site.yaml) and clusters are
+reported per task. Only clusters spanning two or more students are reported.
+
+Usage:
+    python3 similarity.py                          # Report all clusters
+    python3 similarity.py --base origin/main       # Only clusters touching a PR's files
+    python3 similarity.py --threshold 0.6 --json similarity.json
+"""
+
+import re
+import sys
+import json
+import random
+import hashlib
+import subprocess
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from roster import STUDENTS_DIR, load_task_paths, compile_task_paths
+
+
+TEXT_SUFFIXES = ('.md', '.txt', '.py', '.sh', '.r', '.sql', '.csv', '.yaml', '.yml', '.json', '.html')
+IGNORED_NAMES = ('.gitkeep', '.gitignore', '.DS_Store')
+
+NUM_PERM = 128
+BANDS = 16                # BANDS * ROWS == NUM_PERM; threshold ~ (1/BANDS)^(1/ROWS) ~ 0.71
+SHINGLE_SIZE = 5          # Words per shingle
+MIN_SHINGLES = 10         # Shorter texts only take part in exact matching
+DEFAULT_THRESHOLD = 0.7   # Estimated Jaccard similarity to report a pair
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+SEED = 1
+
+INDEX_VERSION = 1
+
+
+# =============================================================================
+# Hashing
+# =============================================================================
+
+def blob_hash(data: bytes) -> str:
+    """Git blob id of some content (same as `git hash-object`)."""
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def list_files(students_dir: Path) -> Dict[str, str]:
+    """
+    Map student file paths to blob hashes.
+
+    Tracked, unmodified files take their id from the git index without being
+    read; modified and untracked files are hashed from disk.
+    """
+    files = {}
+    try:
+        staged = subprocess.run(['git', 'ls-files', '-s', '-z', '--', str(students_dir)],
+                                capture_output=True, text=True, check=True).stdout
+        dirty = subprocess.run(['git', 'ls-files', '-m', '-o', '--exclude-standard', '-z',
+                                '--', str(students_dir)],
+                               capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        staged, dirty = '', None
+
+    for entry in staged.split('\0'):
+        info, _, path = entry.partition('\t')
+        if path:
+            files[path] = info.split()[1]
+
+    if dirty is None:
+        dirty_paths = [str(p) for p in Path(students_dir).rglob('*') if p.is_file()]
+    else:
+        dirty_paths = [p for p in dirty.split('\0') if p]
+    for path in dirty_paths:
+        if Path(path).is_file():
+            files[path] = blob_hash(Path(path).read_bytes())
+        else:
+            files.pop(path, None)  # Deleted in the working tree
+
+    return {path: sha for path, sha in sorted(files.items())
+            if Path(path).name not in IGNORED_NAMES}
+
+
+# =============================================================================
+# MinHash / LSH
+# =============================================================================
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    rng = random.Random(SEED)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)]
+
+
+PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def normalize_text(text: str) -> List[str]:
+    """Lowercase, strip accents and punctuation; returns the word list."""
+    text = unicodedata.normalize('NFKD', text.lower()).encode('ascii', 'ignore').decode()
+    return re.findall(r'[a-z0-9]+', text)
+
+
+def shingles(words: List[str], size: int = SHINGLE_SIZE) -> set:
+    """32-bit hashes of the text's word n-grams."""
+    if len(words) < size:
+        return set()
+    return {
+        int.from_bytes(hashlib.blake2b(' '.join(words[i:i + size]).encode(), digest_size=4).digest(), 'little')
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash(shingle_hashes: set) -> List[int]:
+    """MinHash signature: per permutation, the minimum permuted shingle hash."""
+    return [
+        min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in shingle_hashes)
+        for a, b in PERMUTATIONS
+    ]
+
+
+def estimate_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity from two signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def lsh_candidates(signatures: Dict[str, List[int]], bands: int = BANDS) -> set:
+    """Pairs of keys whose signatures collide in at least one band."""
+    rows = NUM_PERM // bands
+    buckets = {}
+    for key, sig in signatures.items():
+        for band in range(bands):
+            bucket = (band, tuple(sig[band * rows:(band + 1) * rows]))
+            buckets.setdefault(bucket, []).append(key)
+
+    pairs = set()
+    for members in buckets.values():
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                pairs.add((members[i], members[j]) if members[i] < members[j] else (members[j], members[i]))
+    return pairs
+
+
+class UnionFind:
+    """Disjoint sets for clustering similar pairs."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+    def groups(self) -> List[list]:
+        clusters = {}
+        for x in self.parent:
+            clusters.setdefault(self.find(x), []).append(x)
+        return [sorted(members) for members in clusters.values()]
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+def load_index(index_path: Path) -> Dict[str, Any]:
+    """Load the signature cache (discarded when the MinHash parameters change)."""
+    params = {'version': INDEX_VERSION, 'num_perm': NUM_PERM, 'shingle_size': SHINGLE_SIZE, 'seed': SEED}
+    if index_path.exists():
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('params') == params:
+                return index
+        except (OSError, ValueError):
+            pass
+    return {'params': params, 'blobs': {}}
+
+
+def update_index(index: Dict[str, Any], files: Dict[str, str], verbose: bool = False) -> int:
+    """
+    Compute signatures for blobs not in the index.
+
+    Returns the number of new blobs processed.
+    """
+    blobs = index['blobs']
+    new = 0
+    for path, sha in files.items():
+        if sha in blobs:
+            continue
+        new += 1
+        entry = {'shingles': 0}
+        if Path(path.strip()).suffix.lower() in TEXT_SUFFIXES:
+            try:
+                text = Path(path).read_text(encoding='utf-8', errors='replace')
+            except OSError as e:
+                print(f"      Warning: Could not read {path}: {e}")
+                continue
+            hashes = shingles(normalize_text(text))
+            entry['shingles'] = len(hashes)
+            if len(hashes) >= MIN_SHINGLES:
+                entry['signature'] = minhash(hashes)
+        blobs[sha] = entry
+        if verbose:
+            print(f"      Indexed {path} ({entry['shingles']} shingles)")
+    return new
+
+
+def assign_tasks(files: Dict[str, str], task_patterns: Dict[str, re.Pattern]) -> Dict[str, List[str]]:
+    """Group student files by homework ID ('-' for files matching no task)."""
+    by_task = {}
+    for path in files:
+        parts = Path(path).parts
+        if len(parts) < 3:
+            continue
+        rel_path = '/'.join(parts[2:])
+        tasks = [t for t, pattern in task_patterns.items() if pattern.search(rel_path)] or ['-']
+        for task_id in tasks:
+            by_task.setdefault(task_id, []).append(path)
+    return by_task
+
+
+def student_of(path: str) -> str:
+    return Path(path).parts[1]
+
+
+def find_clusters(
+    index: Dict[str, Any],
+    files: Dict[str, str],
+    by_task: Dict[str, List[str]],
+    threshold: float = DEFAULT_THRESHOLD
+) -> Dict[str, Dict[str, list]]:
+    """
+    Exact and near-duplicate clusters per task, keeping only clusters that
+    span two or more students.
+
+    Returns:
+        {task_id: {'exact': [{'blob': sha, 'files': [...]}],
+                   'near': [{'files': [...], 'similarity': 0.83}]}}
+    """
+    blobs = index['blobs']
+    report = {}
+
+    for task_id, paths in sorted(by_task.items()):
+        exact = {}
+        for path in paths:
+            exact.setdefault(files[path], []).append(path)
+        exact_groups = [
+            {'blob': sha, 'files': members} for sha, members in exact.items()
+            if len({student_of(p) for p in members}) > 1
+        ]
+
+        # Near duplicates: one representative per blob, then expand back to files
+        signatures = {sha: blobs[sha]['signature'] for sha in exact
+                      if 'signature' in blobs.get(sha, {})}
+        uf = UnionFind()
+        best = {}
+        for a, b in lsh_candidates(signatures):
+            similarity = estimate_similarity(signatures[a], signatures[b])
+            if similarity >= threshold:
+                uf.union(a, b)
+                best[a] = max(best.get(a, 0), similarity)
+                best[b] = max(best.get(b, 0), similarity)
+
+        near_groups = []
+        for shas in uf.groups():
+            if len(shas) < 2:
+                continue
+            members = sorted(p for sha in shas for p in exact[sha])
+            if len({student_of(p) for p in members}) > 1:
+                near_groups.append({
+                    'files': members,
+                    'similarity': round(min(best[sha] for sha in shas), 2),
+                })
+
+        if exact_groups or near_groups:
+            report[task_id] = {'exact': exact_groups, 'near': near_groups}
+
+    return report
+
+
+def filter_changed(report: Dict[str, Dict[str, list]], changed: List[str]) -> Dict[str, Dict[str, list]]:
+    """Keep only clusters that include at least one changed file."""
+    changed = set(changed)
+    filtered = {}
+    for task_id, groups in report.items():
+        kept = {kind: [g for g in clusters if changed & set(g['files'])]
+                for kind, clusters in groups.items()}
+        if kept['exact'] or kept['near']:
+            filtered[task_id] = kept
+    return filtered
+
+
+def print_report(report: Dict[str, Dict[str, list]]) -> None:
+    """Print clusters per task."""
+    if not report:
+        print("      No duplicate submissions across students")
+        return
+    for task_id, groups in report.items():
+        print(f"\n  Tarea {task_id}:")
+        for group in groups['exact']:
+            print(f"    Identicos ({group['blob'][:10]}):")
+            for path in group['files']:
+                print(f"      {path}")
+        for group in groups['near']:
+            print(f"    Similares (>= {group['similarity']:.2f}):")
+            for path in group['files']:
+                print(f"      {path}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Duplicate and near-duplicate submission detection')
+    parser.add_argument('--students', type=Path, default=Path(STUDENTS_DIR),
+                        help='Path to students directory')
+    parser.add_argument('--config', type=Path,
+                        default=Path('uu_framework/config/site.yaml'),
+                        help='Path to site configuration (roster path heuristics)')
+    parser.add_argument('--index', type=Path,
+                        default=Path('uu_framework/.cache/similarity.json'),
+                        help='Signature cache keyed by blob hash')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Minimum estimated similarity for near-duplicates '
+                             '(LSH rarely pairs texts below ~0.5)')
+    parser.add_argument('--base', default=None,
+                        help='Only report clusters with files changed since BASE (e.g. a PR)')
+    parser.add_argument('--json', type=Path, help='Write the report as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Enable verbose output')
+    args = parser.parse_args()
+
+    files = list_files(args.students)
+    index = load_index(args.index)
+    new = update_index(index, files, args.verbose)
+    print(f"Similarity index: {len(files)} files, {new} new blobs processed")
+
+    args.index.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.index, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+
+    task_patterns = compile_task_paths(load_task_paths(args.config))
+    report = find_clusters(index, files, assign_tasks(files, task_patterns), args.threshold)
+
+    if args.base:
+        from validate_pr import git_changed_files
+        try:
+            report = filter_changed(report, git_changed_files(args.base))
+        except subprocess.CalledProcessError as e:
+            print(f"Error running git: {e.stderr.strip() if e.stderr else e}")
+            return 2
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Saved report to {args.json}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
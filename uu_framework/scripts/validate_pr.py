@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Student PR Validation Script
+
+Validates that a student's changes stay inside estudiantes/<usuario>/ and
+contain no OS/IDE junk files (.DS_Store, ._* resource forks, __pycache__, .env...).
+All rules are compiled once, so thousands of paths validate in a single pass.
+
+Used by .github/workflows/student-pr-validation.yml and locally by students
+(same rules, same messages).
+
+Usage:
+    git -c core.quotepath=off diff --name-only -z main...HEAD | python3 validate_pr.py -z --author <usuario>
+    python3 validate_pr.py --author <usuario> --base upstream/main
+    python3 validate_pr.py --author <usuario> archivo1 archivo2 ...
+
+Local pre-push hook (.git/hooks/pre-push):
+    #!/bin/sh
+    exec python3 uu_framework/scripts/validate_pr.py --pre-push --author <usuario>
+"""
+
+import os
+import re
+import sys
+import subprocess
+from typing import Dict, Iterable, List, Optional
+
+
+# Files that are NEVER allowed, even in the student's own directory
+FORBIDDEN_NAMES = [
+    # macOS
+    '.DS_Store', '._.DS_Store', '.AppleDouble', '.LSOverride',
+    '.Spotlight-V100', '.Trashes',
+    # Windows
+    'Thumbs.db', 'Thumbs.db:encryptable', 'ehthumbs.db', 'Desktop.ini',
+    # Environment files (security)
+    '.env', '.env.local',
+]
+
+FORBIDDEN_NAME_PATTERNS = [
+    r'\._.*',           # macOS resource forks
+    r'\.env\..*',       # .env.production, .env.development, ...
+    r'.*\.sw[po]',      # Vim swap files
+    r'.*~',             # Editor backups
+    r'.*\.py[co]',      # Python bytecode
+]
+
+FORBIDDEN_DIRS = [
+    '.idea', '.vscode', '.vs',                       # IDE/Editor
+    '__pycache__', '.ipynb_checkpoints',             # Python cache
+    'node_modules',                                  # Node
+]
+
+ZERO_SHA = '0' * 40
+
+
+class PathValidator:
+    """Compiled allowed/forbidden rules for one PR author."""
+
+    def __init__(self, author: str):
+        self.author = author
+        names = [re.escape(n) for n in FORBIDDEN_NAMES] + FORBIDDEN_NAME_PATTERNS
+        self.forbidden_name = re.compile(r'(?:%s)\Z' % '|'.join(names))
+        self.forbidden_dir = re.compile(
+            r'(?:^|/)(?:%s)/' % '|'.join(re.escape(d) for d in FORBIDDEN_DIRS))
+        self.allowed = re.compile(r'estudiantes/%s(?:/.*)?\Z' % re.escape(author))
+
+    def is_forbidden(self, path: str) -> bool:
+        """Check whether a path is an OS/IDE junk file (never allowed anywhere)."""
+        basename = path.rsplit('/', 1)[-1]
+        return bool(self.forbidden_name.match(basename) or self.forbidden_dir.search(path))
+
+    def is_allowed(self, path: str) -> bool:
+        """Check whether a path is inside the author's directory."""
+        return bool(self.allowed.match(path))
+
+    def validate(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Classify paths in one pass.
+
+        Returns:
+            Dict with keys 'valid', 'invalid' (outside the allowed directory),
+            'forbidden' (junk files) and 'files' ((path, status) in input order)
+        """
+        result = {'valid': [], 'invalid': [], 'forbidden': [], 'files': []}
+        for path in paths:
+            path = path.strip()
+            if not path:
+                continue
+            if self.is_forbidden(path):
+                status = 'forbidden'
+            elif self.is_allowed(path):
+                status = 'valid'
+            else:
+                status = 'invalid'
+            result[status].append(path)
+            result['files'].append((path, status))
+        return result
+
+
+def git_changed_files(base: str, head: str = 'HEAD') -> List[str]:
+    """
+    List files changed between the merge base of base and head.
+
+    NUL-separated and unquoted, so non-ASCII paths come back as they are
+    instead of as "\\303\\241"-escaped strings.
+    """
+    result = subprocess.run(
+        ['git', '-c', 'core.quotepath=off', 'diff', '--name-only', '-z', f'{base}...{head}'],
+        capture_output=True, text=True, check=True
+    )
+    return [path for path in result.stdout.split('\0') if path]
+
+
+def pre_push_changed_files(stdin_lines: Iterable[str], default_base: str) -> List[str]:
+    """
+    List files changed by the refs being pushed (git pre-push hook stdin).
+
+    Each line is "<local ref> <local sha> <remote ref> <remote sha>". New
+    branches (remote sha all zeros) are compared against default_base.
+    """
+    files = []
+    for line in stdin_lines:
+        parts = line.split()
+        if len(parts) != 4:
+            continue
+        _, local_sha, _, remote_sha = parts
+        if local_sha == ZERO_SHA:
+            continue  # Deleting a remote branch
+        base = default_base if remote_sha == ZERO_SHA else remote_sha
+        files.extend(git_changed_files(base, local_sha))
+    return list(dict.fromkeys(files))
+
+
+def print_report(result: Dict[str, List[str]], author: str) -> None:
+    """Print per-file results and error explanations (Spanish, as in CI)."""
+    print("==============================================")
+    print("  VALIDACION DE PULL REQUEST - ESTUDIANTES")
+    print("==============================================")
+    print()
+    print(f"👤 Usuario: {author}")
+    print(f"📁 Directorio permitido: estudiantes/{author}/")
+    print()
+
+    print("📋 Archivos modificados:")
+    for path, status in result['files']:
+        if status == 'forbidden':
+            print(f"🚫 {path} (archivo prohibido)")
+        elif status == 'invalid':
+            print(f"❌ {path}")
+        else:
+            print(f"✅ {path}")
+
+    print()
+    print("==============================================")
+
+    if result['forbidden']:
+        print()
+        print("🚫 ERROR: ARCHIVOS PROHIBIDOS DETECTADOS")
+        print()
+        print("Los siguientes archivos NO deben estar en el repositorio:")
+        for path in result['forbidden']:
+            print(f"  - {path}")
+        print()
+        print("Estos archivos son generados automaticamente por el sistema")
+        print("operativo o tu IDE y no deben ser commiteados.")
+        print()
+        print("Para eliminarlos de tu commit:")
+        print("  git rm --cached <archivo>")
+        print("  git commit --amend")
+        print()
+        print("Agrega un archivo .gitignore con estos patrones para evitar")
+        print("commitearlos en el futuro.")
+        print()
+
+    if result['invalid']:
+        print()
+        print("❌ ERROR: CAMBIOS FUERA DE TU DIRECTORIO")
+        print()
+        print("Solo puedes modificar archivos dentro de tu carpeta:")
+        print(f"  estudiantes/{author}/")
+        print()
+        print("Archivos en ubicaciones NO permitidas:")
+        for path in result['invalid']:
+            print(f"  - {path}")
+        print()
+        print("==============================================")
+        print("¿QUE HACER?")
+        print("==============================================")
+        print("1. Elimina los archivos que no te pertenecen de tu commit")
+        print(f"2. Asegurate de trabajar SOLO en: estudiantes/{author}/")
+        print("3. Usa: git checkout main -- <archivo> para deshacer cambios")
+        print("4. Haz push de los cambios corregidos")
+        print()
+
+    if not result['forbidden'] and not result['invalid']:
+        print()
+        print("✅ VALIDACION EXITOSA")
+        print()
+        print(f"Todos los {len(result['valid'])} archivo(s) estan en tu directorio permitido.")
+        print()
+
+
+def detect_author() -> Optional[str]:
+    """Guess the GitHub username: PR_AUTHOR env var, then `git config github.user`."""
+    if os.environ.get('PR_AUTHOR'):
+        return os.environ['PR_AUTHOR']
+    try:
+        result = subprocess.run(['git', 'config', '--get', 'github.user'],
+                                capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Valida que los cambios de un estudiante esten en estudiantes/<usuario>/')
+    parser.add_argument('paths', nargs='*',
+                        help='Archivos a validar (por defecto: lee de stdin)')
+    parser.add_argument('--author', default=None,
+                        help='Usuario de GitHub (default: $PR_AUTHOR o git config github.user)')
+    parser.add_argument('--base', default=None,
+                        help='Compara contra esta referencia (git diff --name-only BASE...HEAD)')
+    parser.add_argument('-z', '--null', action='store_true',
+                        help='Las rutas en stdin vienen separadas por NUL (git diff -z)')
+    parser.add_argument('--pre-push', action='store_true',
+                        help='Modo hook pre-push: lee las refs a enviar desde stdin')
+    parser.add_argument('--default-base', default='origin/main',
+                        help='Base para ramas nuevas en modo pre-push (default: origin/main)')
+    args = parser.parse_args()
+
+    author = args.author or detect_author()
+    if not author:
+        print("Error: no se pudo determinar tu usuario de GitHub.")
+        print("Usa --author <usuario> o configura: git config github.user <usuario>")
+        return 2
+
+    try:
+        if args.pre_push:
+            paths = pre_push_changed_files(sys.stdin, args.default_base)
+        elif args.base:
+            paths = git_changed_files(args.base)
+        elif args.paths:
+            paths = args.paths
+        else:
+            data = sys.stdin.read()
+            paths = data.split('\0') if args.null else data.splitlines()
+    except subprocess.CalledProcessError as e:
+        print(f"Error ejecutando git: {e.stderr.strip() if e.stderr else e}")
+        return 2
+
+    result = PathValidator(author).validate(paths)
+    print_report(result, author)
+
+    return 1 if result['forbidden'] or result['invalid'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())